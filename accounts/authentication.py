@@ -0,0 +1,121 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_CACHE_KEY = 'accounts:user:{user_id}'
+# 워커(프로세스) 간에 공유되지 않는 캐시 백엔드 (다른 워커에서 저장한 사용자의 무효화가 전달되지 않음)
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+# 토큰 digest -> 검증된 토큰 (프로세스별 LRU, 서명 검증 / 클레임 파싱 생략용)
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def token_digest(raw_token):
+    return hashlib.blake2b(raw_token, digest_size=16).digest()
+
+
+def user_cache_enabled():
+    '''
+    사용자 행 캐시는 JWT_USER_CACHE_TTL > 0 이고 default 캐시가 워커 간에 공유되는 백엔드(Redis 등)일 때만 사용
+    프로세스별 캐시에서는 비활성화된 사용자가 다른 워커에서 TTL 동안 계속 인증될 수 있으므로 매 요청 DB에서 조회
+    '''
+    return (settings.JWT_USER_CACHE_TTL > 0
+            and settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS)
+
+
+def get_cached_user(user_id):
+    return cache.get(USER_CACHE_KEY.format(user_id=user_id))
+
+
+def cache_user(user):
+    cache.set(USER_CACHE_KEY.format(user_id=getattr(user, api_settings.USER_ID_FIELD)),
+              user, timeout=settings.JWT_USER_CACHE_TTL)
+
+
+def invalidate_user(user):
+    '''
+    사용자 캐시와 해당 사용자의 토큰 캐시 삭제 (accounts.signals에서 사용자 저장/삭제 시 호출)
+    '''
+    # 토큰의 user_id 클레임은 문자열로 저장되므로 문자열로 비교
+    user_id = str(getattr(user, api_settings.USER_ID_FIELD))
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
+
+    with _token_cache_lock:
+        for digest in [digest for digest, token in _token_cache.items()
+                       if str(token.get(api_settings.USER_ID_CLAIM)) == user_id]:
+            del _token_cache[digest]
+
+
+def clear_token_cache():
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    '''
+    simplejwt JWTAuthentication + 캐시
+    - 검증된 토큰을 토큰 digest 기준 LRU(JWT_TOKEN_CACHE_SIZE개)에 보관하여 같은 토큰의 서명 검증 생략 (만료 시각은 매번 확인)
+    - 공유 캐시 백엔드에서는 사용자 행을 JWT_USER_CACHE_TTL초 동안 캐시하여 인증된 요청마다 발생하던 user 테이블 SELECT 생략
+      (사용자 저장/삭제 시 accounts.signals에서 무효화, QuerySet.update 등 시그널 없는 변경은 TTL 후 반영)
+    토큰 LRU는 프로세스별이지만 사용자 상태를 담지 않으므로 is_active / 비밀번호 변경 검사는 항상 최신 사용자 행으로 수행
+    '''
+    def get_validated_token(self, raw_token):
+        digest = token_digest(raw_token)
+
+        with _token_cache_lock:
+            validated_token = _token_cache.get(digest)
+            if validated_token is not None:
+                if validated_token.get('exp', 0) > time.time():
+                    _token_cache.move_to_end(digest)
+                    return validated_token
+                # 만료된 토큰은 다시 검증하여 simplejwt와 같은 오류를 반환
+                del _token_cache[digest]
+
+        validated_token = super().get_validated_token(raw_token)
+
+        with _token_cache_lock:
+            _token_cache[digest] = validated_token
+            if len(_token_cache) > settings.JWT_TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+        use_cache = user_cache_enabled()
+        user = get_cached_user(user_id) if use_cache else None
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+            if use_cache:
+                cache_user(user)
+
+        # 캐시된 사용자도 simplejwt와 같은 검사를 거침
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import threading
+import weakref
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class GithubError(Exception):
+    '''
+    Github OAuth / API 요청 실패 (status_code는 클라이언트에 돌려줄 HTTP 상태 코드)
+    '''
+    def __init__(self, message, status_code=500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# 이벤트 루프 -> (httpx.AsyncClient, 루프 종료 시 클라이언트를 닫는 async generator)
+# AsyncClient의 커넥션 풀은 생성한 루프에서만 사용할 수 있으므로 루프마다 하나씩 공유
+# (ASGI 서버에서는 루프가 하나라 프로세스 전체가 같은 풀 / keep-alive 커넥션을 재사용)
+_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+async def _close_with_loop(client):
+    '''
+    루프가 끝날 때 client를 닫는 async generator
+    asyncio.run(WSGI에서 async 뷰를 실행하는 async_to_sync 포함)은 루프를 닫기 전에
+    shutdown_asyncgens()로 멈춰 있는 async generator를 aclose하므로, 요청마다 새 루프가 만들어져도 커넥션이 닫힘
+    '''
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def get_client():
+    '''
+    현재 이벤트 루프에서 공유하는 httpx.AsyncClient (첫 사용 시 생성, 루프가 끝나면 닫힘)
+    '''
+    # httpx는 import만으로 약 100ms가 걸려 Github 로그인을 처음 처리할 때 로드
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(loop)
+
+    if entry is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.GITHUB_READ_TIMEOUT,
+                connect=settings.GITHUB_CONNECT_TIMEOUT,
+                pool=settings.GITHUB_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.GITHUB_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GITHUB_MAX_CONNECTIONS,
+            ),
+            headers={'Accept': 'application/json'},
+        )
+        # 첫 asend에서 루프에 등록되고 바로 yield까지 실행됨 (중간에 다른 코루틴으로 전환되지 않음)
+        # 루프는 async generator를 약한 참조로만 추적하므로 클라이언트와 함께 보관
+        closer = _close_with_loop(client)
+        await closer.asend(None)
+
+        entry = (client, closer)
+        with _clients_lock:
+            _clients[loop] = entry
+
+    return entry[0]
+
+
+def _error(message, e):
+    import httpx
+
+    # Github 응답 지연은 504, 그 외 요청 실패는 기존과 같이 500
+    status_code = 504 if isinstance(e, httpx.TimeoutException) else 500
+    return GithubError(f'{message}: {e}', status_code=status_code)
+
+
+async def exchange_code(code):
+    '''
+    인증 코드로 Access Token 요청, Github 응답 JSON 반환 (error 키 확인은 호출하는 쪽에서)
+    '''
+    import httpx
+
+    try:
+        response = await (await get_client()).post(
+            f'{settings.GITHUB_OAUTH_BASE_URL}/login/oauth/access_token',
+            data={
+                'client_id': settings.GITHUB_CLIENT_ID,
+                'client_secret': settings.GITHUB_CLIENT_SECRET,
+                'code': code,
+            },
+        )
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        raise _error('Failed to get access token from Github', e)
+
+
+def _primary_email(emails):
+    for email in emails:
+        if email.get('primary') and email.get('verified'):
+            return email.get('email')
+    return None
+
+
+async def fetch_user(access_token):
+    '''
+    /user와 /user/emails를 동시에 요청하여 (사용자 정보, 이메일) 반환
+    공개 이메일이 없으면 인증된 기본 이메일 사용 (이메일 조회 실패는 경고 로그만 남김)
+    '''
+    import httpx
+
+    client = await get_client()
+    headers = {'Authorization': f'Bearer {access_token}'}
+
+    user_response, emails_response = await asyncio.gather(
+        client.get(f'{settings.GITHUB_API_BASE_URL}/user', headers=headers),
+        client.get(f'{settings.GITHUB_API_BASE_URL}/user/emails', headers=headers),
+        return_exceptions=True,
+    )
+
+    try:
+        if isinstance(user_response, Exception):
+            raise user_response
+        user_response.raise_for_status()
+        user_info = user_response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        raise _error('Failed to fetch user info from Github', e)
+
+    email = user_info.get('email') if user_info else None
+    if user_info and not email:
+        try:
+            if isinstance(emails_response, Exception):
+                raise emails_response
+            emails_response.raise_for_status()
+            email = _primary_email(emails_response.json())
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning('Could not fetch emails from Github: %s', e)
+
+    return user_info, email
+
+
+def close_clients():
+    '''
+    모든 루프의 공유 클라이언트를 닫고 비움
+    클라이언트는 자신의 루프에서만 닫을 수 있으므로 실행 중인 루프에는 닫기 작업을 예약하고,
+    멈춰 있는 루프에서는 바로 실행 (이미 닫힌 루프의 클라이언트는 루프 종료 시 닫혔음)
+    '''
+    with _clients_lock:
+        entries = list(_clients.items())
+        _clients.clear()
+
+    for loop, (_, closer) in entries:
+        if loop.is_closed():
+            continue
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(closer.aclose(), loop)
+        else:
+            loop.run_until_complete(closer.aclose())
+
+
+@receiver(setting_changed)
+def reset_clients(*, setting, **kwargs):
+    # 타임아웃 / 풀 크기 설정이 바뀌면 기존 클라이언트를 닫고 새 클라이언트를 만들도록 비움
+    if setting.startswith('GITHUB_'):
+        close_clients()
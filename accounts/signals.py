@@ -0,0 +1,16 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    '''
+    사용자 저장/삭제 시 JWT 인증 캐시(accounts.authentication) 무효화
+    '''
+    invalidate_user(instance)
@@ -1,3 +1,213 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import github
+from .authentication import CachedJWTAuthentication, _token_cache, clear_token_cache, token_digest
+
+User = get_user_model()
+
+
+class GithubStubHandler(BaseHTTPRequestHandler):
+    '''
+    Github OAuth / API 스텁 (server.delay초 지연 후 응답, 요청별 시작/종료 시각 기록)
+    '''
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, body, status=200):
+        started = time.monotonic()
+        time.sleep(self.server.delay)
+
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # 타임아웃 테스트에서 클라이언트가 먼저 연결을 끊은 경우
+            return
+        self.server.calls.append((self.path, started, time.monotonic()))
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        if form.get('code') == ['bad']:
+            self.respond({'error': 'bad_verification_code'})
+        else:
+            self.respond({'access_token': 'gho_test'})
+
+    def do_GET(self):
+        if self.headers.get('Authorization') != 'Bearer gho_test':
+            self.respond({'message': 'Bad credentials'}, status=401)
+        elif self.path == '/user':
+            self.respond({'id': 42, 'login': 'octocat', 'email': None})
+        elif self.path == '/user/emails':
+            self.respond([
+                {'email': 'old@example.com', 'primary': False, 'verified': True},
+                {'email': 'octocat@example.com', 'primary': True, 'verified': True},
+            ])
+        else:
+            self.respond({}, status=404)
+
+
+class GithubLoginTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), GithubStubHandler)
+        cls.server.daemon_threads = True
+        cls.server.delay = 0
+        cls.server.calls = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.github_settings = override_settings(
+            GITHUB_OAUTH_BASE_URL=base_url, GITHUB_API_BASE_URL=base_url,
+            GITHUB_CLIENT_ID='client', GITHUB_CLIENT_SECRET='secret',
+        )
+        cls.github_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.github_settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.delay = 0
+        self.server.calls.clear()
+
+    async def login(self, code):
+        return await self.async_client.post(reverse('github_login'), {'code': code}, content_type='application/json')
+
+    async def test_login_creates_user_with_primary_email(self):
+        response = await self.login('ok')
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data['user_info'], {'username': 'octocat', 'email': 'octocat@example.com', 'is_staff': False})
+        self.assertIn('access_token', data)
+
+        user = await User.objects.aget(github_id='42')
+        self.assertFalse(user.has_usable_password())
+
+    async def test_user_and_emails_fetched_concurrently(self):
+        '''
+        /user와 /user/emails가 동시에 요청되어 로그인 지연이 Github 왕복 2회 수준이어야 함
+        '''
+        self.server.delay = 0.2
+
+        start = time.monotonic()
+        response = await self.login('ok')
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(response.status_code, 200)
+        calls = {path: (started, finished) for path, started, finished in self.server.calls}
+        # 이메일 요청이 사용자 정보 응답 전에 시작됨
+        self.assertLess(calls['/user/emails'][0], calls['/user'][1])
+        self.assertLess(elapsed, 0.6)
+
+    async def test_github_errors(self):
+        response = await self.login('bad')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'bad_verification_code')
+
+        response = await self.async_client.post(reverse('github_login'), {}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_timeout_returns_gateway_timeout(self):
+        self.server.delay = 0.3
+
+        with self.settings(GITHUB_READ_TIMEOUT=0.05):
+            response = await self.login('ok')
+
+        self.assertEqual(response.status_code, 504)
+        self.assertFalse(await User.objects.filter(github_id='42').aexists())
+
+    def test_client_closed_when_request_loop_ends(self):
+        '''
+        WSGI에서는 async 뷰가 요청마다 새 루프에서 실행되므로 루프가 끝날 때 공유 클라이언트도 닫혀야 함
+        '''
+        created = []
+        close_with_loop = github._close_with_loop
+
+        def track(client):
+            created.append(client)
+            return close_with_loop(client)
+
+        with mock.patch.object(github, '_close_with_loop', side_effect=track):
+            response = self.client.post(reverse('github_login'), {'code': 'ok'}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(created), 1)
+        self.assertTrue(created[0].is_closed)
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # 사용자 행 캐시는 워커 간에 공유되는 캐시 백엔드에서만 사용되므로 파일 캐시 사용
+        location = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }))
+
+    def setUp(self):
+        cache.clear()
+        clear_token_cache()
+        self.user = User.objects.create_user('jwt', 'jwt@test.com', 'password')
+        self.auth = CachedJWTAuthentication()
+        self.request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_user_cached_until_saved(self):
+        with self.assertNumQueries(1):
+            user, _ = self.auth.authenticate(self.request)
+        self.assertEqual(user.pk, self.user.pk)
+
+        # 같은 토큰의 두 번째 요청은 DB 조회 없음
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate(self.request)
+        self.assertEqual(token['user_id'], str(self.user.pk))
+
+        self.user.nickname = 'changed'
+        self.user.save()
+        # 저장 시 토큰 / 사용자 캐시 모두 무효화
+        self.assertNotIn(token_digest(self.request.META['HTTP_AUTHORIZATION'].split()[1].encode()), _token_cache)
+        with self.assertNumQueries(1):
+            user, _ = self.auth.authenticate(self.request)
+        self.assertEqual(user.nickname, 'changed')
+
+    def test_inactive_user_rejected_after_invalidation(self):
+        self.auth.authenticate(self.request)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate(self.request)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_cache_does_not_cache_users(self):
+        # 다른 워커에서 비활성화된 사용자 (이 프로세스의 시그널은 실행되지 않음)
+        self.auth.authenticate(self.request)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertNumQueries(1), self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate(self.request)
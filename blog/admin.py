@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Post
+from .search import update_search_vector
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
@@ -16,6 +17,11 @@ class PostAdmin(admin.ModelAdmin):
             obj.author = request.user
         super().save_model(request, obj, form, change)
 
+    # 태그(m2m)까지 저장된 뒤 검색 벡터 갱신
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        update_search_vector(form.instance)
+
     def has_add_permission(self, request):
         return request.user and request.user.is_staff
 
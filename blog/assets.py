@@ -0,0 +1,72 @@
+import re
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ImageAsset
+from .utils import generate_image_derivatives
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def normalize_digest(value):
+    '''
+    클라이언트가 보낸 sha256 hex 문자열 검증 (형식이 틀리면 None)
+    '''
+    value = str(value or '').strip().lower()
+    return value if SHA256_RE.match(value) else None
+
+
+def find_asset_manifest(sha256):
+    '''
+    같은 내용의 이미지로 이미 만들어진 파생 이미지 manifest (없으면 None), 재사용 시각 갱신
+    '''
+    asset = ImageAsset.objects.filter(pk=sha256).only('pk', 'manifest').first()
+    if asset is None:
+        return None
+
+    ImageAsset.objects.filter(pk=sha256).update(last_used_at=timezone.now())
+    return asset.manifest
+
+
+def get_or_generate_derivatives(s3_key):
+    '''
+    업로드된 원본의 해시로 기존 파생 이미지를 찾아 재사용하고, 없으면 생성 후 ImageAsset으로 기록
+    '''
+    manifest = generate_image_derivatives(s3_key, find_existing=find_asset_manifest)
+
+    if manifest and not manifest.get('deduplicated'):
+        stored = {key: value for key, value in manifest.items() if key != 'sha256'}
+        ImageAsset.objects.get_or_create(
+            sha256=manifest['sha256'],
+            defaults={'resized_key': manifest['key'], 'manifest': stored},
+        )
+    return manifest
+
+
+def forget_image_assets(resized_keys):
+    '''
+    삭제된 이미지를 가리키는 ImageAsset 제거 (삭제된 URL이 재사용되지 않도록)
+    '''
+    resized_keys = list(resized_keys)
+    if resized_keys:
+        ImageAsset.objects.filter(resized_key__in=resized_keys).delete()
+
+
+def get_manifest_derivative_keys(resized_keys):
+    '''
+    ImageAsset manifest에 기록된 파생 이미지 키 {resized_key: [키, ...]} (저장소 목록 조회 없이 이미지 삭제에 사용)
+    manifest가 없거나 URL이 현재 CloudFront 도메인이 아닌 이미지는 포함하지 않음
+    '''
+    resized_keys = list(resized_keys)
+    if not resized_keys:
+        return {}
+
+    prefix = f'{settings.AWS_CLOUDFRONT_DOMAIN}/'
+    derivative_keys = {}
+    for resized_key, manifest in (ImageAsset.objects.filter(resized_key__in=resized_keys)
+                                  .values_list('resized_key', 'manifest')):
+        urls = [variant['url'] for variant in manifest.get('variants', [])]
+        if all(url.startswith(prefix) for url in urls):
+            derivative_keys[resized_key] = [url[len(prefix):] for url in urls]
+    return derivative_keys
@@ -0,0 +1,302 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from taggit.models import Tag, TaggedItem
+
+from .cache import bump_version
+from .credentials import is_password_hash, make_comment_password
+from .content import analyze_content
+from .models import Comment, Post, PostImage
+from .search import update_search_vectors
+from .tags import refresh_tag_stats
+from .utils import parse_image_keys
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def recount_comment_counts(post_ids=None):
+    '''
+    게시글 comment_count를 실제 댓글 수로 다시 계산 (post_ids가 None이면 전체), 수정된 게시글 수 반환
+    '''
+    actual_count = Coalesce(Subquery(
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(count=Count('id'))
+        .values('count')
+    ), 0)
+
+    if post_ids is None:
+        return Post.objects.update(comment_count=actual_count)
+
+    post_ids = list(post_ids)
+    updated = 0
+    for start in range(0, len(post_ids), DEFAULT_BATCH_SIZE):
+        chunk = post_ids[start:start + DEFAULT_BATCH_SIZE]
+        updated += Post.objects.filter(pk__in=chunk).update(comment_count=actual_count)
+    return updated
+
+
+def get_or_create_users(usernames):
+    '''
+    username -> id (없는 사용자는 로그인할 수 없는 비밀번호로 한 번에 생성)
+    '''
+    usernames = set(usernames)
+    user_ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+
+    missing = usernames - set(user_ids)
+    if missing:
+        User.objects.bulk_create(
+            [User(username=username, password=make_password(None)) for username in missing],
+            ignore_conflicts=True,
+        )
+        user_ids.update(User.objects.filter(username__in=missing).values_list('username', 'id'))
+    return user_ids
+
+
+def get_or_create_tags(names):
+    '''
+    태그 이름 -> id (없는 태그는 bulk_create, slug가 겹치는 태그만 taggit 방식으로 하나씩 생성)
+    '''
+    names = set(names)
+    tag_ids = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+
+    missing = names - set(tag_ids)
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=Tag().slugify(name)) for name in missing],
+            ignore_conflicts=True,
+        )
+        tag_ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+
+        for name in missing - set(tag_ids):
+            tag_ids[name] = Tag.objects.create(name=name).id
+    return tag_ids
+
+
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+# 레코드 종류별 필수 키 (feed 시점에 확인하여 배치 저장 중이 아니라 해당 레코드에서 오류 발생)
+REQUIRED_FIELDS = {'post': ('title', 'author'), 'comment': ()}
+
+
+def parse_timestamps(record):
+    '''
+    레코드의 created_at / updated_at 문자열을 datetime으로 변환 (없으면 None, 형식이 틀리면 ValueError)
+    '''
+    timestamps = {}
+    for field in TIMESTAMP_FIELDS:
+        value = record.get(field)
+        parsed = parse_datetime(value) if value else None
+        if value and parsed is None:
+            raise ValueError(f'{field} 형식이 올바르지 않습니다: {value}')
+        timestamps[field] = parsed
+    return timestamps
+
+
+def resolve_timestamps(timestamps, now):
+    created_at = timestamps['created_at'] or now
+    return {'created_at': created_at, 'updated_at': timestamps['updated_at'] or created_at}
+
+
+def restore_timestamps(model, objs, timestamps, batch_size):
+    '''
+    bulk_create가 auto_now / auto_now_add로 덮어쓴 작성 / 수정 시각을 원래 값으로 되돌림
+    (모델 필드 속성을 바꾸지 않으므로 다른 스레드의 저장에 영향 없음, bulk_update는 pre_save를 호출하지 않음)
+    '''
+    for obj, values in zip(objs, timestamps):
+        for field, value in values.items():
+            setattr(obj, field, value)
+    model.objects.bulk_update(objs, TIMESTAMP_FIELDS, batch_size=batch_size)
+
+
+class BlogImporter:
+    '''
+    JSON Lines 레코드(post / comment)를 배치 단위로 bulk_create하는 가져오기
+    게시글 저장 시 save()/signals가 하던 처리(요약 / 단어 수 / 목차, 태그, 태그 통계, 이미지 색인, 댓글 수, 검색 벡터, 캐시)를
+    배치마다 한 번씩 처리하므로 행 수와 관계없이 메모리는 배치 크기 + 게시글 id 매핑만 사용
+    '''
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.post_content_type = ContentType.objects.get_for_model(Post)
+        self.pending_posts = []
+        self.pending_comments = []
+        # 파일의 게시글 id -> 새로 생성된 게시글 pk
+        self.post_ids = {}
+        self.touched_tag_ids = set()
+        self.commented_post_ids = set()
+        self.stats = {'posts': 0, 'comments': 0, 'skipped': 0}
+
+    def feed(self, record):
+        '''
+        레코드 하나를 배치에 추가 (필수 키가 없으면 KeyError, 시각 형식이 틀리면 ValueError)
+        '''
+        record_type = record.get('type')
+        if record_type not in REQUIRED_FIELDS:
+            self.stats['skipped'] += 1
+            return
+
+        for field in REQUIRED_FIELDS[record_type]:
+            if field not in record:
+                raise KeyError(field)
+        pending = (record, parse_timestamps(record))
+
+        if record_type == 'post':
+            self.pending_posts.append(pending)
+            if len(self.pending_posts) >= self.batch_size:
+                self.flush_posts()
+        else:
+            self.pending_comments.append(pending)
+            if len(self.pending_comments) >= self.batch_size:
+                self.flush_comments()
+
+    def finish(self):
+        self.flush_posts()
+        self.flush_comments()
+
+        refresh_tag_stats(self.touched_tag_ids)
+        recount_comment_counts(self.commented_post_ids)
+        bump_version('posts')
+        return self.stats
+
+    @transaction.atomic
+    def flush_posts(self):
+        pending, self.pending_posts = self.pending_posts, []
+        if not pending:
+            return
+
+        now = timezone.now()
+        records = [record for record, _ in pending]
+        timestamps = [resolve_timestamps(parsed, now) for _, parsed in pending]
+        author_ids = get_or_create_users(record['author'] for record in records)
+        posts = [
+            Post(
+                title=record['title'],
+                # content(목차 id를 넣은 본문) / excerpt / word_count / reading_time / toc
+                **analyze_content(record.get('content', '')),
+                author_id=author_ids[record['author']],
+            )
+            for record in records
+        ]
+        Post.objects.bulk_create(posts, batch_size=self.batch_size)
+        # 원래 작성 / 수정 시각 유지
+        restore_timestamps(Post, posts, timestamps, self.batch_size)
+
+        tag_ids = get_or_create_tags(name for record in records for name in record.get('tags', []))
+        TaggedItem.objects.bulk_create(
+            [
+                TaggedItem(content_type=self.post_content_type, object_id=post.pk, tag_id=tag_ids[name])
+                for post, record in zip(posts, records)
+                for name in set(record.get('tags', []))
+            ],
+            batch_size=self.batch_size,
+        )
+        self.touched_tag_ids.update(tag_ids.values())
+
+        PostImage.objects.bulk_create(
+            [
+                PostImage(post=post, s3_key=key)
+                for post in posts
+                for key in parse_image_keys(post.content)
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        update_search_vectors(post.pk for post in posts)
+
+        for post, record in zip(posts, records):
+            if record.get('id') is not None:
+                self.post_ids[record['id']] = post.pk
+        self.stats['posts'] += len(posts)
+
+    @transaction.atomic
+    def flush_comments(self):
+        # 댓글이 참조하는 게시글이 아직 배치에 남아 있을 수 있으므로 먼저 저장
+        self.flush_posts()
+
+        pending, self.pending_comments = self.pending_comments, []
+        if not pending:
+            return
+
+        now = timezone.now()
+        author_ids = get_or_create_users(record['author'] for record, _ in pending if record.get('author'))
+        comments = []
+        timestamps = []
+
+        for record, parsed in pending:
+            post_id = self.post_ids.get(record.get('post'))
+            if post_id is None:
+                self.stats['skipped'] += 1
+                continue
+
+            author_id = author_ids.get(record.get('author'))
+            password = record.get('password')
+            if author_id is not None:
+                password = None
+            elif password and not is_password_hash(password):
+                password = make_comment_password(password)
+            elif not password:
+                password = make_comment_password(None)
+
+            comments.append(Comment(
+                post_id=post_id,
+                author_id=author_id,
+                author_name='' if author_id else record.get('author_name', ''),
+                content=record.get('content', ''),
+                password=password,
+            ))
+            timestamps.append(resolve_timestamps(parsed, now))
+
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+        restore_timestamps(Comment, comments, timestamps, self.batch_size)
+
+        self.commented_post_ids.update(comment.post_id for comment in comments)
+        self.stats['comments'] += len(comments)
+
+
+def iter_export_records(batch_size=DEFAULT_BATCH_SIZE):
+    '''
+    게시글, 댓글 순서로 JSON Lines 레코드를 생성 (서버 측 커서 / 청크 단위로 읽어 메모리 일정)
+    '''
+    posts = (Post.objects
+             .select_related('author')
+             .prefetch_related('tags')
+             .defer('search_vector', *Post.CONTENT_DERIVED_FIELDS)
+             .order_by('id'))
+    for post in posts.iterator(chunk_size=batch_size):
+        yield {
+            'type': 'post',
+            'id': post.pk,
+            'title': post.title,
+            'content': post.content,
+            'author': post.author.username,
+            'tags': sorted(tag.name for tag in post.tags.all()),
+            'created_at': post.created_at.isoformat(),
+            'updated_at': post.updated_at.isoformat(),
+        }
+
+    comments = Comment.objects.select_related('author').order_by('id')
+    for comment in comments.iterator(chunk_size=batch_size):
+        yield {
+            'type': 'comment',
+            'id': comment.pk,
+            'post': comment.post_id,
+            'author': comment.author.username if comment.author else None,
+            'author_name': comment.author_name,
+            'content': comment.content,
+            'password': comment.password,
+            'created_at': comment.created_at.isoformat(),
+            'updated_at': comment.updated_at.isoformat(),
+        }
+
+
+def dump_record(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
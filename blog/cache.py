@@ -0,0 +1,130 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+VERSION_KEY = 'blog:version:{name}'
+CHANGED_AT_KEY = 'blog:version:{name}:changed_at'
+STATS_KEY = 'blog:cache:{namespace}:{kind}'
+
+
+def _incr(key, initial):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # 키가 없거나 만료된 경우 초기값으로 생성 (동시에 생성된 경우 add가 실패하므로 다시 incr)
+        if cache.add(key, initial, timeout=None):
+            return initial
+        return cache.incr(key)
+
+
+def get_version(name):
+    '''
+    name 네임스페이스의 캐시 버전 반환
+    키가 축출되어도 이전 버전과 겹치지 않도록 현재 시각(ms)으로 초기화
+    '''
+    key = VERSION_KEY.format(name=name)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(name):
+    '''
+    name 네임스페이스의 캐시 버전을 올려 이전 버전으로 저장된 응답을 모두 무효화
+    트랜잭션 커밋 전 데이터가 새 버전으로 캐시되는 것을 막기 위해 커밋 후에도 한 번 더 올림
+    '''
+    key = VERSION_KEY.format(name=name)
+    _incr(key, int(time.time() * 1000))
+    cache.set(CHANGED_AT_KEY.format(name=name), time.time(), timeout=None)
+    transaction.on_commit(lambda: _incr(key, int(time.time() * 1000)))
+
+
+def get_changed_at(name):
+    '''
+    name 네임스페이스가 마지막으로 변경(생성/수정/삭제/태그 변경)된 시각(timestamp)
+    기록이 없으면 현재 시각으로 초기화 (보수적으로 '방금 변경됨'으로 간주)
+    '''
+    key = CHANGED_AT_KEY.format(name=name)
+    changed_at = cache.get(key)
+
+    if changed_at is None:
+        cache.add(key, time.time(), timeout=None)
+        changed_at = cache.get(key)
+    return changed_at
+
+
+def record_cache_access(namespace, hit):
+    _incr(STATS_KEY.format(namespace=namespace, kind='hits' if hit else 'misses'), 1)
+
+
+def get_cache_stats(namespace):
+    hits = cache.get(STATS_KEY.format(namespace=namespace, kind='hits')) or 0
+    misses = cache.get(STATS_KEY.format(namespace=namespace, kind='misses')) or 0
+    total = hits + misses
+
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else 0.0,
+        'version': get_version(namespace),
+    }
+
+
+def build_response_cache_key(namespace, action, request, dependencies=()):
+    '''
+    네임스페이스(및 dependencies 네임스페이스) 버전 + 액션 + 경로 + 정렬된 쿼리 파라미터로 캐시 키 생성
+    (next 링크가 절대 URL이므로 host도 포함)
+    '''
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    versions = [f'{name}={get_version(name)}' for name in dependencies]
+    raw = f'{request.get_host()}|{request.path}|{params}|{versions}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    return f'blog:response:{namespace}:v{get_version(namespace)}:{action}:{digest}'
+
+
+class VersionedResponseCacheMixin:
+    '''
+    list/retrieve 응답 데이터를 네임스페이스 버전 기반 키로 캐시하는 ViewSet 믹스인
+    쓰기 작업에서 bump_version(cache_namespace)을 호출하면 이전 캐시는 모두 무효화됨
+    get_cache_dependencies()가 반환하는 네임스페이스의 버전이 바뀌면 해당 응답만 무효화됨
+    '''
+    cache_namespace = None
+    cached_actions = ('list', 'retrieve')
+
+    def get_cache_timeout(self):
+        return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+    def get_cache_dependencies(self):
+        return ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cached_actions:
+            return handler(request, *args, **kwargs)
+
+        key = build_response_cache_key(self.cache_namespace, self.action, request, self.get_cache_dependencies())
+        data = cache.get(key)
+
+        if data is not None:
+            record_cache_access(self.cache_namespace, hit=True)
+            return Response(data)
+
+        record_cache_access(self.cache_namespace, hit=False)
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            cache.set(key, response.data, self.get_cache_timeout())
+        return response
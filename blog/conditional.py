@@ -0,0 +1,104 @@
+import hashlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import build_response_cache_key, get_changed_at, get_version
+
+
+def compute_validators(queryset, version_name, request, dependencies=()):
+    '''
+    queryset의 행 수와 max(updated_at), 네임스페이스 버전으로 ETag/Last-Modified 계산 (직렬화 없이 집계 1회)
+    삭제는 행 수/버전 변화로, 태그 변경처럼 updated_at이 바뀌지 않는 변경은 버전과 변경 시각으로 반영됨
+    dependencies 네임스페이스(예: 게시글 상세의 'comments:<id>')의 버전과 변경 시각도 함께 반영
+    '''
+    aggregated = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    last_updated = aggregated['last_modified']
+    names = (version_name, *dependencies)
+    changed_at = datetime.fromtimestamp(max(get_changed_at(name) for name in names), tz=timezone.utc)
+
+    raw = '|'.join([
+        str(aggregated['count']),
+        last_updated.isoformat() if last_updated else '',
+        *(str(get_version(name)) for name in names),
+        request.get_full_path(),
+    ])
+    etag = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    last_modified = max(last_updated, changed_at) if last_updated else changed_at
+
+    return etag, last_modified
+
+
+def get_not_modified_response(request, etag, last_modified):
+    '''
+    If-None-Match / If-Modified-Since 조건을 만족하면 304 응답을, 아니면 None 반환
+    '''
+    response = get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified.timestamp()),
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response['ETag'] = quote_etag(etag)
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalGetMixin:
+    '''
+    list/retrieve에 ETag/Last-Modified 기반 조건부 GET(304) 적용하는 ViewSet 믹스인
+    cache_namespace가 있으면 계산한 검증자도 같은 버전 키로 캐시하여 재요청 시 DB 조회를 생략
+    '''
+    cache_namespace = None
+
+    def get_cache_dependencies(self):
+        return ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_validator_queryset(self):
+        if self.action == 'list':
+            return self.filter_queryset(self.get_queryset())
+
+        # DRF의 get_object_or_404처럼 잘못된 형식의 lookup 값(예: 숫자 id에 'abc')은 404로 처리
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+    def get_validators(self, request):
+        dependencies = self.get_cache_dependencies()
+        key = build_response_cache_key(self.cache_namespace, f'{self.action}:validators', request, dependencies)
+        validators = cache.get(key)
+
+        if validators is None:
+            validators = compute_validators(self.get_validator_queryset(), self.cache_namespace, request,
+                                            dependencies)
+            cache.set(key, validators, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        return validators
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        return set_validators(handler(request, *args, **kwargs), etag, last_modified)
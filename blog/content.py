@@ -0,0 +1,110 @@
+import html
+import math
+import re
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.utils.text import Truncator, slugify
+
+EXCERPT_LENGTH = 200
+TAG_RE = re.compile(r'<[^>]*>')
+HEADING_TAG_RE = re.compile(r'<h[1-6]\b', re.IGNORECASE)
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+
+def html_to_text(content):
+    '''
+    HTML 본문에서 태그를 제거하고 공백을 정리한 평문을 반환
+    '''
+    return ' '.join(html.unescape(TAG_RE.sub(' ', content or '')).split())
+
+
+class HeadingParser(HTMLParser):
+    '''
+    h1~h6 제목의 단계 / id 속성 / 텍스트 / 시작 태그 위치를 순서대로 수집 (제목 안의 인라인 태그 텍스트 포함)
+    '''
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headings = []
+        self.current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HEADING_TAGS and self.current is None:
+            attrs = dict(attrs)
+            self.current = {'level': int(tag[1]), 'id': attrs.get('id'), 'has_id': 'id' in attrs,
+                            'position': self.getpos(), 'text': []}
+
+    def handle_endtag(self, tag):
+        if tag in HEADING_TAGS and self.current is not None and int(tag[1]) == self.current['level']:
+            self.current['text'] = ' '.join(''.join(self.current['text']).split())
+            if self.current['text']:
+                self.headings.append(self.current)
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current is not None:
+            self.current['text'].append(data)
+
+
+def _offset(content, position):
+    # HTMLParser.getpos()의 (줄 번호, 줄 안의 위치)를 문자열 위치로 변환
+    lineno, column = position
+    offset = 0
+    for _ in range(lineno - 1):
+        offset = content.index('\n', offset) + 1
+    return offset + column
+
+
+def build_toc(content):
+    '''
+    (id를 넣은 본문, 목차 [{'level', 'id', 'title'}])
+    본문에 id가 없는 제목은 제목 텍스트로 만든 slug를 id로 만들어 시작 태그에 넣음
+    (본문에 이미 있는 id / 앞에서 만든 id와 겹치면 -2, -3 ... 으로 구분, 빈 id 속성이 있는 제목은 목차에서 제외)
+    '''
+    if not content or not HEADING_TAG_RE.search(content):
+        return content, []
+
+    parser = HeadingParser()
+    parser.feed(content)
+    parser.close()
+
+    toc = []
+    insertions = []
+    used_ids = {heading['id'] for heading in parser.headings if heading['id']}
+    for heading in parser.headings:
+        anchor = heading['id']
+        if not anchor:
+            if heading['has_id']:
+                continue
+            base = slugify(heading['text'], allow_unicode=True) or 'section'
+            anchor, suffix = base, 2
+            while anchor in used_ids:
+                anchor, suffix = f'{base}-{suffix}', suffix + 1
+            used_ids.add(anchor)
+            # <hN 바로 뒤에 id 속성 추가
+            insertions.append((_offset(content, heading['position']) + 3, anchor))
+
+        toc.append({'level': heading['level'], 'id': anchor, 'title': heading['text']})
+
+    for offset, anchor in reversed(insertions):
+        content = f'{content[:offset]} id="{html.escape(anchor)}"{content[offset:]}'
+    return content, toc
+
+
+def analyze_content(content):
+    '''
+    게시글 저장 시 한 번 계산하여 저장하는 본문 파생 값과 목차 id를 넣은 본문(content)
+    (목록 / 상세 화면이 본문 전체를 받아 직접 계산하지 않도록 함)
+    '''
+    text = html_to_text(content)
+    word_count = len(text.split())
+    content, toc = build_toc(content)
+
+    return {
+        'content': content,
+        'excerpt': Truncator(text).chars(EXCERPT_LENGTH),
+        'word_count': word_count,
+        # 분 단위 올림, 본문이 있으면 최소 1분
+        'reading_time': math.ceil(word_count / settings.READING_WORDS_PER_MINUTE) if word_count else 0,
+        'toc': toc,
+    }
@@ -0,0 +1,71 @@
+import secrets
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, identify_hasher
+
+UNUSABLE_PASSWORD_PREFIX = '!'
+
+
+class CommentPasswordHasher(PBKDF2PasswordHasher):
+    '''
+    익명 댓글 비밀번호 전용 PBKDF2 해셔
+    로그인 비밀번호보다 가치가 낮고 요청마다 검증하므로 반복 횟수를 COMMENT_PASSWORD_ITERATIONS로 낮춰 사용
+    (PASSWORD_HASHERS에 등록하지 않고 여기서 직접 호출)
+    '''
+    algorithm = 'comment_pbkdf2_sha256'
+
+    @property
+    def iterations(self):
+        return settings.COMMENT_PASSWORD_ITERATIONS
+
+
+comment_hasher = CommentPasswordHasher()
+
+
+def is_password_hash(value):
+    '''
+    이미 해시된 값(댓글 전용 해시, Django 기본 해시, 사용 불가 비밀번호)인지 확인
+    '''
+    if not value:
+        return False
+    # make_password(None) 형식: '!' + 임의 문자열 40자
+    if value.startswith(UNUSABLE_PASSWORD_PREFIX) and len(value) == 41:
+        return True
+    if value.startswith(f'{comment_hasher.algorithm}$'):
+        return True
+
+    try:
+        identify_hasher(value)
+    except ValueError:
+        return False
+    return True
+
+
+def make_comment_password(raw_password):
+    '''
+    비밀번호가 없으면 (make_password(None)과 같이) 어떤 값으로도 일치하지 않는 값을 반환
+    '''
+    if raw_password is None:
+        return UNUSABLE_PASSWORD_PREFIX + secrets.token_hex(20)
+    return comment_hasher.encode(raw_password, comment_hasher.salt())
+
+
+def check_comment_password(raw_password, encoded, setter=None):
+    '''
+    댓글 비밀번호 확인
+    이전 방식(Django 기본 해셔)으로 저장된 비밀번호는 기존대로 확인하고, 일치하면 setter로 새 해시로 교체
+    '''
+    if not raw_password or not encoded or encoded.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
+
+    if encoded.startswith(f'{comment_hasher.algorithm}$'):
+        if not comment_hasher.verify(raw_password, encoded):
+            return False
+        if setter is not None and comment_hasher.must_update(encoded):
+            setter(raw_password)
+        return True
+
+    is_correct = check_password(raw_password, encoded)
+    if is_correct and setter is not None:
+        setter(raw_password)
+    return is_correct
@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+
+from PIL import Image
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ImageTooLargeError(ValueError):
+    '''
+    픽셀 수가 허용 한도를 넘는 이미지 (디컴프레션 폭탄 방지)
+    '''
+
+
+def spool_stream(stream, max_memory_size, hasher=None):
+    '''
+    S3 Body 같은 스트림을 청크 단위로 복사하여 seek 가능한 임시 파일로 반환
+    max_memory_size를 넘으면 메모리 대신 디스크에 기록되어 압축 데이터가 메모리에 통째로 올라가지 않음
+    hasher(hashlib 객체)를 주면 복사하면서 원본 해시도 함께 계산 (추가 읽기 없음)
+    '''
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+
+    if hasher is None:
+        shutil.copyfileobj(stream, spooled, STREAM_CHUNK_SIZE)
+    else:
+        while chunk := stream.read(STREAM_CHUNK_SIZE):
+            hasher.update(chunk)
+            spooled.write(chunk)
+
+    spooled.seek(0)
+    return spooled
+
+
+def fit_within(size, box):
+    '''
+    비율을 유지하며 box 안에 들어가는 크기 (확대하지 않음, Image.thumbnail과 같은 규칙)
+    '''
+    width, height = size
+    scale = min(box[0] / width, box[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def open_image_bounded(fileobj, max_width, max_pixels):
+    '''
+    헤더만 읽어 픽셀 수 한도를 확인한 뒤, JPEG는 draft 모드로 필요한 최대 너비(max_width) 이상인
+    가장 작은 배율(1/2, 1/4, 1/8)로 축소 디코딩
+    반환: (디코딩된 이미지, 원본 포맷, 원본 크기)
+    '''
+    image = Image.open(fileobj)
+    source_format = image.format
+    source_size = image.size
+
+    if source_size[0] * source_size[1] > max_pixels:
+        image.close()
+        raise ImageTooLargeError(f'이미지 픽셀 수가 허용 한도를 초과합니다: {source_size[0]}x{source_size[1]}')
+
+    if source_format == 'JPEG':
+        target_width = min(source_size[0], max_width)
+        image.draft(None, (target_width, max(1, source_size[1] * target_width // source_size[0])))
+
+    image.load()
+    return image, source_format, source_size
+
+
+def resize_to(image, size):
+    '''
+    이미 원하는 크기면 그대로, 아니면 LANCZOS로 새 이미지 생성 (원본 전체 복사본을 만들지 않음)
+    '''
+    if image.size == tuple(size):
+        return image
+    return image.resize(size, Image.LANCZOS)
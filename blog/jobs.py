@@ -0,0 +1,113 @@
+import math
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .assets import get_or_generate_derivatives
+from .models import ImageJob
+
+
+def enqueue_image_job(s3_key):
+    return ImageJob.objects.create(s3_key=s3_key)
+
+
+def fail_exhausted_jobs(stale_before):
+    '''
+    최대 시도 횟수를 모두 쓴 뒤 처리 중 상태로 멈춘 작업(워커 비정상 종료)을 실패로 처리
+    (다시 가져가지 않으므로 그대로 두면 상태 조회가 계속 processing을 반환)
+    '''
+    return (ImageJob.objects
+            .filter(status=ImageJob.Status.PROCESSING, updated_at__lt=stale_before,
+                    attempts__gte=settings.IMAGE_JOB_MAX_ATTEMPTS)
+            .update(status=ImageJob.Status.FAILED, error='최대 시도 횟수 동안 작업이 완료되지 않았습니다.',
+                    updated_at=timezone.now()))
+
+
+def claim_next_job():
+    '''
+    대기 중인 작업 하나를 처리 중으로 바꾸어 반환 (없으면 None)
+    PostgreSQL에서는 SKIP LOCKED로 여러 워커 프로세스가 서로 다른 작업을 가져감
+    처리 중 상태로 오래 남아 있는 작업(워커 비정상 종료)은 최대 시도 횟수까지 다시 가져감
+    '''
+    stale_before = timezone.now() - timedelta(seconds=settings.IMAGE_JOB_TIMEOUT)
+    fail_exhausted_jobs(stale_before)
+
+    with transaction.atomic():
+        job = (ImageJob.objects
+               .select_for_update(skip_locked=True)
+               .filter(Q(status=ImageJob.Status.PENDING) |
+                       Q(status=ImageJob.Status.PROCESSING, updated_at__lt=stale_before))
+               .filter(attempts__lt=settings.IMAGE_JOB_MAX_ATTEMPTS)
+               .order_by('created_at')
+               .first())
+
+        if job is None:
+            return None
+
+        job.status = ImageJob.Status.PROCESSING
+        job.attempts += 1
+        job.save(update_fields=['status', 'attempts', 'updated_at'])
+
+    return job
+
+
+def process_job(job):
+    try:
+        manifest = get_or_generate_derivatives(job.s3_key)
+    except Exception as e:
+        manifest = None
+        job.error = str(e)
+
+    if manifest:
+        job.status = ImageJob.Status.DONE
+        job.result_url = manifest['url']
+        job.manifest = manifest
+        job.error = ''
+    else:
+        job.status = ImageJob.Status.FAILED
+        job.error = job.error or '리사이즈된 이미지 업로드에 실패했습니다.'
+
+    job.save(update_fields=['status', 'result_url', 'manifest', 'error', 'updated_at'])
+    return job
+
+
+def run_worker(poll_interval=1.0, max_jobs=None, once=False):
+    '''
+    작업 큐를 폴링하며 처리 (once=True면 대기 작업이 없을 때 종료)
+    처리량은 이 워커를 실행하는 프로세스 수에 비례하여 늘어남
+    '''
+    processed = 0
+
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_job()
+
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        process_job(job)
+        processed += 1
+
+    return processed
+
+
+def wait_for_job(job_id, timeout, poll_interval=0.5):
+    '''
+    작업이 끝나거나(done/failed) timeout초가 지날 때까지 기다린 뒤 작업을 반환 (롱 폴링)
+    '''
+    if not math.isfinite(timeout):
+        raise ValueError('timeout은 유한한 값이어야 합니다.')
+    deadline = time.monotonic() + timeout
+
+    while True:
+        job = ImageJob.objects.get(pk=job_id)
+
+        if job.status in (ImageJob.Status.DONE, ImageJob.Status.FAILED) or time.monotonic() >= deadline:
+            return job
+        time.sleep(poll_interval)
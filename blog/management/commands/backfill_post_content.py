@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from blog.bulk import DEFAULT_BATCH_SIZE
+from blog.cache import bump_version
+from blog.content import analyze_content
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = '기존 게시글의 요약 / 단어 수 / 읽는 시간 / 목차를 본문에서 다시 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='한 번에 갱신할 게시글 수')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # 목차 id를 넣은 본문도 함께 저장
+        fields = ['content', *Post.CONTENT_DERIVED_FIELDS]
+
+        # save()/signals를 거치지 않고 파생 필드만 갱신 (updated_at, 이미지 색인, 캐시 무효화 반복 방지)
+        posts = Post.objects.only('id', 'content').order_by('id')
+        batch, updated = [], 0
+
+        for post in posts.iterator(chunk_size=batch_size):
+            for field, value in analyze_content(post.content).items():
+                setattr(post, field, value)
+            batch.append(post)
+
+            if len(batch) >= batch_size:
+                Post.objects.bulk_update(batch, fields)
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            Post.objects.bulk_update(batch, fields)
+            updated += len(batch)
+
+        if updated:
+            bump_version('posts')
+        self.stdout.write(self.style.SUCCESS(f'게시글 본문 파생 값 계산 완료: {updated}개'))
@@ -0,0 +1,114 @@
+import io
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from blog.images import fit_within, open_image_bounded, resize_to, spool_stream
+
+THUMBNAIL_BOX = (800, 600)
+DERIVATIVE_WIDTHS = (400, 800, 1600)
+
+
+def _decode_legacy(path):
+    # 변경 전 방식: 원본 전체를 BytesIO로 읽고, 전체 해상도로 디코딩한 뒤 copy() 후 thumbnail
+    with open(path, 'rb') as f:
+        image = Image.open(io.BytesIO(f.read()))
+        image.load()
+
+    resized = image.copy()
+    resized.thumbnail(THUMBNAIL_BOX, Image.LANCZOS)
+    for width in DERIVATIVE_WIDTHS:
+        width = min(width, image.width)
+        image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+
+
+def _decode_bounded(path):
+    # 변경 후 방식: 청크 단위 스풀링 + JPEG draft 축소 디코딩 + copy() 없이 필요한 크기만 생성
+    with open(path, 'rb') as f, spool_stream(f, 2 * 1024 * 1024) as spooled:
+        image, _, source_size = open_image_bounded(spooled, max(THUMBNAIL_BOX[0], *DERIVATIVE_WIDTHS), 10 ** 9)
+
+    resize_to(image, fit_within(source_size, THUMBNAIL_BOX))
+    for width in DERIVATIVE_WIDTHS:
+        width = min(width, source_size[0])
+        resize_to(image, (width, max(1, round(source_size[1] * width / source_size[0]))))
+
+
+def _reset_peak_rss():
+    # fork/exec 시 부모의 최대 RSS가 이어지므로 Linux에서는 측정 전에 최대값을 초기화
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Linux의 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_mode(mode, path, runs, queue):
+    decode = _decode_legacy if mode == 'legacy' else _decode_bounded
+    timings = []
+    _reset_peak_rss()
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        decode(path)
+        timings.append(time.perf_counter() - start)
+
+    queue.put((timings, _peak_rss_kb()))
+
+
+class Command(BaseCommand):
+    help = '이미지 리사이즈 디코딩 경로의 이미지당 처리 시간과 최대 RSS를 변경 전/후로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--width', type=int, default=6000)
+        parser.add_argument('--height', type=int, default=4000)
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--quality', type=int, default=90)
+
+    def handle(self, *args, **options):
+        path = self.make_sample(options['width'], options['height'], options['quality'])
+        self.stdout.write(f"샘플 JPEG: {options['width']}x{options['height']}, {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+        try:
+            # 모드별로 새 프로세스에서 실행하여 최대 RSS가 서로 섞이지 않도록 함
+            context = multiprocessing.get_context('spawn')
+            for mode in ('legacy', 'bounded'):
+                queue = context.Queue()
+                process = context.Process(target=_run_mode, args=(mode, path, options['runs'], queue))
+                process.start()
+                timings, max_rss_kb = queue.get()
+                process.join()
+
+                self.stdout.write(
+                    f'{mode:>8}: 이미지당 {statistics.median(timings) * 1000:.1f}ms (median), '
+                    f'최대 RSS {max_rss_kb / 1024:.1f}MB'
+                )
+        finally:
+            os.remove(path)
+
+    def make_sample(self, width, height, quality):
+        # 압축률이 비현실적으로 높지 않도록 노이즈가 섞인 이미지 생성
+        noise = Image.effect_noise((width, height), 64)
+        image = Image.merge('RGB', (noise, noise.transpose(Image.FLIP_LEFT_RIGHT), noise.transpose(Image.FLIP_TOP_BOTTOM)))
+
+        fd, path = tempfile.mkstemp(suffix='.jpg')
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, format='JPEG', quality=quality)
+        return path
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import utils
+
+
+def _extract_legacy(content):
+    # 변경 전 방식: BeautifulSoup 트리 전체를 만든 뒤 img 태그 검색
+    from bs4 import BeautifulSoup
+
+    parser = BeautifulSoup(content, 'html.parser')
+    prefix = f'{settings.AWS_CLOUDFRONT_DOMAIN}/'
+    return {
+        img.get('src').replace(prefix, '')
+        for img in parser.findAll('img')
+        if img.get('src') and img.get('src').startswith(prefix)
+    }
+
+
+def _extract_streaming(content):
+    # 변경 후 방식 (메모이제이션 제외한 순수 파싱 비용)
+    return utils._parse_image_keys(content, f'{settings.AWS_CLOUDFRONT_DOMAIN}/')
+
+
+class Command(BaseCommand):
+    help = '본문 이미지 키 추출을 BeautifulSoup(변경 전)과 HTMLParser 스트리밍 추출(변경 후)로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paragraphs', type=int, default=2000, help='문서당 문단 수')
+        parser.add_argument('--images', type=int, default=100, help='문서당 이미지 수')
+        parser.add_argument('--runs', type=int, default=10)
+
+    def handle(self, *args, **options):
+        content = self.make_document(options['paragraphs'], options['images'])
+        self.stdout.write(f"샘플 문서: {len(content) / 1024:.0f}KB, 이미지 {options['images']}개")
+
+        if _extract_legacy(content) != set(_extract_streaming(content)):
+            raise CommandError('두 방식의 추출 결과가 다릅니다')
+
+        results = {}
+        for name, extract in (('legacy', _extract_legacy), ('streaming', _extract_streaming)):
+            timings = []
+            for _ in range(options['runs']):
+                start = time.perf_counter()
+                extract(content)
+                timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings)
+            self.stdout.write(f'{name:>10}: {results[name] * 1000:.2f}ms (median)')
+
+        # 게시글 수정 한 번에 같은 본문을 여러 번 추출하는 경우 (캐시 적중)
+        with contextlib.redirect_stdout(io.StringIO()):
+            utils.extract_image_keys_from_content(content)
+            start = time.perf_counter()
+            utils.extract_image_keys_from_content(content)
+        self.stdout.write(f"{'memoized':>10}: {(time.perf_counter() - start) * 1000:.2f}ms")
+        self.stdout.write(f"속도 향상: {results['legacy'] / results['streaming']:.1f}배")
+
+    def make_document(self, paragraphs, images):
+        prefix = settings.AWS_CLOUDFRONT_DOMAIN
+        every = max(1, paragraphs // max(images, 1))
+        parts = []
+
+        for i in range(paragraphs):
+            parts.append(f'<h2 id="s{i}">Section {i}</h2>' if i % 50 == 0 else '')
+            parts.append(f'<p>Paragraph {i} with <strong>bold</strong>, <a href="https://example.com/{i}">link</a> &amp; text.</p>')
+            if i % every == 0 and i // every < images:
+                parts.append(f'<figure><img src="{prefix}/resized/{i}.jpg" alt="image {i}"></figure>')
+
+        parts.append('<p><img src="https://other.example.com/external.png"></p>')
+        return ''.join(parts)
@@ -0,0 +1,82 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 웹 워커 기동 시 로드되면 안 되는 무거운 모듈 (실제 사용 시점에 지연 로드)
+LAZY_MODULES = ('boto3', 'botocore', 'PIL', 'bs4')
+
+STARTUP_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import myblog.wsgi
+wsgi = time.perf_counter() - start
+from django.urls import get_resolver
+get_resolver().url_patterns
+urlconf = time.perf_counter() - start
+print(json.dumps({
+    'wsgi': wsgi,
+    'urlconf': urlconf,
+    'loaded': sorted(name for name in %r if name in sys.modules),
+}))
+''' % (LAZY_MODULES,)
+
+
+class Command(BaseCommand):
+    help = '새 프로세스에서 myblog.wsgi import(+ URLconf 로드)에 걸리는 시간을 측정합니다 (워커 기동 / 콜드 스타트)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--max-ms', type=float, default=None,
+                            help='URLconf 로드까지의 median 시간이 이 값(ms)을 넘으면 실패')
+        parser.add_argument('--importtime', type=int, default=0, metavar='N',
+                            help='-X importtime 기준 누적 import 시간 상위 N개 모듈 출력')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        results = [self.run_once(env) for _ in range(options['runs'])]
+
+        wsgi_ms = statistics.median(result['wsgi'] for result in results) * 1000
+        urlconf_ms = statistics.median(result['urlconf'] for result in results) * 1000
+        loaded = sorted({name for result in results for name in result['loaded']})
+
+        self.stdout.write(f"import myblog.wsgi: {wsgi_ms:.1f}ms (median, {options['runs']}회)")
+        self.stdout.write(f'+ URLconf 로드: {urlconf_ms:.1f}ms (median)')
+        self.stdout.write(f"기동 시 로드된 지연 대상 모듈: {', '.join(loaded) or '없음'}")
+
+        if options['importtime']:
+            self.write_importtime(env, options['importtime'])
+
+        if loaded:
+            raise CommandError(f"기동 시 무거운 모듈이 로드되었습니다: {', '.join(loaded)}")
+        if options['max_ms'] is not None and urlconf_ms > options['max_ms']:
+            raise CommandError(f"기동 시간 {urlconf_ms:.1f}ms가 기준 {options['max_ms']:.1f}ms를 초과했습니다")
+
+    def run_script(self, env, *flags):
+        completed = subprocess.run(
+            [sys.executable, *flags, '-c', STARTUP_SCRIPT],
+            env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(completed.stderr.strip())
+        return completed
+
+    def run_once(self, env):
+        return json.loads(self.run_script(env).stdout.strip().splitlines()[-1])
+
+    def write_importtime(self, env, limit):
+        # 출력 형식: "import time: self [us] | cumulative | imported package"
+        completed = self.run_script(env, '-X', 'importtime')
+        rows = []
+        for line in completed.stderr.splitlines():
+            parts = line.removeprefix('import time:').split('|')
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                rows.append((int(parts[1]), parts[2].strip()))
+
+        self.stdout.write(f'누적 import 시간 상위 {limit}개:')
+        for cumulative, name in sorted(rows, reverse=True)[:limit]:
+            self.stdout.write(f'  {cumulative / 1000:8.1f}ms  {name}')
@@ -0,0 +1,359 @@
+import contextlib
+import io
+import json
+import math
+import platform
+import random
+import re
+import resource
+import statistics
+import time
+import tracemalloc
+from typing import Callable, NamedTuple, Optional
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.bulk import BlogImporter
+from blog.credentials import make_comment_password
+from blog.models import Comment, Post
+from blog.storage import get_storage
+
+WORDS = ('django', 'python', 'cache', 'query', 'index', 'image', 'storage', 'async', 'token', 'search',
+         'deploy', 'docker', 'nginx', 'profile', 'latency', 'memory', 'thread', 'worker', 'signal', 'model')
+
+SERVER_TIMING_RE = re.compile(r'(\w+);dur=[\d.]+(?:;desc="(\d+) \w+")?')
+
+
+class Scenario(NamedTuple):
+    name: str
+    request: Callable  # (i, prepared) -> response
+    expected_status: int
+    prepare: Optional[Callable] = None  # i -> prepared (측정 시간에서 제외)
+
+
+def percentile(sorted_values, p):
+    # nearest-rank 백분위수
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def iter_dataset_records(posts, comments_per_post, tags, users, tags_per_post, seed):
+    '''
+    BlogImporter용 합성 데이터 (같은 seed면 같은 데이터)
+    '''
+    rng = random.Random(seed)
+    tag_names = [f'tag{i}' for i in range(tags)]
+    usernames = [f'bench_user_{i}' for i in range(users)]
+    # 익명 댓글 비밀번호는 한 번만 해시하여 재사용 (가져오기 시간 단축)
+    password = make_comment_password('bench-password')
+
+    for post_id in range(posts):
+        paragraphs = []
+        for section in range(rng.randint(2, 6)):
+            paragraphs.append(f'<h2>{rng.choice(WORDS).title()} {section}</h2>')
+            for _ in range(rng.randint(1, 4)):
+                paragraphs.append(f"<p>{' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 80)))}</p>")
+        if post_id % 5 == 0:
+            paragraphs.append(f'<img src="{settings.AWS_CLOUDFRONT_DOMAIN}/resized/bench-{post_id}.jpg">')
+
+        yield {
+            'type': 'post',
+            'id': post_id,
+            'title': f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} #{post_id}",
+            'content': ''.join(paragraphs),
+            'author': rng.choice(usernames),
+            'tags': rng.sample(tag_names, min(tags_per_post, len(tag_names))),
+        }
+
+    for post_id in range(posts):
+        for i in range(comments_per_post):
+            anonymous = i % 2 == 1
+            yield {
+                'type': 'comment',
+                'post': post_id,
+                'author': None if anonymous else rng.choice(usernames),
+                'author_name': f'guest_{i}' if anonymous else '',
+                'password': password if anonymous else None,
+                'content': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))),
+            }
+
+
+def make_image(size, index):
+    from PIL import Image
+
+    # 요청마다 다른 색 (sha256 중복 제거로 리사이즈가 생략되지 않도록)
+    color = (index * 37 % 256, index * 91 % 256, index * 53 % 256)
+    buffer = io.BytesIO()
+    Image.new('RGB', (size, size * 3 // 4), color).save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+def compare_with_baseline(results, baseline, threshold, min_delta_ms):
+    '''
+    기준 결과 대비 p95가 threshold(비율) 이상 + min_delta_ms 이상 느려졌거나 요청당 쿼리 수가 늘어난 시나리오 목록
+    p95는 반복 측정(--repeat)의 중앙값끼리 비교하고, 반복 중 가장 빠른 p95도 기준을 넘을 때만 회귀로 판단
+    (한 번의 측정에서 튄 값으로 실패하지 않도록)
+    '''
+    regressions = []
+
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+
+        limit = max(previous['p95_ms'] * (1 + threshold), previous['p95_ms'] + min_delta_ms)
+        fastest = min(current.get('p95_runs_ms') or [current['p95_ms']])
+        if current['p95_ms'] > limit and fastest > limit:
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms "
+                               f"(반복 측정 최소 {fastest:.1f}ms)")
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: 요청당 쿼리 수 {previous['queries']} -> {current['queries']}")
+
+    return regressions
+
+
+class Command(BaseCommand):
+    help = ('합성 데이터셋을 만들고 주요 API(목록 / 검색 / 태그 / 상세 / 댓글 / 댓글 작성 / presign / 리사이즈)의 '
+            'p50/p95/p99 응답 시간, 요청당 쿼리 수, 메모리 사용량을 측정합니다')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--comments-per-post', type=int, default=5)
+        parser.add_argument('--tags', type=int, default=50)
+        parser.add_argument('--tags-per-post', type=int, default=3)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0, help='데이터 생성 / 요청 파라미터 난수 시드')
+        parser.add_argument('--requests', type=int, default=50, help='시나리오별 측정 요청 수 (반복 1회당)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='시나리오별 반복 측정 횟수 (p50/p95/p99는 반복별 값의 중앙값)')
+        parser.add_argument('--warmup', type=int, default=3, help='시나리오별 측정 전 요청 수')
+        parser.add_argument('--memory-samples', type=int, default=3,
+                            help='시나리오별 tracemalloc 측정 요청 수 (응답 시간 측정과 분리)')
+        parser.add_argument('--image-size', type=int, default=1600, help='리사이즈 시나리오 원본 이미지 가로 크기')
+        parser.add_argument('--scenarios', help='실행할 시나리오 이름 (쉼표 구분, 기본 전체)')
+        parser.add_argument('--no-cache', action='store_true', help='응답 캐시 없이 측정 (DummyCache)')
+        parser.add_argument('--current-db', action='store_true',
+                            help='임시 테스트 DB를 만들지 않고 현재 DB에 데이터를 만들어 측정 (전용 DB / 테스트용)')
+        parser.add_argument('--output', help='결과 JSON 파일 경로')
+        parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일 경로 (회귀 시 실패)')
+        parser.add_argument('--threshold', type=float, default=0.2, help='p95 회귀 판단 비율 (기본 20%%)')
+        parser.add_argument('--min-delta-ms', type=float, default=1.0, help='이보다 작은 p95 증가는 무시')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat는 1 이상이어야 합니다')
+
+        cache_backend = ('django.core.cache.backends.dummy.DummyCache' if options['no_cache']
+                         else 'django.core.cache.backends.locmem.LocMemCache')
+        overrides = override_settings(
+            STORAGE={'BACKEND': 'blog.storage.InMemoryStorage'},
+            CACHES={'default': {'BACKEND': cache_backend, 'LOCATION': 'blog-benchmark'}},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            DEBUG=False,
+            SERVER_TIMING_ENABLED=True,
+        )
+
+        # 기본은 마이그레이션된 임시 테스트 DB에서 실행하고 종료 시 삭제 (실제 데이터에 영향 없음)
+        old_database_name = None
+        if not options['current_db']:
+            old_database_name = connection.settings_dict['NAME']
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            with overrides:
+                results = self.run_benchmark(options)
+        finally:
+            if old_database_name is not None:
+                connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+        if options['baseline']:
+            self.check_baseline(results, options)
+
+    def run_benchmark(self, options):
+        start = time.perf_counter()
+        importer = BlogImporter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for record in iter_dataset_records(options['posts'], options['comments_per_post'], options['tags'],
+                                               options['users'], options['tags_per_post'], options['seed']):
+                importer.feed(record)
+            stats = importer.finish()
+        self.stdout.write(f"데이터셋: 게시글 {stats['posts']}개, 댓글 {stats['comments']}개 "
+                          f"({time.perf_counter() - start:.1f}s)")
+
+        scenarios = self.build_scenarios(options)
+        if options['scenarios']:
+            selected = set(options['scenarios'].split(','))
+            unknown = selected - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+            scenarios = [scenario for scenario in scenarios if scenario.name in selected]
+
+        results = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'response_cache': not options['no_cache'],
+                'dataset': {key: options[key] for key in
+                            ('posts', 'comments_per_post', 'tags', 'tags_per_post', 'users', 'seed')},
+                'requests': options['requests'],
+                'repeat': options['repeat'],
+            },
+            'scenarios': {},
+        }
+
+        for scenario in scenarios:
+            result = self.measure(scenario, options)
+            results['scenarios'][scenario.name] = result
+            self.stdout.write(
+                f"{scenario.name:<15} p50 {result['p50_ms']:7.1f}ms  p95 {result['p95_ms']:7.1f}ms  "
+                f"p99 {result['p99_ms']:7.1f}ms  쿼리 {result['queries']:>3}  저장소 {result['storage_calls']:>2}  "
+                f"peak {result['peak_memory_kb']:>7.0f}KB" + (f"  오류 {result['errors']}" if result['errors'] else '')
+            )
+
+        # 프로세스 최대 RSS (Linux는 KB 단위)
+        results['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(f"프로세스 최대 RSS: {results['peak_rss_kb'] / 1024:.0f}MB")
+        return results
+
+    def build_scenarios(self, options):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        rng = random.Random(options['seed'])
+        post_ids = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+        if not post_ids:
+            raise CommandError('게시글이 없어 측정할 수 없습니다 (--posts 확인)')
+        tag_names = [f'tag{i}' for i in range(options['tags'])] or ['tag0']
+
+        anonymous = Client()
+        user = Post.objects.select_related('author').get(pk=post_ids[0]).author
+        authenticated = Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        own_comment = Comment.objects.create(post_id=post_ids[0], author=user, content='benchmark')
+
+        storage = get_storage()
+
+        def put_temp_image(i):
+            key = f'temp/bench-{i}.jpg'
+            storage.put(io.BytesIO(make_image(options['image_size'], i)), key, 'image/jpeg')
+            return key
+
+        return [
+            Scenario('post_list', lambda i, _: anonymous.get(
+                reverse('post-list'), {'page_size': 20, 'ordering': rng.choice(['-created_at', 'title'])}), 200),
+            Scenario('post_search', lambda i, _: anonymous.get(
+                reverse('post-list'), {'search': rng.choice(WORDS), 'page_size': 20}), 200),
+            Scenario('tag_filter', lambda i, _: anonymous.get(
+                reverse('post-list'), {'tags__name': rng.choice(tag_names), 'page_size': 20}), 200),
+            Scenario('post_detail', lambda i, _: anonymous.get(
+                reverse('post-detail', args=[rng.choice(post_ids)])), 200),
+            Scenario('comments', lambda i, _: anonymous.get(
+                reverse('post-get-comments-list', args=[rng.choice(post_ids)])), 200),
+            Scenario('comment_create', lambda i, _: anonymous.post(
+                reverse('post-comments-list'),
+                {'post_id': rng.choice(post_ids), 'content': f'benchmark comment {i}', 'password': 'bench-password'},
+                content_type='application/json'), 201),
+            Scenario('comment_update', lambda i, _: authenticated.patch(
+                reverse('post-comments-detail', args=[own_comment.pk]),
+                {'content': f'benchmark update {i}'}, content_type='application/json'), 200),
+            Scenario('presign', lambda i, _: anonymous.post(
+                reverse('s3-presigned-url'),
+                {'file_name': f'bench-{i}.jpg', 'file_type': 'image/jpeg', 'file_size': 1024},
+                content_type='application/json'), 200),
+            Scenario('resize', lambda i, key: anonymous.post(
+                reverse('image-upload'), {'s3_key': key}, content_type='application/json'), 200, put_temp_image),
+        ]
+
+    def measure(self, scenario, options):
+        index = 0
+        errors = []
+
+        def run(timed=True):
+            nonlocal index
+            index += 1
+            prepared = scenario.prepare(index) if scenario.prepare else None
+
+            # 뷰의 로그 출력이 측정 결과 출력과 섞이지 않도록 숨김
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                response = scenario.request(index, prepared)
+                elapsed = time.perf_counter() - started
+
+            if response.status_code != scenario.expected_status:
+                errors.append(f'{response.status_code}: {response.content[:200]!r}')
+            counts = {name: int(count or 0)
+                      for name, count in SERVER_TIMING_RE.findall(response.get('Server-Timing', ''))}
+            return elapsed, counts
+
+        for _ in range(options['warmup']):
+            run()
+        errors.clear()
+
+        # 반복마다 백분위수를 계산하고 중앙값을 결과로 사용 (반복 사이의 잡음 완화)
+        runs = {50: [], 95: [], 99: []}
+        timings, queries, storage_calls = [], [], []
+        for _ in range(options['repeat']):
+            run_timings = []
+            for _ in range(options['requests']):
+                elapsed, counts = run()
+                run_timings.append(elapsed * 1000)
+                queries.append(counts.get('db', 0))
+                storage_calls.append(counts.get('storage', 0))
+
+            run_timings.sort()
+            for p, values in runs.items():
+                values.append(percentile(run_timings, p))
+            timings.extend(run_timings)
+
+        # 메모리 측정은 tracemalloc 오버헤드가 응답 시간에 섞이지 않도록 별도 요청으로
+        peak = 0
+        tracemalloc.start()
+        try:
+            for _ in range(options['memory_samples']):
+                tracemalloc.reset_peak()
+                run()
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'requests': len(timings),
+            'p50_ms': round(statistics.median(runs[50]), 3),
+            'p95_ms': round(statistics.median(runs[95]), 3),
+            'p99_ms': round(statistics.median(runs[99]), 3),
+            'p95_runs_ms': [round(value, 3) for value in runs[95]],
+            'mean_ms': round(statistics.fmean(timings), 3) if timings else 0.0,
+            # 캐시 적중 여부에 따라 달라지므로 최댓값 기록
+            'queries': max(queries, default=0),
+            'storage_calls': max(storage_calls, default=0),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'errors': len(errors),
+            'first_error': errors[0] if errors else None,
+        }
+
+    def check_baseline(self, results, options):
+        with open(options['baseline'], encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        if baseline.get('meta', {}).get('dataset') != results['meta']['dataset']:
+            self.stdout.write(self.style.WARNING('기준 결과와 데이터셋 설정이 달라 비교 결과가 정확하지 않을 수 있습니다'))
+
+        regressions = compare_with_baseline(results, baseline, options['threshold'], options['min_delta_ms'])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'회귀: {regression}'))
+            raise CommandError(f'기준 결과 대비 성능 회귀 {len(regressions)}건')
+
+        self.stdout.write(self.style.SUCCESS('기준 결과 대비 회귀 없음'))
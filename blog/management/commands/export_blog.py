@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from blog.bulk import DEFAULT_BATCH_SIZE, dump_record, iter_export_records
+
+
+class Command(BaseCommand):
+    help = '게시글 / 댓글을 JSON Lines로 내보냅니다 (import_blog 형식)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="출력 파일 경로 (기본 '-' 표준 출력)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        to_stdout = options['path'] == '-'
+        output = self.stdout if to_stdout else open(options['path'], 'w', encoding='utf-8')
+        # OutputWrapper(self.stdout)는 줄바꿈을 자동으로 붙임
+        ending = '' if to_stdout else '\n'
+        count = 0
+
+        try:
+            for record in iter_export_records(batch_size=options['batch_size']):
+                output.write(dump_record(record) + ending)
+                count += 1
+        finally:
+            if not to_stdout:
+                output.close()
+
+        if not to_stdout:
+            self.stdout.write(self.style.SUCCESS(f'{count}개 레코드를 내보냈습니다: {options["path"]}'))
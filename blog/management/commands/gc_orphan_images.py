@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.assets import forget_image_assets
+from blog.post_images import get_referenced_image_stems
+from blog.storage import get_storage
+from blog.utils import get_image_stem
+
+DEFAULT_PREFIXES = ['temp/', 'resized/']
+
+
+class Command(BaseCommand):
+    help = '게시글이 참조하지 않는 temp/ · resized/ 이미지 중 유예 기간이 지난 객체를 배치로 삭제합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', action='append', choices=['temp/', 'resized/', 'content/'],
+                            help=f"정리할 접두사 (여러 번 지정 가능, 기본: {' '.join(DEFAULT_PREFIXES)})")
+        parser.add_argument('--grace-hours', type=float, default=settings.IMAGE_GC_GRACE_HOURS,
+                            help='마지막 수정 후 이 시간이 지나지 않은 객체는 삭제하지 않음 (작성 중인 게시글 보호)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='목록 조회 / 삭제 배치 크기 (최대 1000)')
+        parser.add_argument('--max-deletes-per-second', type=float, default=None, help='초당 최대 삭제 객체 수')
+        parser.add_argument('--checkpoint',
+                            help='접두사별 마지막 처리 키를 기록하는 JSON 파일 (중단 후 이어서 실행, 모든 접두사 완료 시 삭제)')
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상만 출력')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if not 0 < batch_size <= 1000:
+            raise CommandError('--batch-size는 1~1000 사이여야 합니다')
+
+        self.dry_run = options['dry_run']
+        self.max_rate = options['max_deletes_per_second']
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = self.load_checkpoint()
+        self.started = time.monotonic()
+        self.deleted_count = 0
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+
+        storage = get_storage()
+        for prefix in options['prefix'] or DEFAULT_PREFIXES:
+            state = self.checkpoint.get(prefix, {})
+            if state.get('done'):
+                self.stdout.write(f'{prefix}: 체크포인트 기준 완료됨 (건너뜀)')
+                continue
+
+            # 앞 접두사를 처리하는 동안 저장된 게시글도 반영하도록 접두사마다 다시 조회
+            # (그 사이 새로 올라온 객체는 유예 기간(cutoff)으로 보호)
+            referenced = get_referenced_image_stems(used_since=cutoff)
+            self.stdout.write(f'{prefix}: 참조 중인 이미지 {len(referenced)}개')
+
+            scanned = orphaned = 0
+            objects = storage.list(prefix, start_after=state.get('last_key'))
+
+            while True:
+                page = list(islice(objects, batch_size))
+                if not page:
+                    break
+
+                scanned += len(page)
+                orphans = [
+                    obj for obj in page
+                    if obj.last_modified < cutoff and get_image_stem(obj.key) not in referenced
+                ]
+                orphaned += len(orphans)
+                self.delete(storage, orphans)
+                self.save_checkpoint(prefix, {'last_key': page[-1].key})
+
+            self.save_checkpoint(prefix, {'done': True})
+            self.stdout.write(f'{prefix}: 검사 {scanned}개, 고아 객체 {orphaned}개')
+
+        # 모든 접두사를 끝까지 처리했으면 다음 실행이 처음부터 다시 검사하도록 체크포인트 삭제
+        self.clear_checkpoint()
+
+        verb = '삭제 대상' if self.dry_run else '삭제 완료'
+        self.stdout.write(self.style.SUCCESS(f'{verb}: {self.deleted_count}개'))
+
+    def delete(self, storage, orphans):
+        if not orphans:
+            return
+
+        if self.dry_run:
+            for obj in orphans:
+                self.stdout.write(f'  [dry-run] {obj.key} ({obj.size} bytes, {obj.last_modified:%Y-%m-%d %H:%M})')
+            self.deleted_count += len(orphans)
+            return
+
+        self.throttle(len(orphans))
+        deleted, errors = storage.delete_many([obj.key for obj in orphans])
+        self.deleted_count += len(deleted)
+        # 삭제된 이미지를 가리키는 중복 제거 기록도 제거
+        forget_image_assets(key for key in deleted if key.startswith('resized/'))
+
+        for error in errors:
+            self.stderr.write(f'  삭제 실패: {error.key} ({error.code}) {error}')
+
+    def throttle(self, count):
+        # 누적 삭제 수가 허용 속도를 넘지 않도록 대기
+        if not self.max_rate:
+            return
+
+        earliest = self.started + (self.deleted_count + count) / self.max_rate
+        delay = earliest - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def save_checkpoint(self, prefix, state):
+        # dry-run은 진행 상태를 남기지 않음
+        if not self.checkpoint_path or self.dry_run:
+            return
+
+        self.checkpoint[prefix] = state
+        temp_path = f'{self.checkpoint_path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        if not self.checkpoint_path or self.dry_run:
+            return
+
+        self.checkpoint = {}
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
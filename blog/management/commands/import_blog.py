@@ -0,0 +1,44 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.bulk import DEFAULT_BATCH_SIZE, BlogImporter
+
+
+class Command(BaseCommand):
+    help = 'JSON Lines 파일(게시글 / 댓글)을 배치 단위 bulk insert로 가져옵니다 (export_blog 형식)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSON Lines 파일 경로 ('-'이면 표준 입력)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size는 1 이상이어야 합니다')
+
+        started = time.perf_counter()
+        importer = BlogImporter(batch_size=options['batch_size'])
+
+        source = sys.stdin if options['path'] == '-' else open(options['path'], encoding='utf-8')
+        try:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    importer.feed(json.loads(line))
+                except (json.JSONDecodeError, KeyError, ValueError) as e:
+                    raise CommandError(f'{line_number}번째 줄을 가져올 수 없습니다: {e}')
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        stats = importer.finish()
+        elapsed = time.perf_counter() - started
+        rows = stats['posts'] + stats['comments']
+
+        self.stdout.write(self.style.SUCCESS(
+            f"가져오기 완료: 게시글 {stats['posts']}개, 댓글 {stats['comments']}개, 건너뜀 {stats['skipped']}개 "
+            f'({elapsed:.1f}s, 초당 {rows / elapsed if elapsed else 0:.0f}행)'
+        ))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.bulk import recount_comment_counts
+from blog.cache import bump_version
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = '게시글 comment_count를 실제 댓글 수로 다시 계산합니다 (증감 누락으로 인한 불일치 복구용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='수정하지 않고 불일치 게시글 수만 출력')
+
+    def handle(self, *args, **options):
+        actual_count = Coalesce(Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('id'))
+            .values('count')
+        ), 0)
+
+        drifted = (Post.objects
+                   .annotate(actual_count=actual_count)
+                   .filter(~Q(comment_count=actual_count))
+                   .values_list('pk', flat=True))
+        drifted_ids = list(drifted)
+
+        if options['dry_run']:
+            self.stdout.write(f'comment_count 불일치 게시글: {len(drifted_ids)}개')
+            return
+
+        updated = recount_comment_counts(drifted_ids)
+
+        if updated:
+            bump_version('posts')
+        self.stdout.write(self.style.SUCCESS(f'comment_count 재계산 완료: {updated}개 게시글 수정'))
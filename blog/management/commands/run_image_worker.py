@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = '이미지 리사이즈 작업 큐를 처리하는 워커를 실행합니다 (프로세스를 여러 개 띄우면 처리량이 늘어남)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='대기 작업이 없을 때 폴링 간격(초)')
+        parser.add_argument('--max-jobs', type=int, default=None, help='처리할 최대 작업 수')
+        parser.add_argument('--once', action='store_true', help='대기 작업을 모두 처리하면 종료')
+
+    def handle(self, *args, **options):
+        processed = run_worker(
+            poll_interval=options['poll_interval'],
+            max_jobs=options['max_jobs'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'이미지 작업 {processed}개 처리 완료'))
@@ -0,0 +1,189 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# 응답 시간(초) / 호출 수 히스토그램 버킷
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class RequestMetrics:
+    '''
+    요청 하나의 구간별 (호출 수, 누적 시간)
+    저장소 복사처럼 작업 스레드에서 기록할 수 있으므로 잠금 사용 (누적 시간은 요청 시간보다 클 수 있음)
+    '''
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {}  # name -> [count, seconds]
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds, count=1):
+        with self.lock:
+            timing = self.timings.setdefault(name, [0, 0.0])
+            timing[0] += count
+            timing[1] += seconds
+
+    def get(self, name):
+        with self.lock:
+            count, seconds = self.timings.get(name, (0, 0.0))
+        return count, seconds
+
+
+# 현재 요청의 RequestMetrics (PerformanceMiddleware가 설정, 요청 밖에서는 None)
+# sync_to_async / async_to_sync 및 contextvars.copy_context()로 넘긴 작업 스레드에도 전달됨
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record(name, seconds, count=1):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add(name, seconds, count)
+
+
+@contextmanager
+def timed(name):
+    '''
+    with 블록 실행 시간을 현재 요청의 name 구간에 기록 (요청 밖에서는 기록하지 않음)
+    '''
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def sql_wrapper(execute, sql, params, many, context):
+    '''
+    connection.execute_wrappers에 등록하는 SQL 실행 시간 기록기 (DEBUG 설정과 무관하게 동작)
+    '''
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record('db', time.perf_counter() - start)
+
+
+def install_sql_wrapper(connection):
+    if sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_wrapper)
+
+
+def install_sql_wrappers():
+    # 시그널 연결 전에 이미 연결된 DB 커넥션 (현재 스레드)
+    for connection in connections.all(initialized_only=True):
+        install_sql_wrapper(connection)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    install_sql_wrapper(connection)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    '''
+    Prometheus 텍스트 형식으로 출력하는 프로세스 내 히스토그램
+    (워커 프로세스마다 따로 집계되므로 여러 워커의 값은 Prometheus에서 합산)
+    '''
+    def __init__(self, name, documentation, labelnames, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self.series = {}  # label 값 tuple -> [버킷별 개수(+Inf 포함), 합계]
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+
+        with self.lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self.series.items())
+
+        for labels, counts, total in series:
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = f'{label_text},' if label_text else ''
+
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+
+        return '\n'.join(lines)
+
+
+REQUEST_DURATION = Histogram('http_request_duration_seconds', '요청 처리 시간', ('view', 'method', 'status'))
+DB_QUERIES = Histogram('http_request_db_queries', '요청당 SQL 쿼리 수', ('view', 'method'), COUNT_BUCKETS)
+DB_DURATION = Histogram('http_request_db_duration_seconds', '요청당 SQL 실행 시간', ('view', 'method'))
+STORAGE_CALLS = Histogram('http_request_storage_calls', '요청당 저장소(S3) 호출 수', ('view', 'method'), COUNT_BUCKETS)
+STORAGE_DURATION = Histogram('http_request_storage_duration_seconds', '요청당 저장소(S3) 호출 시간', ('view', 'method'))
+SERIALIZE_DURATION = Histogram('http_request_serialize_duration_seconds', '직렬화(serializer.data) 시간', ('view', 'method'))
+RENDER_DURATION = Histogram('http_request_render_duration_seconds', '응답 렌더링(JSON 인코딩) 시간', ('view', 'method'))
+
+REGISTRY = (REQUEST_DURATION, DB_QUERIES, DB_DURATION, STORAGE_CALLS, STORAGE_DURATION, SERIALIZE_DURATION,
+            RENDER_DURATION)
+
+
+def observe_request(metrics, view, method, status, total):
+    labels = (view, method)
+    db_count, db_seconds = metrics.get('db')
+    storage_count, storage_seconds = metrics.get('storage')
+
+    REQUEST_DURATION.observe((view, method, str(status)), total)
+    DB_QUERIES.observe(labels, db_count)
+    DB_DURATION.observe(labels, db_seconds)
+    STORAGE_CALLS.observe(labels, storage_count)
+    STORAGE_DURATION.observe(labels, storage_seconds)
+    SERIALIZE_DURATION.observe(labels, metrics.get('serialize')[1])
+    RENDER_DURATION.observe(labels, metrics.get('render')[1])
+
+
+def server_timing_header(metrics, total):
+    '''
+    Server-Timing 헤더 값 (dur는 ms, 브라우저 개발자 도구의 Timing 탭에 표시)
+    '''
+    db_count, db_seconds = metrics.get('db')
+    storage_count, storage_seconds = metrics.get('storage')
+    serialize_seconds = metrics.get('serialize')[1]
+    render_seconds = metrics.get('render')[1]
+
+    return ', '.join([
+        f'db;dur={db_seconds * 1000:.1f};desc="{db_count} queries"',
+        f'storage;dur={storage_seconds * 1000:.1f};desc="{storage_count} calls"',
+        f'serialize;dur={serialize_seconds * 1000:.1f}',
+        f'render;dur={render_seconds * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ])
+
+
+def render_metrics():
+    return '\n'.join(histogram.render() for histogram in REGISTRY) + '\n'
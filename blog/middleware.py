@@ -0,0 +1,59 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+
+class PerformanceMiddleware:
+    '''
+    요청별 SQL 쿼리 수 / 시간, 저장소(S3) 호출 수 / 시간, 직렬화 / 응답 렌더링 시간, 전체 시간을 기록하여
+    Server-Timing 헤더로 반환하고 /metrics 히스토그램에 집계 (DEBUG 설정과 무관)
+    전체 시간에 다른 미들웨어 처리도 포함되도록 MIDDLEWARE의 맨 앞에 둠
+    '''
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics.install_sql_wrappers()
+        request_metrics, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics)
+
+    def process_template_response(self, request, response):
+        # DRF Response는 미들웨어의 process_template_response 이후에 render()되므로 렌더링 완료 시점까지 측정
+        # (serializer.data 평가는 뷰 안에서 끝나므로 blog.serializers.TimedDataMixin이 serialize 구간으로 따로 기록)
+        started = time.perf_counter()
+        response.add_post_render_callback(lambda rendered: metrics.record('render', time.perf_counter() - started))
+        return response
+
+    def finish(self, request, response, request_metrics):
+        total = time.perf_counter() - request_metrics.started
+        match = request.resolver_match
+        view = match.view_name if match else '<unmatched>'
+
+        metrics.observe_request(request_metrics, view, request.method, response.status_code, total)
+        if settings.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = metrics.server_timing_header(request_metrics, total)
+        return response
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_alter_comment_password'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+        ),
+    ]
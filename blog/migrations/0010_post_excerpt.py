@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:10
+
+import html
+import re
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+
+    for post in Post.objects.only('id', 'content').iterator(chunk_size=500):
+        text = ' '.join(html.unescape(TAG_RE.sub(' ', post.content or '')).split())
+        post.excerpt = Truncator(text).chars(200)
+        batch.append(post)
+
+        if len(batch) >= 500:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+
+    if batch:
+        Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='요약'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
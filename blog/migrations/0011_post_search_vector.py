@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:40
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# 마이그레이션 시점의 검색 벡터 계산 SQL을 그대로 고정 (이후 blog.search 변경이 이 마이그레이션에 영향을 주지 않도록)
+# 본문은 HTML 태그만 정규식으로 제거 (이후 게시글 저장 시 blog.search.update_search_vectors로 다시 계산됨)
+POPULATE_SEARCH_VECTOR_SQL = """
+    UPDATE post SET search_vector =
+        setweight(to_tsvector('simple', coalesce(post.title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce((
+            SELECT string_agg(tag.name, ' ')
+            FROM taggit_taggeditem item
+            JOIN taggit_tag tag ON tag.id = item.tag_id
+            JOIN django_content_type ct ON ct.id = item.content_type_id
+            WHERE ct.app_label = 'blog' AND ct.model = 'post' AND item.object_id = post.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce((
+            SELECT coalesce(u.nickname, u.username) FROM "user" u WHERE u.id = post.author_id
+        ), '')), 'C') ||
+        setweight(to_tsvector('simple', regexp_replace(coalesce(post.content, ''), '<[^>]*>', ' ', 'g')), 'D')
+"""
+
+
+def create_search_index(apps, schema_editor):
+    # GIN 인덱스와 tsvector는 PostgreSQL 전용 (SQLite 테스트 DB에서는 생략)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS post_search_vector_idx ON post USING gin (search_vector)'
+    )
+    schema_editor.execute(POPULATE_SEARCH_VECTOR_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS post_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_customuser_nickname'),
+        ('blog', '0010_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
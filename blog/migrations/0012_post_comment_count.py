@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+
+    Post.objects.update(comment_count=Coalesce(Subquery(
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(count=Count('id'))
+        .values('count')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
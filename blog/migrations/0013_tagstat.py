@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_tag_stats(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    TagStat = apps.get_model('blog', 'TagStat')
+
+    content_type = ContentType.objects.filter(app_label='blog', model='post').first()
+    if content_type is None:
+        return
+
+    counts = (TaggedItem.objects
+              .filter(content_type=content_type)
+              .values('tag_id')
+              .annotate(count=Count('id'))
+              .values_list('tag_id', 'count'))
+    TagStat.objects.bulk_create(
+        [TagStat(tag_id=tag_id, post_count=count) for tag_id, count in counts],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_comment_count'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stat', serialize=False, to='taggit.tag', verbose_name='태그')),
+                ('post_count', models.PositiveIntegerField(db_index=True, default=0, verbose_name='게시글 수')),
+            ],
+            options={
+                'verbose_name': '태그 통계',
+                'verbose_name_plural': '태그 통계 목록',
+                'db_table': 'tag_stat',
+            },
+        ),
+        migrations.RunPython(fill_tag_stats, migrations.RunPython.noop),
+    ]
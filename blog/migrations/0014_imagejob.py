@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:50
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_tagstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('s3_key', models.CharField(max_length=255, verbose_name='원본 S3 키')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '처리 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='상태')),
+                ('result_url', models.CharField(blank=True, max_length=500, verbose_name='결과 이미지 URL')),
+                ('error', models.TextField(blank=True, verbose_name='에러')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '이미지 작업',
+                'verbose_name_plural': '이미지 작업 목록',
+                'db_table': 'image_job',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='image_job_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_imagejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagejob',
+            name='manifest',
+            field=models.JSONField(blank=True, null=True, verbose_name='파생 이미지 정보'),
+        ),
+    ]
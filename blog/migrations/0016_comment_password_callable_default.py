@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:10
+
+import blog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_imagejob_manifest'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='password',
+            field=models.CharField(default=blog.models.default_comment_password, max_length=128, null=True, verbose_name='익명 비밀번호'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:20
+
+from html.parser import HTMLParser
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class ImageSrcParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sources = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'img':
+            src = dict(attrs).get('src')
+            if src:
+                self.sources.append(src)
+
+
+def fill_post_images(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostImage = apps.get_model('blog', 'PostImage')
+    prefix = f'{settings.AWS_CLOUDFRONT_DOMAIN}/'
+    batch = []
+
+    for post in Post.objects.only('id', 'content').iterator(chunk_size=500):
+        parser = ImageSrcParser()
+        parser.feed(post.content or '')
+        parser.close()
+
+        keys = {src.replace(prefix, '') for src in parser.sources if src.startswith(prefix)}
+        batch.extend(PostImage(post_id=post.id, s3_key=key) for key in keys)
+
+        if len(batch) >= 1000:
+            PostImage.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    if batch:
+        PostImage.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_comment_password_callable_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('s3_key', models.CharField(max_length=255, verbose_name='이미지 키')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='blog.post', verbose_name='게시글')),
+            ],
+            options={
+                'verbose_name': '게시글 이미지',
+                'verbose_name_plural': '게시글 이미지 목록',
+                'db_table': 'post_image',
+                'indexes': [models.Index(fields=['s3_key'], name='post_image_s3_key_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 's3_key'), name='post_image_unique')],
+            },
+        ),
+        migrations.RunPython(fill_post_images, migrations.RunPython.noop),
+    ]
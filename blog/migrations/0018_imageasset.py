@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_postimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageAsset',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='원본 SHA-256')),
+                ('resized_key', models.CharField(db_index=True, max_length=255, verbose_name='리사이즈 이미지 키')),
+                ('manifest', models.JSONField(verbose_name='파생 이미지 정보')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('last_used_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='마지막 사용일')),
+            ],
+            options={
+                'verbose_name': '이미지 에셋',
+                'verbose_name_plural': '이미지 에셋 목록',
+                'db_table': 'image_asset',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_imageasset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='읽는 시간(분)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='목차'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='단어 수'),
+        ),
+    ]
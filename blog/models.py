@@ -1,16 +1,31 @@
+import uuid
+
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import make_password
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from taggit.managers import TaggableManager
 
+from .content import EXCERPT_LENGTH, analyze_content
+from .credentials import check_comment_password, is_password_hash, make_comment_password
+
 class Post(models.Model):
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=200, verbose_name='제목')
     content = models.TextField(verbose_name='내용')
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False, verbose_name='요약')
+    # 본문 파생 값 (저장 시 blog.content.analyze_content로 계산)
+    word_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='단어 수')
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='읽는 시간(분)')
+    toc = models.JSONField(default=list, blank=True, editable=False, verbose_name='목차')
     author = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, verbose_name='작성자')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     tags = TaggableManager(verbose_name='태그')
+    # 댓글 생성/삭제 시 signals에서 F()로 증감 (불일치 시 recount_comments 명령으로 재계산)
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수')
+    # 제목 + 태그 + 작성자 닉네임 + 본문 평문 (PostgreSQL 전문 검색용, blog.search에서 갱신)
+    # GIN 인덱스는 PostgreSQL에서만 0011 마이그레이션이 직접 생성 (SQLite 테이블 재생성 시 문제 방지)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.title
@@ -18,16 +33,50 @@ class Post(models.Model):
     class Meta:
         db_table = 'post'
         ordering = ['-created_at']
+        indexes = [
+            # 커서 페이지네이션 (created_at, id) 키셋 조회용
+            models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+        ]
         verbose_name = '포스트'
         verbose_name_plural = '포스트 목록'
 
+    # 목록 조회 시 content를 읽지 않도록 저장 시점에 요약 / 단어 수 / 읽는 시간 / 목차를 미리 계산
+    CONTENT_DERIVED_FIELDS = ('excerpt', 'word_count', 'reading_time', 'toc')
+    # signals에서 F()로만 증감하는 필드 (기존 행의 일반 저장에서 읽어둔 값으로 덮어쓰면 동시에 반영된 증감이 사라짐)
+    COUNTER_FIELDS = ('comment_count',)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            update_fields = kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred and field.name not in self.COUNTER_FIELDS
+            ]
+
+        # 본문을 저장할 때만 파생 값 계산 (update_fields에 content가 없거나 content를 지연 로딩한 경우 생략)
+        # 목차 id가 없는 제목에는 id를 넣은 본문을 저장
+        if update_fields is None or 'content' in update_fields:
+            for field, value in analyze_content(self.content).items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.CONTENT_DERIVED_FIELDS}
+        super().save(*args, **kwargs)
+
+
+def default_comment_password():
+    '''
+    익명 댓글 기본 비밀번호 해시 (모델 모듈 로드 시점이 아니라 댓글 생성 시 계산)
+    '''
+    return make_comment_password('1111')
+
 
 class Comment(models.Model):
     id = models.AutoField(primary_key=True)
     author = models.ForeignKey(get_user_model(), on_delete=models.SET_NULL, null=True, verbose_name='로그인한 작성자')
     author_name = models.CharField(max_length=50, blank=True, verbose_name='익명 작성자')
     content = models.TextField(verbose_name='내용')
-    password = models.CharField(max_length=128, null=True, blank=False, default=make_password('1111'), verbose_name='익명 비밀번호')
+    password = models.CharField(max_length=128, null=True, blank=False, default=default_comment_password, verbose_name='익명 비밀번호')
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments', verbose_name='게시글')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
@@ -35,6 +84,20 @@ class Comment(models.Model):
     def __str__(self):
         return f'Comment by {self.author.username} on Post {self.post.id}'
 
+    def set_password(self, raw_password):
+        self.password = make_comment_password(raw_password)
+
+    def check_password(self, raw_password):
+        '''
+        이전 방식의 해시와 일치하면 댓글 전용 해시로 교체하여 저장
+        '''
+        def setter(raw_password):
+            self.set_password(raw_password)
+            if self.pk:
+                Comment.objects.filter(pk=self.pk).update(password=self.password)
+
+        return check_comment_password(raw_password, self.password, setter)
+
     class Meta:
         db_table = 'comment'
         ordering = ['-created_at']
@@ -45,5 +108,105 @@ class Comment(models.Model):
     def save(self, *args, **kwargs):
         if self.author:
             self.author_name = ''
+        # 평문으로 지정된 비밀번호는 저장 전에 댓글 전용 해시로 변환
+        if self.password and not is_password_hash(self.password):
+            self.password = make_comment_password(self.password)
         super().save(*args, **kwargs)
 
+
+
+class TagStat(models.Model):
+    '''
+    태그별 게시글 수 (태그 클라우드용 집계 테이블, blog.tags.refresh_tag_stats로 갱신)
+    '''
+    tag = models.OneToOneField('taggit.Tag', on_delete=models.CASCADE, primary_key=True, related_name='stat', verbose_name='태그')
+    post_count = models.PositiveIntegerField(default=0, db_index=True, verbose_name='게시글 수')
+
+    def __str__(self):
+        return f'{self.tag.name} ({self.post_count})'
+
+    class Meta:
+        db_table = 'tag_stat'
+        verbose_name = '태그 통계'
+        verbose_name_plural = '태그 통계 목록'
+
+
+class ImageJob(models.Model):
+    '''
+    이미지 리사이즈 작업 큐 (ImageUploadView 비동기 모드에서 생성, run_image_worker 명령이 처리)
+    '''
+    class Status(models.TextChoices):
+        PENDING = 'pending', '대기'
+        PROCESSING = 'processing', '처리 중'
+        DONE = 'done', '완료'
+        FAILED = 'failed', '실패'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    s3_key = models.CharField(max_length=255, verbose_name='원본 S3 키')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING, verbose_name='상태')
+    result_url = models.CharField(max_length=500, blank=True, verbose_name='결과 이미지 URL')
+    # 크기/포맷별 파생 이미지 목록과 srcset (blog.utils.generate_image_derivatives 결과)
+    manifest = models.JSONField(null=True, blank=True, verbose_name='파생 이미지 정보')
+    error = models.TextField(blank=True, verbose_name='에러')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    def __str__(self):
+        return f'ImageJob {self.id} ({self.status})'
+
+    class Meta:
+        db_table = 'image_job'
+        ordering = ['created_at']
+        indexes = [
+            # 워커가 대기 작업을 오래된 순으로 가져갈 때 사용
+            models.Index(fields=['status', 'created_at'], name='image_job_status_idx'),
+        ]
+        verbose_name = '이미지 작업'
+        verbose_name_plural = '이미지 작업 목록'
+
+
+class PostImage(models.Model):
+    '''
+    게시글 본문이 참조하는 이미지 키 (resized/...) 색인
+    게시글 저장 시 blog.post_images.sync_post_images로 갱신되어 이미지 삭제 대상 / 참조 수 계산에 HTML 파싱이 필요 없음
+    '''
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='images', verbose_name='게시글')
+    s3_key = models.CharField(max_length=255, verbose_name='이미지 키')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+
+    def __str__(self):
+        return f'{self.s3_key} (Post {self.post_id})'
+
+    class Meta:
+        db_table = 'post_image'
+        constraints = [
+            models.UniqueConstraint(fields=['post', 's3_key'], name='post_image_unique'),
+        ]
+        indexes = [
+            # 이미지 키로 사용 중인 게시글 / 참조 수 조회
+            models.Index(fields=['s3_key'], name='post_image_s3_key_idx'),
+        ]
+        verbose_name = '게시글 이미지'
+        verbose_name_plural = '게시글 이미지 목록'
+
+
+class ImageAsset(models.Model):
+    '''
+    원본 이미지 내용(sha256)별로 이미 만들어진 파생 이미지 (같은 이미지를 다시 올리면 리사이즈 / 업로드 없이 재사용)
+    resized_key의 이미지가 삭제되면 함께 삭제됨 (blog.assets.forget_image_assets)
+    '''
+    sha256 = models.CharField(max_length=64, primary_key=True, verbose_name='원본 SHA-256')
+    resized_key = models.CharField(max_length=255, db_index=True, verbose_name='리사이즈 이미지 키')
+    manifest = models.JSONField(verbose_name='파생 이미지 정보')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    # 마지막으로 재사용된 시각 (gc_orphan_images 유예 기간 판단에 사용)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='마지막 사용일')
+
+    def __str__(self):
+        return f'{self.sha256[:12]} -> {self.resized_key}'
+
+    class Meta:
+        db_table = 'image_asset'
+        verbose_name = '이미지 에셋'
+        verbose_name_plural = '이미지 에셋 목록'
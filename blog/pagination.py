@@ -0,0 +1,162 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    '''
+    (정렬 필드, id) 기준 키셋(커서) 페이지네이션
+    OFFSET 없이 마지막 행의 (정렬 값, id) 이후만 조회하므로 몇 번째 페이지든 O(page) 쿼리로 동작
+    '''
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    # 커서의 첫 번째 키로 사용할 수 있는 정렬 필드 / 기본 정렬
+    ordering_fields = ['created_at']
+    default_ordering = '-created_at'
+    tiebreaker_field = 'id'
+
+    # True면 cursor/page_size 파라미터가 있을 때만 페이지네이션 (없으면 전체 반환)
+    opt_in = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.opt_in and not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(queryset)
+
+        order_prefix = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{order_prefix}{self.field}', f'{order_prefix}{self.tiebreaker_field}')
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) |
+                Q(**{self.field: value, f'{self.tiebreaker_field}__{lookup}': pk})
+            )
+
+        # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+        results = list(queryset[:self.page_size + 1])
+        page = results[:self.page_size]
+
+        if len(results) > self.page_size:
+            last = page[-1]
+            self.next_position = (getattr(last, self.field), getattr(last, self.tiebreaker_field))
+        else:
+            self.next_position = None
+
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def is_requested(self, request):
+        return (self.cursor_query_param in request.query_params or
+                self.page_size_query_param in request.query_params)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        '''
+        OrderingFilter가 적용한 정렬의 첫 번째 필드를 커서 키로 사용
+        허용되지 않은 필드이거나 정렬이 없으면 기본 정렬을 사용
+        '''
+        ordering = list(queryset.query.order_by) or [self.default_ordering]
+        first = ordering[0]
+
+        if not isinstance(first, str) or first.lstrip('-') not in self.ordering_fields:
+            first = self.default_ordering
+
+        return first.lstrip('-'), first.startswith('-')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def encode_cursor(self, position):
+        value, pk = position
+        if isinstance(value, datetime):
+            value = value.isoformat()
+
+        payload = json.dumps([self.field, value, pk], ensure_ascii=False, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8')
+            field, value, pk = json.loads(payload)
+            pk = int(pk)
+
+            if self.field in ('created_at', 'updated_at'):
+                value = parse_datetime(value)
+            elif self.field == 'search_rank':
+                value = float(value)
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        # 정렬 조건이 바뀐 커서는 사용할 수 없음
+        if field != self.field or value is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, pk
+
+
+class PostCursorPagination(KeysetPagination):
+    '''
+    게시글 목록용 커서 페이지네이션
+    기존 클라이언트 호환을 위해 ?cursor= 또는 ?page_size= 요청 시에만 동작 (기본은 전체 반환)
+    '''
+    # search_rank: PostSearchFilter가 붙이는 검색 관련도 (검색 결과의 기본 정렬)
+    ordering_fields = ['created_at', 'title', 'search_rank']
+    opt_in = True
+
+
+class CommentCursorPagination(KeysetPagination):
+    '''
+    게시글 댓글 목록용 커서 페이지네이션 (항상 적용, 최신순)
+    '''
+    page_size = 20
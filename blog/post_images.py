@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ImageAsset, ImageJob, Post, PostImage
+from .utils import extract_image_keys_from_content, get_image_stem
+
+
+def get_unreferenced_keys(image_keys):
+    '''
+    어떤 게시글도 더 이상 참조하지 않는 이미지 키만 반환 (여러 게시글이 같은 이미지를 쓰는 경우 보호)
+    IMAGE_GC_GRACE_HOURS 안에 생성 / 재사용된 ImageAsset 이미지는 제외
+    (중복 업로드로 같은 URL을 받은 작성 중인 게시글 보호, gc_orphan_images와 같은 기준)
+    '''
+    image_keys = set(image_keys)
+    if not image_keys:
+        return set()
+
+    referenced = set(PostImage.objects.filter(s3_key__in=image_keys).values_list('s3_key', flat=True))
+    used_since = timezone.now() - timedelta(hours=settings.IMAGE_GC_GRACE_HOURS)
+    referenced.update(
+        ImageAsset.objects
+        .filter(resized_key__in=image_keys, last_used_at__gte=used_since)
+        .values_list('resized_key', flat=True)
+    )
+    return image_keys - referenced
+
+
+def sync_post_images(post):
+    '''
+    게시글 본문의 이미지 키로 PostImage 색인을 갱신하고,
+    이번 수정으로 빠졌으며 다른 게시글도 참조하지 않는 이미지 키(= 삭제 대상)를 반환
+    '''
+    new_keys = set(extract_image_keys_from_content(post.content))
+    old_keys = set(post.images.values_list('s3_key', flat=True))
+
+    removed_keys = old_keys - new_keys
+    added_keys = new_keys - old_keys
+
+    if removed_keys:
+        post.images.filter(s3_key__in=removed_keys).delete()
+    if added_keys:
+        PostImage.objects.bulk_create(
+            [PostImage(post=post, s3_key=key) for key in added_keys],
+            ignore_conflicts=True,
+        )
+
+    return get_unreferenced_keys(removed_keys)
+
+
+def get_post_image_keys(post):
+    return set(post.images.values_list('s3_key', flat=True))
+
+
+def get_posts_using_image(s3_key):
+    return Post.objects.filter(images__s3_key=s3_key)
+
+
+def get_image_reference_counts(image_keys):
+    '''
+    이미지 키별 참조하는 게시글 수 ({s3_key: count}, 참조가 없는 키는 0)
+    '''
+    counts = dict(
+        PostImage.objects
+        .filter(s3_key__in=image_keys)
+        .values('s3_key')
+        .annotate(count=Count('post_id'))
+        .values_list('s3_key', 'count')
+    )
+    return {key: counts.get(key, 0) for key in image_keys}
+
+
+def get_referenced_image_stems(used_since=None):
+    '''
+    게시글이 참조하거나 처리 중인 이미지 작업이 사용하는 이미지 파일명(get_image_stem) 집합
+    used_since 이후 중복 업로드로 재사용된 ImageAsset 이미지도 포함 (아직 저장되지 않은 게시글 보호)
+    버킷 객체 수가 아니라 실제 사용 중인 이미지 수에 비례하는 메모리만 사용
+    '''
+    stems = {get_image_stem(key) for key in PostImage.objects.values_list('s3_key', flat=True).iterator(chunk_size=5000)}
+    stems.update(
+        get_image_stem(key)
+        for key in ImageJob.objects
+        .filter(status__in=[ImageJob.Status.PENDING, ImageJob.Status.PROCESSING])
+        .values_list('s3_key', flat=True)
+    )
+    if used_since is not None:
+        stems.update(
+            get_image_stem(key)
+            for key in ImageAsset.objects.filter(last_used_at__gte=used_since).values_list('resized_key', flat=True)
+        )
+    return stems
@@ -0,0 +1,118 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework import filters
+
+from .content import html_to_text
+
+# 한국어 형태소 사전이 없으므로 공백 기준으로 토큰화하는 simple 설정 사용
+SEARCH_CONFIG = 'simple'
+TERM_CLEAN_RE = re.compile(r'[^\w]+')
+
+
+def is_full_text_search_enabled():
+    return connection.vendor == 'postgresql'
+
+
+def clean_search_terms(terms):
+    '''
+    tsquery 연산자로 해석될 수 있는 문자를 제거한 검색어 목록
+    '''
+    lexemes = [TERM_CLEAN_RE.sub('', term) for term in terms]
+    return [lexeme for lexeme in lexemes if lexeme]
+
+
+def build_search_query(terms):
+    '''
+    검색어 목록을 접두어 매칭 tsquery로 변환 ('장고' -> '장고':* , 조사가 붙은 단어도 매칭)
+    '''
+    lexemes = clean_search_terms(terms)
+
+    if not lexemes:
+        return None
+
+    raw_query = ' & '.join(f"'{lexeme}':*" for lexeme in lexemes)
+    return SearchQuery(raw_query, config=SEARCH_CONFIG, search_type='raw')
+
+
+# 게시글별 (제목, 태그, 작성자 닉네임) 조회 (본문 평문 변환은 Python의 html_to_text로 처리)
+SEARCH_DOCUMENT_SQL = """
+    SELECT post.id, coalesce(post.title, ''), coalesce((
+        SELECT string_agg(tag.name, ' ')
+        FROM taggit_taggeditem item
+        JOIN taggit_tag tag ON tag.id = item.tag_id
+        JOIN django_content_type ct ON ct.id = item.content_type_id
+        WHERE ct.app_label = 'blog' AND ct.model = 'post' AND item.object_id = post.id
+    ), ''), coalesce(u.nickname, u.username, ''), coalesce(post.content, '')
+    FROM post LEFT JOIN "user" u ON u.id = post.author_id
+    WHERE post.id = ANY(%(ids)s)
+"""
+
+# 제목 A / 태그 B / 작성자 C / 본문 D 가중치 tsvector
+UPDATE_SEARCH_VECTOR_SQL = """
+    UPDATE post SET search_vector =
+        setweight(to_tsvector(%(config)s, document.title), 'A') ||
+        setweight(to_tsvector(%(config)s, document.tags), 'B') ||
+        setweight(to_tsvector(%(config)s, document.author), 'C') ||
+        setweight(to_tsvector(%(config)s, document.body), 'D')
+    FROM unnest(%(ids)s::integer[], %(titles)s::text[], %(tags)s::text[], %(authors)s::text[], %(bodies)s::text[])
+        AS document(id, title, tags, author, body)
+    WHERE post.id = document.id
+"""
+
+
+def update_search_vectors(post_ids, using=None):
+    '''
+    게시글 search_vector를 현재 제목/태그/작성자/본문으로 갱신 (조회 1번 + UPDATE 1번, PostgreSQL 외에는 무시)
+    게시글 저장, 태그 변경, 대량 가져오기가 모두 이 함수를 사용 (0011 마이그레이션은 당시 SQL을 따로 고정)
+    '''
+    db = using or connection
+    post_ids = list(post_ids)
+    if db.vendor != 'postgresql' or not post_ids:
+        return
+
+    with db.cursor() as cursor:
+        cursor.execute(SEARCH_DOCUMENT_SQL, {'ids': post_ids})
+        rows = cursor.fetchall()
+        if not rows:
+            return
+
+        ids, titles, tags, authors, contents = zip(*rows)
+        cursor.execute(UPDATE_SEARCH_VECTOR_SQL, {
+            'config': SEARCH_CONFIG,
+            'ids': list(ids),
+            'titles': list(titles),
+            'tags': list(tags),
+            'authors': list(authors),
+            'bodies': [html_to_text(content) for content in contents],
+        })
+
+
+def update_search_vector(post):
+    if post.pk is not None:
+        update_search_vectors([post.pk])
+
+
+class PostSearchFilter(filters.SearchFilter):
+    '''
+    PostgreSQL에서는 GIN 인덱스가 걸린 search_vector로 검색하고 관련도 순으로 정렬
+    그 외 DB(SQLite 테스트 등)에서는 기존 search_fields 기반 icontains 검색으로 동작
+    '''
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_full_text_search_enabled():
+            return super().filter_queryset(request, queryset, view)
+
+        query = build_search_query(self.get_search_terms(request))
+        if query is None:
+            return queryset
+
+        # ?ordering= 이 있으면 이후 OrderingFilter가 관련도 정렬을 덮어씀
+        # ts_rank는 real(float4)이므로 double로 변환하여 커서에 저장한 값과 정확히 비교되도록 함
+        return (queryset
+                .filter(search_vector=query)
+                .annotate(search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()))
+                .order_by('-search_rank', '-created_at'))
@@ -1,19 +1,36 @@
 import uuid
 
-import boto3
-from botocore.exceptions import ClientError
 from rest_framework import serializers
-from .models import Post, Comment
+from .metrics import timed
+from .models import Post, Comment, TagStat, ImageJob
 from taggit.serializers import TaggitSerializer, TagListSerializerField
 
-class PostSerializer(TaggitSerializer, serializers.ModelSerializer):
+
+class TimedDataMixin:
+    '''
+    .data 평가(to_representation, 지연 쿼리 포함) 시간을 요청 성능 지표의 serialize 구간에 기록
+    many=True는 Meta.list_serializer_class = TimedListSerializer로 목록 전체를 한 번 기록
+    '''
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
+
+
+class PostSerializer(TimedDataMixin, TaggitSerializer, serializers.ModelSerializer):
     author_nickname = serializers.SerializerMethodField()
     tags = TagListSerializerField()
 
     class Meta:
         model = Post
-        fields = ['id', 'title', 'content', 'author_nickname', 'created_at', 'updated_at', 'tags']
-        read_only_fields = ['author', 'created_at', 'updated_at']
+        list_serializer_class = TimedListSerializer
+        fields = ['id', 'title', 'content', 'author_nickname', 'comment_count', 'word_count', 'reading_time', 'toc',
+                  'created_at', 'updated_at', 'tags']
+        read_only_fields = ['author', 'comment_count', 'word_count', 'reading_time', 'toc', 'created_at', 'updated_at']
 
     def get_author_nickname(self, obj):
         if obj.author.nickname:
@@ -22,16 +39,56 @@ class PostSerializer(TaggitSerializer, serializers.ModelSerializer):
             return obj.author.username
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class PostListSerializer(PostSerializer):
+    '''
+    목록 조회용 경량 직렬화 (content 대신 저장된 요약만 반환)
+    '''
+    tags = TagListSerializerField(read_only=True)
+
+    class Meta:
+        model = Post
+        list_serializer_class = TimedListSerializer
+        fields = ['id', 'title', 'excerpt', 'author_nickname', 'comment_count', 'word_count', 'reading_time',
+                  'created_at', 'updated_at', 'tags']
+        read_only_fields = fields
+
+
+class CommentSerializer(TimedDataMixin, serializers.ModelSerializer):
     author_nickname = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
+        list_serializer_class = TimedListSerializer
         fields = '__all__'
         read_only_fields = ['post', 'author_nickname', 'created_at', 'updated_at']
+        # 익명 댓글 비밀번호 해시는 응답에 포함하지 않음 (작성 / 수정 / 삭제 확인용 입력만 받음)
+        extra_kwargs = {'password': {'write_only': True}}
 
     def get_author_nickname(self, obj):
         if obj.author:
             return obj.author.nickname
         else:
-            return obj.author_name
\ No newline at end of file
+            return obj.author_name
+
+
+class TagStatSerializer(TimedDataMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source='tag.name', read_only=True)
+    slug = serializers.CharField(source='tag.slug', read_only=True)
+
+    class Meta:
+        model = TagStat
+        list_serializer_class = TimedListSerializer
+        fields = ['name', 'slug', 'post_count']
+        read_only_fields = fields
+
+
+
+class ImageJobSerializer(TimedDataMixin, serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source='id', read_only=True)
+    image_url = serializers.CharField(source='result_url', read_only=True)
+
+    class Meta:
+        model = ImageJob
+        list_serializer_class = TimedListSerializer
+        fields = ['job_id', 'status', 'image_url', 'manifest', 'error', 'created_at', 'updated_at']
+        read_only_fields = fields
@@ -0,0 +1,133 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_version
+from .models import Comment, Post
+from .post_images import get_post_image_keys, get_unreferenced_keys, sync_post_images
+from .search import update_search_vector
+from .tags import get_post_tag_ids, refresh_tag_stats
+
+User = get_user_model()
+
+# 게시글/댓글 응답에 author_nickname으로 포함되는 사용자 필드
+AUTHOR_NAME_FIELDS = ('nickname', 'username')
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, update_fields=None, **kwargs):
+    '''
+    게시글 생성/수정 시 게시글 응답 캐시 무효화 (API perform_*, 관리자 저장 모두 포함)
+    본문이 저장된 경우 PostImage 색인을 갱신하고, 더 이상 참조되지 않는 이미지 키를 _removed_image_keys에 기록
+    '''
+    if 'content' not in instance.get_deferred_fields() and (update_fields is None or 'content' in update_fields):
+        instance._removed_image_keys = sync_post_images(instance)
+    bump_version('posts')
+
+
+@receiver(pre_save, sender=User)
+def author_saving(sender, instance, update_fields=None, raw=False, **kwargs):
+    # 저장 전 값과 비교하여 표시 이름이 바뀌었는지 기록 (last_login만 저장하는 로그인 등은 조회 생략)
+    instance._author_name_changed = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(AUTHOR_NAME_FIELDS):
+        return
+
+    previous = User.objects.filter(pk=instance.pk).values(*AUTHOR_NAME_FIELDS).first()
+    instance._author_name_changed = previous is not None and any(
+        previous[field] != getattr(instance, field) for field in AUTHOR_NAME_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, **kwargs):
+    '''
+    작성자 닉네임/아이디 변경 시 이름이 포함된 게시글 응답 캐시와 댓글 목록 ETag 무효화
+    '''
+    if not instance.__dict__.pop('_author_name_changed', False):
+        return
+
+    if Post.objects.filter(author=instance).exists():
+        bump_version('posts')
+    for post_id in Comment.objects.filter(author=instance).values_list('post_id', flat=True).distinct():
+        bump_version(f'comments:{post_id}')
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    # 삭제 후에는 태그 연결(TaggedItem)과 PostImage 색인이 사라지므로 미리 기록
+    instance._deleted_tag_ids = get_post_tag_ids(instance)
+    instance._deleted_image_keys = get_post_image_keys(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    '''
+    게시글 삭제 시 게시글 응답 캐시 무효화 및 연결되어 있던 태그 통계 갱신
+    다른 게시글이 참조하지 않는 이미지 키를 _removed_image_keys에 기록 (S3 삭제는 호출한 쪽에서 처리)
+    '''
+    bump_version('posts')
+    refresh_tag_stats(getattr(instance, '_deleted_tag_ids', set()))
+    instance._removed_image_keys = get_unreferenced_keys(getattr(instance, '_deleted_image_keys', set()))
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    '''
+    댓글 생성 시 게시글 comment_count 증가, 생성/수정 시 댓글 목록 ETag와 해당 게시글 상세 캐시 무효화
+    생성 시에는 목록의 comment_count가 바뀌므로 'comments' 버전도 올림 (전체 게시글 캐시('posts')는 유지)
+    '''
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F('comment_count') + 1)
+        bump_version('comments')
+    bump_version(f'comments:{instance.post_id}')
+
+
+def is_comment_delete(origin):
+    # 댓글 자체 삭제(인스턴스 / 쿼리셋)만 게시글이 남은 채 댓글이 사라짐 (origin이 없으면 보수적으로 True)
+    if origin is None or isinstance(origin, Comment):
+        return True
+    return isinstance(origin, QuerySet) and issubclass(origin.model, Comment)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    '''
+    댓글 삭제 시 게시글 comment_count 감소 및 게시글 목록 / 해당 게시글 상세 / 댓글 목록 캐시 무효화
+    (게시글 / 사용자 삭제로 인한 CASCADE 삭제는 게시글이 함께 사라지므로 생략)
+    '''
+    if not is_comment_delete(origin):
+        return
+
+    Post.objects.filter(pk=instance.post_id).update(comment_count=Greatest(F('comment_count') - 1, 0))
+    bump_version('comments')
+    bump_version(f'comments:{instance.post_id}')
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def post_tags_changed(sender, instance, action, pk_set=None, **kwargs):
+    '''
+    게시글 태그가 추가/삭제/초기화되면 태그 통계 갱신 및 응답 캐시 무효화
+    '''
+    if not isinstance(instance, Post):
+        return
+
+    if action == 'pre_clear':
+        instance._cleared_tag_ids = get_post_tag_ids(instance)
+        return
+
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_tag_ids', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    # taggit은 변경이 없어도 post_add를 보내므로 실제 변경된 태그가 있을 때만 처리
+    if not pk_set:
+        return
+
+    # 셸 등 views / admin 밖에서 태그를 바꿔도 검색 벡터가 최신이도록 변경 1번마다 갱신
+    update_search_vector(instance)
+    refresh_tag_stats(pk_set)
+    bump_version('posts')
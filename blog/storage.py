@@ -0,0 +1,413 @@
+import io
+import mimetypes
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .metrics import record, timed
+
+DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+
+
+class StorageError(Exception):
+    '''
+    저장소 요청 실패 (code는 S3 에러 코드 형식: NoSuchKey, AccessDenied 등)
+    '''
+    def __init__(self, message, code=None, key=None):
+        super().__init__(message)
+        self.code = code
+        self.key = key
+
+
+class StoredObject(NamedTuple):
+    key: str
+    size: int
+    last_modified: datetime
+
+
+class BaseStorage(ABC):
+    '''
+    이미지 파이프라인이 사용하는 객체 저장소 인터페이스
+    키는 S3와 같은 '/' 구분 문자열 (temp/..., resized/..., content/...)
+    '''
+    @abstractmethod
+    def generate_presigned_url(self, key, content_type, expires_in=600):
+        '''
+        클라이언트가 직접 PUT 업로드할 수 있는 URL
+        '''
+
+    @abstractmethod
+    def get(self, key):
+        '''
+        (읽기 가능한 스트림, Content-Type) 반환, 없으면 StorageError(code='NoSuchKey')
+        '''
+
+    @abstractmethod
+    def put(self, fileobj, key, content_type):
+        '''
+        fileobj 내용을 key에 저장 (content_type이 None이면 저장소 기본값)
+        '''
+
+    @abstractmethod
+    def copy(self, source_key, dest_key):
+        '''
+        source_key 객체를 dest_key로 복사, 없으면 StorageError(code='NoSuchKey')
+        '''
+
+    @abstractmethod
+    def delete_many(self, keys):
+        '''
+        여러 키를 삭제하고 (삭제된 키 목록, 실패한 키별 StorageError 목록) 반환
+        없는 키는 S3와 같이 삭제된 것으로 취급
+        '''
+
+    @abstractmethod
+    def list(self, prefix='', start_after=None):
+        '''
+        prefix 아래 객체를 키 순서대로 StoredObject로 순회 (start_after 다음 키부터)
+        '''
+
+
+class S3Storage(BaseStorage):
+    '''
+    boto3 S3 저장소 (커넥션 풀 크기 / 재시도 / 타임아웃은 settings의 S3_* 값으로 조정)
+    '''
+    delete_batch_size = 1000  # delete_objects 한 번에 보낼 수 있는 최대 키 수
+
+    def __init__(self, bucket=None, client=None):
+        # boto3/botocore는 import만으로 수백 ms가 걸려 저장소를 처음 사용할 때 로드
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        self.client_errors = (ClientError, BotoCoreError)
+        self.bucket = bucket or settings.AWS_S3_BUCKET_NAME
+        self.client = client or self._create_client()
+
+    def _create_client(self):
+        import boto3
+        from botocore.config import Config
+
+        return boto3.client(
+            's3',
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION_NAME,
+            config=Config(
+                # 동시 복사 스레드 수보다 풀이 작으면 커넥션을 기다리거나 버리게 됨
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={'max_attempts': settings.S3_MAX_ATTEMPTS, 'mode': settings.S3_RETRY_MODE},
+                connect_timeout=settings.S3_CONNECT_TIMEOUT,
+                read_timeout=settings.S3_READ_TIMEOUT,
+            ),
+        )
+
+    def _error(self, e, key=None):
+        if hasattr(e, 'response'):
+            return StorageError(str(e), code=e.response.get('Error', {}).get('Code'), key=key)
+        return StorageError(str(e), key=key)
+
+    def generate_presigned_url(self, key, content_type, expires_in=600):
+        try:
+            return self.client.generate_presigned_url(
+                ClientMethod='put_object',
+                Params={'Bucket': self.bucket, 'Key': key, 'ContentType': content_type},
+                ExpiresIn=expires_in,
+            )
+        except self.client_errors as e:
+            raise self._error(e, key)
+
+    def get(self, key):
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client_errors as e:
+            raise self._error(e, key)
+        return obj['Body'], obj['ContentType']
+
+    def put(self, fileobj, key, content_type):
+        try:
+            self.client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs={'ContentType': content_type})
+        except self.client_errors as e:
+            raise self._error(e, key)
+
+    def copy(self, source_key, dest_key):
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket,
+                CopySource={'Bucket': self.bucket, 'Key': source_key},
+                Key=dest_key,
+            )
+        except self.client_errors as e:
+            raise self._error(e, source_key)
+
+    def delete_many(self, keys):
+        keys = list(dict.fromkeys(keys))
+        deleted, errors = [], []
+
+        for start in range(0, len(keys), self.delete_batch_size):
+            batch = keys[start:start + self.delete_batch_size]
+
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': False},
+                )
+            except self.client_errors as e:
+                errors.extend(self._error(e, key) for key in batch)
+                continue
+
+            deleted.extend(item['Key'] for item in response.get('Deleted', []))
+            errors.extend(
+                StorageError(error.get('Message', ''), code=error.get('Code'), key=error.get('Key'))
+                for error in response.get('Errors', [])
+            )
+
+        return deleted, errors
+
+    def list(self, prefix='', start_after=None):
+        params = {'Bucket': self.bucket, 'Prefix': prefix}
+        if start_after:
+            params['StartAfter'] = start_after
+
+        try:
+            for page in self.client.get_paginator('list_objects_v2').paginate(**params):
+                for item in page.get('Contents', []):
+                    yield StoredObject(item['Key'], item['Size'], item['LastModified'])
+        except self.client_errors as e:
+            raise self._error(e)
+
+
+class SignedURLMixin:
+    '''
+    로컬/메모리 저장소용 presigned URL (서명된 key/content_type을 쿼리에 담음)
+    업로드는 blog.views.storage_upload_view가 verify_upload로 서명을 확인한 뒤 put으로 저장
+    '''
+    base_url = None  # 없으면 settings.STORAGE_UPLOAD_BASE_URL
+    signing_salt = 'blog.storage.upload'
+
+    def generate_presigned_url(self, key, content_type, expires_in=600):
+        signature = signing.dumps({'key': key, 'content_type': content_type, 'expires_in': expires_in},
+                                  salt=self.signing_salt)
+        base_url = (self.base_url or settings.STORAGE_UPLOAD_BASE_URL).rstrip('/')
+        return f'{base_url}/{quote(key)}?{urlencode({"signature": signature})}'
+
+    def verify_upload(self, key, signature, content_type):
+        '''
+        presigned URL의 서명이 key/content_type에 대해 유효하고 만료되지 않았는지 확인
+        실패 시 S3와 같이 StorageError(code='AccessDenied')
+        '''
+        try:
+            # 만료 시간(expires_in)이 서명된 값 안에 있으므로 먼저 읽은 뒤 max_age로 다시 검증
+            payload = signing.loads(signature, salt=self.signing_salt)
+            signing.loads(signature, salt=self.signing_salt, max_age=payload['expires_in'])
+        except signing.SignatureExpired:
+            raise StorageError('만료된 업로드 URL입니다.', code='AccessDenied', key=key)
+        except (signing.BadSignature, KeyError, TypeError):
+            raise StorageError('업로드 URL 서명이 올바르지 않습니다.', code='AccessDenied', key=key)
+
+        if payload.get('key') != key:
+            raise StorageError('업로드 URL의 키가 일치하지 않습니다.', code='AccessDenied', key=key)
+        if payload.get('content_type') and payload['content_type'] != content_type:
+            raise StorageError('업로드 Content-Type이 서명과 다릅니다.', code='AccessDenied', key=key)
+
+
+class LocalStorage(SignedURLMixin, BaseStorage):
+    '''
+    로컬 디렉터리 저장소 (AWS 없이 개발 / 부하 테스트용)
+    Content-Type은 확장자로 추정
+    '''
+    def __init__(self, location=None, base_url=None):
+        self.location = Path(location or Path(settings.BASE_DIR) / 'storage').resolve()
+        if base_url:
+            self.base_url = base_url
+
+    def path(self, key):
+        path = (self.location / key).resolve()
+        if not path.is_relative_to(self.location):
+            raise StorageError(f'저장소 밖을 가리키는 키입니다: {key}', code='InvalidKey', key=key)
+        return path
+
+    def get(self, key):
+        try:
+            fileobj = open(self.path(key), 'rb')
+        except FileNotFoundError:
+            raise StorageError(f'키를 찾을 수 없습니다: {key}', code='NoSuchKey', key=key)
+        return fileobj, mimetypes.guess_type(key)[0] or DEFAULT_CONTENT_TYPE
+
+    def put(self, fileobj, key, content_type):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 다른 스레드가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = path.with_name(f'.{path.name}.{threading.get_ident()}.tmp')
+        with open(temp_path, 'wb') as f:
+            shutil.copyfileobj(fileobj, f)
+        os.replace(temp_path, path)
+
+    def copy(self, source_key, dest_key):
+        source, _ = self.get(source_key)
+        with source:
+            self.put(source, dest_key, None)
+
+    def delete_many(self, keys):
+        deleted, errors = [], []
+
+        for key in dict.fromkeys(keys):
+            try:
+                self.path(key).unlink(missing_ok=True)
+                deleted.append(key)
+            except StorageError as e:
+                errors.append(e)
+            except OSError as e:
+                errors.append(StorageError(str(e), key=key))
+
+        return deleted, errors
+
+    def list(self, prefix='', start_after=None):
+        if not self.location.exists():
+            return
+
+        keys = sorted(
+            path.relative_to(self.location).as_posix()
+            for path in self.location.rglob('*')
+            if path.is_file() and not path.name.startswith('.')
+        )
+
+        for key in keys:
+            if not key.startswith(prefix) or (start_after and key <= start_after):
+                continue
+            stat = (self.location / key).stat()
+            yield StoredObject(key, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc))
+
+
+class InMemoryStorage(SignedURLMixin, BaseStorage):
+    '''
+    프로세스 메모리 저장소 (테스트 / 벤치마크용, 스레드 안전)
+    '''
+    def __init__(self, base_url=None):
+        self.objects = {}  # key -> (bytes, content_type, last_modified)
+        self._lock = threading.Lock()
+        if base_url:
+            self.base_url = base_url
+
+    def get(self, key):
+        with self._lock:
+            try:
+                body, content_type, _ = self.objects[key]
+            except KeyError:
+                raise StorageError(f'키를 찾을 수 없습니다: {key}', code='NoSuchKey', key=key)
+        return io.BytesIO(body), content_type
+
+    def put(self, fileobj, key, content_type):
+        body = fileobj.read()
+        with self._lock:
+            self.objects[key] = (body, content_type or DEFAULT_CONTENT_TYPE, datetime.now(timezone.utc))
+
+    def copy(self, source_key, dest_key):
+        with self._lock:
+            try:
+                body, content_type, _ = self.objects[source_key]
+            except KeyError:
+                raise StorageError(f'키를 찾을 수 없습니다: {source_key}', code='NoSuchKey', key=source_key)
+            self.objects[dest_key] = (body, content_type, datetime.now(timezone.utc))
+
+    def delete_many(self, keys):
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for key in keys:
+                self.objects.pop(key, None)
+        return keys, []
+
+    def list(self, prefix='', start_after=None):
+        with self._lock:
+            items = sorted(self.objects.items())
+
+        for key, (body, _, last_modified) in items:
+            if key.startswith(prefix) and not (start_after and key <= start_after):
+                yield StoredObject(key, len(body), last_modified)
+
+
+class InstrumentedStorage:
+    '''
+    저장소 호출 수 / 시간을 요청별 성능 지표(blog.metrics)에 기록하는 프록시
+    그 밖의 속성(bucket, objects 등)은 실제 백엔드로 전달
+    '''
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def generate_presigned_url(self, key, content_type, expires_in=600):
+        with timed('storage'):
+            return self.backend.generate_presigned_url(key, content_type, expires_in)
+
+    def get(self, key):
+        with timed('storage'):
+            return self.backend.get(key)
+
+    def put(self, fileobj, key, content_type):
+        with timed('storage'):
+            return self.backend.put(fileobj, key, content_type)
+
+    def copy(self, source_key, dest_key):
+        with timed('storage'):
+            return self.backend.copy(source_key, dest_key)
+
+    def delete_many(self, keys):
+        with timed('storage'):
+            return self.backend.delete_many(keys)
+
+    def list(self, prefix='', start_after=None):
+        # 목록 조회는 한 번의 호출로 세고, 순회하며 다음 페이지를 가져오는 시간을 누적
+        iterator = iter(self.backend.list(prefix, start_after))
+        count = 1
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                record('storage', time.perf_counter() - started, count)
+                return
+            record('storage', time.perf_counter() - started, count)
+            count = 0
+            yield item
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    '''
+    settings.STORAGE의 BACKEND(dotted path)와 OPTIONS로 만든 저장소 (프로세스당 하나, 첫 사용 시 생성)
+    호출 수 / 시간을 요청별 성능 지표에 기록하도록 InstrumentedStorage로 감쌈
+    '''
+    global _storage
+
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                config = settings.STORAGE
+                _storage = InstrumentedStorage(import_string(config['BACKEND'])(**config.get('OPTIONS', {})))
+
+    return _storage
+
+
+@receiver(setting_changed)
+def reset_storage(*, setting, **kwargs):
+    # override_settings(STORAGE=...)로 테스트에서 백엔드를 바꿀 수 있도록 재생성
+    global _storage
+
+    if setting in ('STORAGE', 'AWS_S3_BUCKET_NAME'):
+        _storage = None
@@ -0,0 +1,43 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+from taggit.models import Tag, TaggedItem
+
+from .cache import bump_version
+from .models import Post, TagStat
+
+
+def refresh_tag_stats(tag_ids=None):
+    '''
+    주어진 태그들(None이면 전체)의 게시글 수를 TaggedItem에서 다시 집계하여 TagStat에 반영
+    변경된 태그만 집계하므로 게시글 저장/삭제마다 호출해도 태그 수에 비례한 비용만 발생
+    '''
+    tags = Tag.objects.all()
+    if tag_ids is not None:
+        if not tag_ids:
+            return
+        tags = tags.filter(pk__in=tag_ids)
+
+    existing_ids = list(tags.values_list('pk', flat=True))
+    if not existing_ids:
+        return
+
+    counts = dict(
+        TaggedItem.objects
+        .filter(content_type=ContentType.objects.get_for_model(Post), tag_id__in=existing_ids)
+        .values('tag_id')
+        .annotate(count=Count('id'))
+        .values_list('tag_id', 'count')
+    )
+
+    TagStat.objects.bulk_create(
+        [TagStat(tag_id=tag_id, post_count=counts.get(tag_id, 0)) for tag_id in existing_ids],
+        update_conflicts=True,
+        unique_fields=['tag'],
+        update_fields=['post_count'],
+        batch_size=1000,
+    )
+    bump_version('tags')
+
+
+def get_post_tag_ids(post):
+    return set(post.tags.values_list('pk', flat=True))
@@ -1,10 +1,13 @@
+import io
+
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from django.conf import settings
 
-from .models import Post, Comment
+from .models import Post, Comment, ImageJob
 
 User = get_user_model()
 
@@ -245,7 +248,7 @@ class CommentViewSetTest(APITestCase):
         """
         Ensure comments for a specific post can be retrieved.
         """
-        url = reverse('post-comments', kwargs={'pk': self.post.pk})
+        url = reverse('post-get-comments-list', kwargs={'pk': self.post.pk})
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
@@ -360,4 +363,1209 @@ class PreOptimizationPerformanceTest(APITestCase):
                              msg=f'쿼리 최적화가 적용되지 않았거나 비효율적입니다. 쿼리 수 : {num_queries}개')
 
 
-            
\ No newline at end of file
+            
+
+class PostCursorPaginationTest(APITestCase):
+    NUM_POSTS = 25
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+
+        for i in range(self.NUM_POSTS):
+            post = Post.objects.create(author=self.user, title=f'Post {i:02d}', content=f'Content {i}')
+            post.tags.add('even' if i % 2 == 0 else 'odd')
+
+    def collect_pages(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_list_without_cursor_returns_all_posts(self):
+        """
+        커서/페이지 크기 파라미터가 없으면 기존처럼 전체 목록을 반환해야 합니다.
+        """
+        response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), self.NUM_POSTS)
+
+    def test_cursor_pages_cover_every_post_once(self):
+        """
+        커서를 따라가면 중복/누락 없이 최신순으로 모든 게시글을 순회해야 합니다.
+        """
+        ids = self.collect_pages(reverse('post-list'), {'page_size': 10})
+        expected = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_with_ordering_and_tag_filter(self):
+        """
+        정렬/태그 필터와 함께 사용해도 커서가 올바르게 동작해야 합니다.
+        """
+        ids = self.collect_pages(reverse('post-list'), {'page_size': 4, 'ordering': 'title', 'tags__name': 'even'})
+        expected = list(Post.objects.filter(tags__name='even').order_by('title', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('post-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostListRepresentationTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.post = Post.objects.create(
+            author=self.user,
+            title='Excerpt Post',
+            content='<h1>제목</h1><p>첫 번째 &amp; 두 번째 문단</p>' + '<p>긴 본문</p>' * 100,
+        )
+
+    def test_excerpt_is_plain_text(self):
+        self.assertTrue(self.post.excerpt.startswith('제목 첫 번째 & 두 번째 문단'))
+        self.assertLessEqual(len(self.post.excerpt), 200)
+
+    def test_list_returns_excerpt_without_content(self):
+        response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('content', response.data[0])
+        self.assertEqual(response.data[0]['excerpt'], self.post.excerpt)
+
+    def test_retrieve_returns_full_content(self):
+        response = self.client.get(reverse('post-detail', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], self.post.content)
+
+
+class PostContentFieldsTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(
+            author=self.user,
+            title='TOC Post',
+            content=('<h2>소개</h2><p>' + 'word ' * 450 + '</p>'
+                     '<h3 id="setup">설치 <code>pip</code></h3><h2>소개</h2>'),
+        )
+
+    def test_derived_fields_computed_on_save(self):
+        self.assertEqual(self.post.word_count, 454)
+        self.assertEqual(self.post.reading_time, 3)
+        self.assertEqual(self.post.toc, [
+            {'level': 2, 'id': '소개', 'title': '소개'},
+            {'level': 3, 'id': 'setup', 'title': '설치 pip'},
+            {'level': 2, 'id': '소개-2', 'title': '소개'},
+        ])
+        # 목차 id가 본문 제목에 들어가 있어야 함 (이미 있던 id는 그대로)
+        self.assertTrue(self.post.content.startswith('<h2 id="소개">소개</h2>'))
+        self.assertIn('<h3 id="setup">', self.post.content)
+        self.assertTrue(self.post.content.endswith('<h2 id="소개-2">소개</h2>'))
+
+    def test_generated_ids_do_not_collide_with_existing_ids(self):
+        from .content import build_toc
+
+        content, toc = build_toc('<h2>Intro</h2>\n<H2\nclass="x">Intro</H2><h3 id="intro">Later</h3>')
+        self.assertEqual([item['id'] for item in toc], ['intro-2', 'intro-3', 'intro'])
+        self.assertEqual(content, '<h2 id="intro-2">Intro</h2>\n<H2 id="intro-3"\nclass="x">Intro</H2>'
+                                  '<h3 id="intro">Later</h3>')
+
+    def test_save_without_content_skips_analysis(self):
+        from unittest import mock
+
+        post = Post.objects.defer('content').get(pk=self.post.pk)
+        post.title = 'Renamed'
+        # 지연 로딩한 content를 다시 읽지 않음 (UPDATE 2번만)
+        with mock.patch('blog.models.analyze_content') as analyze, self.assertNumQueries(2):
+            post.save()
+            self.post.save(update_fields=['title'])
+        analyze.assert_not_called()
+
+    def test_update_recomputes_and_list_defers_toc(self):
+        response = self.client.patch(reverse('post-detail', kwargs={'pk': self.post.pk}),
+                                     {'content': '<p>짧은 글</p>'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['word_count'], response.data['reading_time'], response.data['toc']), (2, 1, []))
+
+        response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.data[0]['word_count'], 2)
+        self.assertNotIn('toc', response.data[0])
+
+    def test_backfill_command(self):
+        from django.core.management import call_command
+
+        Post.objects.filter(pk=self.post.pk).update(word_count=0, reading_time=0, toc=[])
+        call_command('backfill_post_content', batch_size=1, stdout=io.StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.word_count, self.post.reading_time, len(self.post.toc)), (454, 3, 3))
+
+
+class PostSearchTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password', nickname='장고러')
+        self.post = Post.objects.create(author=self.user, title='배포 후기', content='<p>본문</p>')
+        self.post.tags.add('django')
+        other = User.objects.create_user('other', 'other@test.com', 'password')
+        Post.objects.create(author=other, title='다른 글', content='<p>내용</p>')
+
+    def test_search_terms_strip_operators(self):
+        from .search import build_search_query, clean_search_terms
+
+        self.assertEqual(clean_search_terms(["장고's", '&|!', '배포']), ['장고s', '배포'])
+        self.assertIsNone(build_search_query(['&|!']))
+
+    def test_tag_changes_refresh_search_vector(self):
+        from unittest import mock
+
+        # views / admin을 거치지 않은 태그 변경도 변경 1번마다 검색 벡터 갱신
+        with mock.patch('blog.signals.update_search_vector') as update:
+            self.post.tags.add('배포')
+            self.post.tags.remove('django')
+            self.post.tags.add('배포')
+        self.assertEqual(update.call_count, 2)
+
+    def test_ranked_results_keep_order_across_cursor_pages(self):
+        from django.db import connection
+
+        if connection.vendor != 'postgresql':
+            self.skipTest('전문 검색 관련도 정렬은 PostgreSQL 전용')
+
+        from .search import update_search_vector
+
+        # 제목(A) > 태그(B) > 본문(D) 순으로 관련도가 높아야 함
+        in_body = Post.objects.create(author=self.user, title='본문만', content='<p>쿠버네티스 &amp; 배포</p>')
+        in_tag = Post.objects.create(author=self.user, title='태그만', content='<p>없음</p>')
+        in_tag.tags.add('쿠버네티스')
+        in_title = Post.objects.create(author=self.user, title='쿠버네티스 입문', content='<p>없음</p>')
+        for post in (in_body, in_tag, in_title):
+            update_search_vector(post)
+
+        response = self.client.get(reverse('post-list'), {'search': '쿠버네티스'})
+        expected = [in_title.id, in_tag.id, in_body.id]
+        self.assertEqual([item['id'] for item in response.data], expected)
+
+        ids, url, params = [], reverse('post-list'), {'search': '쿠버네티스', 'page_size': 1}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in response.data['results'])
+            url, params = response.data['next'], None
+        self.assertEqual(ids, expected)
+
+    def test_search_by_title_tag_and_nickname(self):
+        url = reverse('post-list')
+
+        for term in ('배포', 'django', '장고러'):
+            response = self.client.get(url, {'search': term})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([item['id'] for item in response.data], [self.post.id])
+
+
+class PostResponseCacheTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.post = Post.objects.create(author=self.admin_user, title='Cached Post', content='Content')
+
+    def test_list_is_served_from_cache_until_post_changes(self):
+        from .cache import get_cache_stats
+
+        url = reverse('post-list')
+        before = get_cache_stats('posts')
+
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data[0]['title'], 'Cached Post')
+
+        after = get_cache_stats('posts')
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+        # 게시글 수정/태그 변경 시 캐시 버전이 올라가 새로 조회되어야 함
+        self.post.title = 'Updated Post'
+        self.post.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]['title'], 'Updated Post')
+
+        self.post.tags.add('django')
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]['tags'], ['django'])
+
+    def test_detail_cache_invalidated_on_delete(self):
+        url = reverse('post-detail', kwargs={'pk': self.post.pk})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(self.admin_user)
+        self.client.delete(url)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_invalidates_only_its_post_detail(self):
+        from .cache import get_version
+
+        url = reverse('post-detail', kwargs={'pk': self.post.pk})
+        self.assertEqual(self.client.get(url).data['comment_count'], 0)
+        posts_version = get_version('posts')
+
+        Comment.objects.create(post=self.post, author=self.admin_user, content='comment')
+        self.assertEqual(get_version('posts'), posts_version)
+        self.assertEqual(self.client.get(url).data['comment_count'], 1)
+
+    def test_author_nickname_change_invalidates_cache(self):
+        url = reverse('post-list')
+        self.assertEqual(self.client.get(url).data[0]['author_nickname'], 'admin')
+
+        self.admin_user.nickname = 'renamed'
+        self.admin_user.save()
+        self.assertEqual(self.client.get(url).data[0]['author_nickname'], 'renamed')
+
+    def test_cache_stats_requires_admin(self):
+        url = reverse('post-cache-stats')
+        self.assertIn(self.client.get(url).status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hit_rate', response.data)
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.post = Post.objects.create(author=self.user, title='ETag Post', content='Content')
+        self.other_post = Post.objects.create(author=self.user, title='Other Post', content='Content')
+        self.comment = Comment.objects.create(post=self.post, author=self.user, content='Comment')
+
+    def assert_not_modified_until(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_post_list_etag_reflects_delete(self):
+        self.assert_not_modified_until(reverse('post-list'), self.other_post.delete)
+
+    def test_post_detail_etag_reflects_tag_change(self):
+        url = reverse('post-detail', kwargs={'pk': self.post.pk})
+        self.assert_not_modified_until(url, lambda: self.post.tags.add('django'))
+
+    def test_post_list_etag_reflects_comment_count(self):
+        url = reverse('post-list')
+        self.assert_not_modified_until(
+            url, lambda: Comment.objects.create(post=self.post, author=self.user, content='New'))
+        self.assertEqual(self.client.get(url).data[1]['comment_count'], 2)
+        self.assert_not_modified_until(url, self.comment.delete)
+
+    def test_comments_etag_reflects_delete(self):
+        url = reverse('post-get-comments-list', kwargs={'pk': self.post.pk})
+        self.assert_not_modified_until(url, self.comment.delete)
+
+    def test_invalid_lookup_returns_404(self):
+        for url in ('/api/posts/abc/', '/api/posts/abc/comments/'):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND, msg=url)
+
+    def test_if_modified_since(self):
+        url = reverse('post-detail', kwargs={'pk': self.post.pk})
+        last_modified = self.client.get(url)['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class CommentPaginationTest(APITestCase):
+    NUM_COMMENTS = 45
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password', nickname='댓글러')
+        self.post = Post.objects.create(author=self.user, title='Post', content='Content')
+
+        for i in range(self.NUM_COMMENTS):
+            Comment.objects.create(post=self.post, author=self.user if i % 2 else None,
+                                   author_name='' if i % 2 else f'anon{i}', content=f'Comment {i}')
+
+    def test_comment_pages_use_constant_queries(self):
+        url = reverse('post-get-comments-list', kwargs={'pk': self.post.pk})
+        ids = []
+
+        while url:
+            # 집계(ETag) 1 + 댓글/작성자 JOIN 1
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 20)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+
+        expected = list(self.post.comments.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(Comment.objects.get(id=ids[0]).content, 'Comment 44')
+
+
+class CommentCountTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.staff = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.post = Post.objects.create(author=self.user, title='Post', content='Content')
+
+    def test_comment_count_follows_create_and_delete(self):
+        comment = Comment.objects.create(post=self.post, author=self.user, content='first')
+        Comment.objects.create(post=self.post, author=self.user, content='second')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+
+        # 관리자(staff)의 타인 댓글 삭제
+        self.client.force_authenticate(self.staff)
+        response = self.client.delete(reverse('post-comments-detail', kwargs={'pk': comment.pk}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+        response = self.client.get(reverse('post-detail', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.data['comment_count'], 1)
+
+    def test_post_save_keeps_concurrent_comment_count(self):
+        # 게시글을 읽어둔 뒤 댓글이 달려도 게시글 저장이 comment_count를 이전 값으로 되돌리지 않아야 함
+        post = Post.objects.get(pk=self.post.pk)
+        Comment.objects.create(post=self.post, author=self.user, content='first')
+
+        post.title = 'Edited'
+        post.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'Edited')
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_cascade_delete_skips_comment_count_updates(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def count_updates(delete):
+            with CaptureQueriesContext(connection) as queries:
+                delete()
+            return sum('"comment_count"' in query['sql'] and query['sql'].startswith('UPDATE')
+                       for query in queries.captured_queries)
+
+        # 게시글 쿼리셋 / 작성자 삭제로 CASCADE된 댓글마다 comment_count UPDATE를 실행하지 않아야 함
+        for i in range(5):
+            Comment.objects.create(post=self.post, author=self.user, content=f'comment {i}')
+        self.assertEqual(count_updates(Post.objects.filter(pk=self.post.pk).delete), 0)
+
+        post = Post.objects.create(author=self.user, title='Post', content='Content')
+        Comment.objects.create(post=post, author=self.user, content='comment')
+        self.assertEqual(count_updates(self.user.delete), 0)
+
+        # 댓글 쿼리셋 삭제는 게시글이 남으므로 comment_count 반영
+        post = Post.objects.create(author=self.staff, title='Post', content='Content')
+        Comment.objects.create(post=post, author=self.staff, content='comment')
+        self.assertEqual(count_updates(Comment.objects.filter(post=post).delete), 1)
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+
+    def test_recount_comments_repairs_drift(self):
+        from django.core.management import call_command
+
+        Comment.objects.create(post=self.post, author=self.user, content='first')
+        Post.objects.filter(pk=self.post.pk).update(comment_count=10)
+
+        call_command('recount_comments', stdout=io.StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+
+class TagStatsTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.first = Post.objects.create(author=self.user, title='First', content='Content')
+        self.second = Post.objects.create(author=self.user, title='Second', content='Content')
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('django')
+
+    def get_counts(self, **params):
+        response = self.client.get(reverse('tag-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['name'], item['post_count']) for item in response.data]
+
+    def test_tag_counts_follow_post_and_tag_changes(self):
+        self.assertEqual(self.get_counts(), [('django', 2), ('python', 1)])
+        self.assertEqual(self.get_counts(top=1), [('django', 2)])
+
+        self.first.tags.remove('python')
+        self.assertEqual(self.get_counts(), [('django', 2)])
+
+        self.second.delete()
+        self.assertEqual(self.get_counts(), [('django', 1)])
+
+        self.first.tags.clear()
+        self.assertEqual(self.get_counts(), [])
+
+    def test_tag_list_is_cacheable(self):
+        response = self.client.get(reverse('tag-list'))
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertEqual(response.data[0]['slug'], 'django')
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('tag-list'))
+
+    def test_invalid_top(self):
+        response = self.client.get(reverse('tag-list'), {'top': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ImageJobTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_async_upload_returns_job_and_worker_completes_it(self):
+        from unittest import mock
+        from .jobs import run_worker
+
+        response = self.client.post(reverse('image-upload'), {'s3_key': 'temp/a.jpg', 'async': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        status_url = reverse('image-job-status', kwargs={'job_id': response.data['job_id']})
+
+        with mock.patch('blog.jobs.get_or_generate_derivatives', return_value={'url': 'https://cdn.test/resized/a.jpg'}):
+            self.assertEqual(run_worker(once=True), 1)
+
+        response = self.client.get(status_url, {'wait': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'done')
+        self.assertEqual(response.data['image_url'], 'https://cdn.test/resized/a.jpg')
+
+    def test_failed_job_records_error(self):
+        from unittest import mock
+        from .jobs import enqueue_image_job, run_worker
+
+        job = enqueue_image_job('temp/broken.jpg')
+        with mock.patch('blog.jobs.get_or_generate_derivatives', return_value=None):
+            run_worker(once=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageJob.Status.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertTrue(job.error)
+
+    def test_non_finite_wait_rejected(self):
+        from .jobs import enqueue_image_job
+
+        job = enqueue_image_job('temp/a.jpg')
+        status_url = reverse('image-job-status', kwargs={'job_id': job.id})
+
+        for wait in ('nan', 'inf', '-inf', 'abc'):
+            response = self.client.get(status_url, {'wait': wait})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=wait)
+
+    def test_stuck_job_fails_after_last_attempt(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import claim_next_job, enqueue_image_job
+
+        job = enqueue_image_job('temp/stuck.jpg')
+        stale = timezone.now() - timedelta(seconds=settings.IMAGE_JOB_TIMEOUT + 1)
+        ImageJob.objects.filter(pk=job.pk).update(
+            status=ImageJob.Status.PROCESSING, attempts=settings.IMAGE_JOB_MAX_ATTEMPTS, updated_at=stale)
+
+        self.assertIsNone(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageJob.Status.FAILED)
+        self.assertTrue(job.error)
+
+    def test_unknown_job(self):
+        import uuid
+
+        response = self.client.get(reverse('image-job-status', kwargs={'job_id': uuid.uuid4()}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FakeS3Client:
+    '''
+    테스트용 boto3 S3 클라이언트 (S3Storage의 배치 처리 확인용)
+    '''
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+        self.delete_calls = 0
+
+    def delete_objects(self, Bucket, Delete):
+        self.delete_calls += 1
+        keys = [item['Key'] for item in Delete['Objects']]
+        assert len(keys) <= 1000
+        self.keys.difference_update(keys)
+        return {'Deleted': [{'Key': key} for key in keys]}
+
+
+def use_memory_storage():
+    from django.test import override_settings
+
+    return override_settings(STORAGE={'BACKEND': 'blog.storage.InMemoryStorage'})
+
+
+def make_jpeg(size):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class ImageDerivativeTest(APITestCase):
+    def put_image(self, key, size):
+        from .storage import get_storage
+
+        get_storage().put(io.BytesIO(make_jpeg(size)), key, 'image/jpeg')
+        return get_storage()
+
+    @use_memory_storage()
+    def test_derivatives_from_single_decode(self):
+        from .utils import generate_image_derivatives
+
+        storage = self.put_image('temp/photo.jpg', (2000, 1000))
+        manifest = generate_image_derivatives('temp/photo.jpg')
+
+        self.assertEqual(manifest['url'], f'{settings.AWS_CLOUDFRONT_DOMAIN}/resized/photo.jpg')
+        self.assertEqual((manifest['width'], manifest['height']), (800, 400))
+        self.assertEqual(len(manifest['variants']), 6)
+        self.assertIn('resized/photo_400w.webp', storage.objects)
+        self.assertEqual(storage.objects['resized/photo_1600w.jpg'][1], 'image/jpeg')
+        self.assertEqual(storage.objects['resized/photo_800w.webp'][1], 'image/webp')
+        self.assertTrue(manifest['srcset']['webp'].endswith('resized/photo_1600w.webp 1600w'))
+
+    @use_memory_storage()
+    def test_small_image_is_not_upscaled(self):
+        from .utils import generate_image_derivatives
+
+        self.put_image('temp/small.jpg', (300, 200))
+        manifest = generate_image_derivatives('temp/small.jpg')
+
+        self.assertEqual({variant['width'] for variant in manifest['variants']}, {300})
+
+    @use_memory_storage()
+    def test_delete_removes_clamped_width_derivatives(self):
+        from .utils import delete_images, generate_image_derivatives
+
+        storage = self.put_image('temp/small.jpg', (300, 200))
+        generate_image_derivatives('temp/small.jpg')
+        self.put_image('resized/small_cover.jpg', (10, 10))
+        self.assertIn('resized/small_300w.webp', storage.objects)
+
+        delete_images({'resized/small.jpg'})
+        self.assertEqual(sorted(storage.objects), ['resized/small_cover.jpg', 'temp/small.jpg'])
+
+    @use_memory_storage()
+    def test_delete_uses_asset_manifest_without_listing(self):
+        from unittest import mock
+        from .assets import get_manifest_derivative_keys, get_or_generate_derivatives
+        from .models import ImageAsset
+        from .utils import delete_images
+
+        storage = self.put_image('temp/photo.jpg', (2000, 1000))
+        get_or_generate_derivatives('temp/photo.jpg')
+        self.put_image('temp/legacy.jpg', (300, 200))
+        get_or_generate_derivatives('temp/legacy.jpg')
+        # manifest가 없는 이미지만 저장소 목록을 조회
+        ImageAsset.objects.filter(resized_key='resized/legacy.jpg').delete()
+
+        keys = {'resized/photo.jpg', 'resized/legacy.jpg'}
+        with mock.patch.object(storage, 'list', wraps=storage.list) as list_keys:
+            delete_images(keys, get_manifest_derivative_keys(keys))
+        self.assertEqual([call.args[0] for call in list_keys.call_args_list], ['resized/legacy_'])
+        self.assertEqual(sorted(storage.objects), ['temp/legacy.jpg', 'temp/photo.jpg'])
+
+    @use_memory_storage()
+    def test_pixel_ceiling_rejects_decompression_bomb(self):
+        from django.test import override_settings
+        from .utils import generate_image_derivatives
+
+        storage = self.put_image('temp/bomb.jpg', (1000, 1000))
+
+        with override_settings(IMAGE_MAX_PIXELS=500 * 500):
+            self.assertIsNone(generate_image_derivatives('temp/bomb.jpg'))
+        self.assertEqual(list(storage.objects), ['temp/bomb.jpg'])
+
+
+class S3HousekeepingTest(APITestCase):
+    @use_memory_storage()
+    def test_move_temp_images_copies_concurrently_and_deletes_temp(self):
+        from .storage import get_storage
+        from .utils import move_temp_images_to_final_location
+
+        storage = get_storage()
+        for i in range(30):
+            storage.put(io.BytesIO(b'img'), f'temp/{i}.jpg', 'image/jpeg')
+        content = ''.join(f'<img src="{settings.AWS_CLOUDFRONT_DOMAIN}/resized/{i}.jpg">' for i in range(31))
+
+        self.assertEqual(move_temp_images_to_final_location(content), content)
+        self.assertEqual(sorted(storage.objects), sorted(f'content/{i}.jpg' for i in range(30)))
+
+    def test_s3_delete_many_batches_by_thousand(self):
+        from .storage import S3Storage
+
+        fake_client = FakeS3Client(f'resized/{i}.jpg' for i in range(2500))
+        deleted, errors = S3Storage(bucket='test-bucket', client=fake_client).delete_many(list(fake_client.keys))
+
+        self.assertEqual((len(deleted), errors), (2500, []))
+        self.assertEqual(fake_client.delete_calls, 3)
+        self.assertEqual(fake_client.keys, set())
+
+
+class LocalStorageTest(APITestCase):
+    def test_round_trip_and_listing(self):
+        import tempfile
+        from .storage import LocalStorage, StorageError
+
+        with tempfile.TemporaryDirectory() as location:
+            storage = LocalStorage(location=location)
+            storage.put(io.BytesIO(b'abc'), 'temp/a.jpg', 'image/jpeg')
+            storage.copy('temp/a.jpg', 'content/a.jpg')
+
+            body, content_type = storage.get('content/a.jpg')
+            with body:
+                self.assertEqual((body.read(), content_type), (b'abc', 'image/jpeg'))
+            self.assertEqual([obj.key for obj in storage.list('temp/')], ['temp/a.jpg'])
+
+            storage.delete_many(['temp/a.jpg', 'temp/missing.jpg'])
+            with self.assertRaises(StorageError) as cm:
+                storage.get('temp/a.jpg')
+            self.assertEqual(cm.exception.code, 'NoSuchKey')
+
+            with self.assertRaises(StorageError):
+                storage.get('../outside.jpg')
+
+    @use_memory_storage()
+    def test_presigned_url_upload_checks_signature(self):
+        import time
+        from unittest import mock
+        from urllib.parse import urlsplit
+        from .storage import BaseStorage, get_storage
+
+        with self.assertRaises(TypeError):
+            BaseStorage()
+
+        storage = get_storage()
+        url = urlsplit(storage.generate_presigned_url('temp/up.jpg', 'image/jpeg', expires_in=60))
+        path = f'{url.path}?{url.query}'
+        self.assertEqual(path.split('?')[0], reverse('storage-upload', kwargs={'key': 'temp/up.jpg'}))
+
+        # Content-Type / 키가 서명과 다르면 거부
+        response = self.client.generic('PUT', path, b'image', content_type='image/png')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        other = reverse('storage-upload', kwargs={'key': 'temp/other.jpg'})
+        response = self.client.generic('PUT', f'{other}?{url.query}', b'image', content_type='image/jpeg')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.generic('PUT', path, b'image', content_type='image/jpeg')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(storage.objects['temp/up.jpg'][:2], (b'image', 'image/jpeg'))
+
+        # 만료된 서명은 거부
+        with mock.patch('django.core.signing.time.time', return_value=time.time() + 120):
+            response = self.client.generic('PUT', path, b'image', content_type='image/jpeg')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class StartupImportTest(APITestCase):
+    def test_worker_startup_does_not_load_heavy_modules(self):
+        from django.core.management import call_command
+
+        # boto3 / PIL / bs4가 기동 시 로드되면 CommandError
+        out = io.StringIO()
+        call_command('bench_startup', runs=1, stdout=out)
+        self.assertIn('없음', out.getvalue())
+
+    def test_comment_password_default_is_hashed_per_instance(self):
+        from .credentials import check_comment_password
+
+        field = Comment._meta.get_field('password')
+        self.assertTrue(callable(field.default))
+        self.assertTrue(check_comment_password('1111', field.get_default()))
+
+
+class ImageKeyExtractionTest(APITestCase):
+    def test_matches_beautifulsoup_results(self):
+        from unittest import mock
+        from .management.commands.bench_image_keys import _extract_legacy
+        from .utils import extract_image_keys_from_content
+
+        cdn = settings.AWS_CLOUDFRONT_DOMAIN
+        content = (
+            f'<p>text<IMG SRC="{cdn}/resized/upper.jpg"></p>'
+            f'<img src="{cdn}/resized/a&amp;b.jpg" />'
+            f"<img alt='x' src='{cdn}/resized/single.png'>"
+            f'<img src="{cdn}/resized/first.jpg" src="{cdn}/resized/last.jpg">'
+            f'<img src="https://other.example.com/resized/external.jpg"><img>'
+            f'<p>&lt;img src="{cdn}/resized/escaped.jpg"&gt;</p>'
+        )
+
+        with mock.patch('builtins.print'):
+            keys = extract_image_keys_from_content(content)
+
+        self.assertEqual(keys, _extract_legacy(content))
+        self.assertEqual(keys, {'resized/upper.jpg', 'resized/a&b.jpg', 'resized/single.png', 'resized/last.jpg'})
+
+    def test_repeated_content_is_parsed_once(self):
+        from unittest import mock
+        from . import utils
+
+        content = f'<img src="{settings.AWS_CLOUDFRONT_DOMAIN}/resized/memo.jpg">'
+
+        with mock.patch('builtins.print'), mock.patch.object(utils, '_parse_image_keys', wraps=utils._parse_image_keys) as parse:
+            utils.extract_image_keys_from_content(content)
+            utils.extract_image_keys_from_content(content)
+
+        self.assertEqual(parse.call_count, 1)
+
+
+class PostImageIndexTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(self.admin_user)
+
+    def img(self, name):
+        return f'<img src="{settings.AWS_CLOUDFRONT_DOMAIN}/resized/{name}">'
+
+    @use_memory_storage()
+    def test_index_follows_content_and_protects_shared_images(self):
+        from unittest import mock
+        from .storage import get_storage
+
+        storage = get_storage()
+        for key in ('resized/own.jpg', 'content/own.jpg', 'resized/shared.jpg', 'content/shared.jpg'):
+            storage.put(io.BytesIO(b'img'), key, 'image/jpeg')
+
+        with mock.patch('builtins.print'):
+            post = Post.objects.create(author=self.admin_user, title='A', content=self.img('own.jpg') + self.img('shared.jpg'))
+            Post.objects.create(author=self.admin_user, title='B', content=self.img('shared.jpg'))
+            self.assertEqual(set(post.images.values_list('s3_key', flat=True)), {'resized/own.jpg', 'resized/shared.jpg'})
+
+            response = self.client.patch(reverse('post-detail', kwargs={'pk': post.pk}), {'content': '<p>no images</p>'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(post.images.exists())
+        # 다른 게시글이 참조하는 이미지는 남기고, 더 이상 참조되지 않는 이미지만 삭제
+        self.assertEqual(sorted(storage.objects), ['content/shared.jpg', 'resized/shared.jpg'])
+
+    @use_memory_storage()
+    def test_delete_post_uses_index_without_parsing(self):
+        from unittest import mock
+        from .storage import get_storage
+
+        storage = get_storage()
+        storage.put(io.BytesIO(b'img'), 'resized/gone.jpg', 'image/jpeg')
+
+        with mock.patch('builtins.print'):
+            post = Post.objects.create(author=self.admin_user, title='A', content=self.img('gone.jpg'))
+
+            with mock.patch('blog.utils._parse_image_keys') as parse:
+                response = self.client.delete(reverse('post-detail', kwargs={'pk': post.pk}))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        parse.assert_not_called()
+        self.assertEqual(storage.objects, {})
+
+
+class OrphanImageGCTest(APITestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.old = timezone.now() - timedelta(days=2)
+
+    def seed(self, storage, keys, last_modified):
+        for key in keys:
+            storage.objects[key] = (b'img', 'image/jpeg', last_modified)
+
+    @use_memory_storage()
+    def test_deletes_only_old_unreferenced_objects(self):
+        import json
+        import os
+        import tempfile
+        from unittest import mock
+        from django.core.management import call_command
+        from django.utils import timezone
+        from .storage import get_storage
+
+        storage = get_storage()
+        with mock.patch('builtins.print'):
+            Post.objects.create(author=self.user, title='A',
+                                content=f'<img src="{settings.AWS_CLOUDFRONT_DOMAIN}/resized/keep.jpg">')
+        self.seed(storage, ['resized/keep.jpg', 'resized/keep_400w.webp', 'temp/keep.jpg',
+                            'resized/orphan.jpg', 'resized/orphan_400w.webp', 'temp/old.jpg'], self.old)
+        self.seed(storage, ['temp/fresh.jpg'], timezone.now())
+
+        call_command('gc_orphan_images', dry_run=True, stdout=io.StringIO())
+        self.assertEqual(len(storage.objects), 7)
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'gc.json')
+            call_command('gc_orphan_images', batch_size=2, checkpoint=checkpoint, stdout=io.StringIO())
+
+            self.assertEqual(sorted(storage.objects),
+                             ['resized/keep.jpg', 'resized/keep_400w.webp', 'temp/fresh.jpg', 'temp/keep.jpg'])
+
+            # 모든 접두사를 끝까지 처리하면 체크포인트가 삭제되어 다음 실행은 처음부터 검사
+            self.assertFalse(os.path.exists(checkpoint))
+            self.seed(storage, ['temp/later.jpg'], self.old)
+            call_command('gc_orphan_images', checkpoint=checkpoint, stdout=io.StringIO())
+            self.assertNotIn('temp/later.jpg', storage.objects)
+
+            # 중단된 실행의 체크포인트에서 완료된 접두사는 건너뜀
+            with open(checkpoint, 'w') as f:
+                json.dump({'temp/': {'done': True}}, f)
+            self.seed(storage, ['temp/later.jpg'], self.old)
+            out = io.StringIO()
+            call_command('gc_orphan_images', checkpoint=checkpoint, stdout=out)
+            self.assertIn('temp/later.jpg', storage.objects)
+            self.assertIn('건너뜀', out.getvalue())
+            self.assertFalse(os.path.exists(checkpoint))
+
+
+class ImageDeduplicationTest(APITestCase):
+    def upload(self, storage, key, body):
+        storage.put(io.BytesIO(body), key, 'image/jpeg')
+        return self.client.post(reverse('image-upload'), {'s3_key': key, 'manifest': True}, format='json')
+
+    @use_memory_storage()
+    def test_same_image_reuses_existing_derivatives(self):
+        import hashlib
+        from unittest import mock
+        from .storage import get_storage
+
+        storage = get_storage()
+        body = make_jpeg((1000, 500))
+
+        first = self.upload(storage, 'temp/first.jpg', body)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        uploaded = set(storage.objects)
+
+        with mock.patch('blog.images.open_image_bounded') as decode:
+            second = self.upload(storage, 'temp/second.jpg', body)
+
+        decode.assert_not_called()
+        self.assertTrue(second.data['deduplicated'])
+        self.assertEqual(second.data['url'], first.data['url'])
+        # 두 번째 임시 원본은 삭제되고 새 파생 이미지는 만들어지지 않음
+        self.assertEqual(set(storage.objects), uploaded)
+
+        # 클라이언트가 해시를 먼저 보내면 presigned URL 없이 기존 URL 반환
+        response = self.client.post(reverse('s3-presigned-url'), {
+            'file_name': 'again.jpg', 'file_type': 'image/jpeg', 'file_size': len(body),
+            'sha256': hashlib.sha256(body).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['duplicate'])
+        self.assertEqual(response.data['url'], first.data['url'])
+
+    @use_memory_storage()
+    def test_deleted_image_is_not_reused(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from .models import ImageAsset
+        from .storage import get_storage
+
+        admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(admin_user)
+        storage = get_storage()
+        first = self.upload(storage, 'temp/only.jpg', make_jpeg((300, 200)))
+        ImageAsset.objects.update(last_used_at=timezone.now() - timedelta(hours=settings.IMAGE_GC_GRACE_HOURS + 1))
+
+        with mock.patch('builtins.print'):
+            post = Post.objects.create(author=admin_user, title='A', content=f'<img src="{first.data["url"]}">')
+            self.client.delete(reverse('post-detail', kwargs={'pk': post.pk}))
+
+        self.assertFalse(ImageAsset.objects.exists())
+        self.assertNotIn('resized/only.jpg', storage.objects)
+
+    @use_memory_storage()
+    def test_recently_reused_image_survives_post_delete(self):
+        from unittest import mock
+        from .models import ImageAsset
+        from .storage import get_storage
+
+        admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(admin_user)
+        storage = get_storage()
+        body = make_jpeg((300, 200))
+        first = self.upload(storage, 'temp/shared.jpg', body)
+
+        with mock.patch('builtins.print'):
+            post = Post.objects.create(author=admin_user, title='A', content=f'<img src="{first.data["url"]}">')
+            # 다른 작성자가 같은 이미지를 올려 같은 URL을 받았지만 아직 게시글을 저장하지 않은 상태
+            self.assertTrue(self.upload(storage, 'temp/draft.jpg', body).data['deduplicated'])
+            self.client.delete(reverse('post-detail', kwargs={'pk': post.pk}))
+
+        self.assertTrue(ImageAsset.objects.exists())
+        self.assertIn('resized/shared.jpg', storage.objects)
+
+
+class CommentCredentialTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.post = Post.objects.create(author=self.user, title='Post', content='Content')
+
+    def test_raw_password_is_hashed_with_comment_hasher(self):
+        comment = Comment.objects.create(post=self.post, content='anon', password='secret')
+        self.assertTrue(comment.password.startswith('comment_pbkdf2_sha256$'))
+        self.assertTrue(comment.check_password('secret'))
+        self.assertFalse(comment.check_password('wrong'))
+
+    def test_legacy_hash_is_accepted_and_upgraded(self):
+        from django.contrib.auth.hashers import make_password
+
+        comment = Comment.objects.create(post=self.post, content='anon', password=make_password('legacy'))
+        self.assertTrue(Comment.objects.get(pk=comment.pk).check_password('legacy'))
+        self.assertTrue(Comment.objects.get(pk=comment.pk).password.startswith('comment_pbkdf2_sha256$'))
+
+    def test_password_hash_is_never_serialized(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        response = self.client.post(reverse('post-comments-list'),
+                                    {'post_id': self.post.pk, 'content': 'anon', 'password': 'secret'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('password', response.data)
+
+        detail_url = reverse('post-comments-detail', kwargs={'pk': response.data['id']})
+        responses = [
+            self.client.get(reverse('post-comments-list')),
+            self.client.get(detail_url),
+            self.client.get(reverse('post-get-comments-list', kwargs={'pk': self.post.pk})),
+            self.client.patch(detail_url, {'content': 'edited', 'password': 'secret'}),
+        ]
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('comment_pbkdf2_sha256', response.content.decode())
+        cache.clear()
+
+    def test_anonymous_password_checks_are_throttled(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from rest_framework.throttling import ScopedRateThrottle
+
+        cache.clear()
+        comment = Comment.objects.create(post=self.post, content='anon', password='secret')
+        url = reverse('post-comments-detail', kwargs={'pk': comment.pk})
+
+        with mock.patch.object(ScopedRateThrottle, 'THROTTLE_RATES', {'comment_password': '2/min'}):
+            codes = [self.client.patch(url, {'content': 'x', 'password': 'wrong'}).status_code for _ in range(3)]
+
+        self.assertEqual(codes, [status.HTTP_403_FORBIDDEN, status.HTTP_403_FORBIDDEN, status.HTTP_429_TOO_MANY_REQUESTS])
+        cache.clear()
+
+
+class BulkImportExportTest(APITestCase):
+    def test_export_import_round_trip(self):
+        import os
+        import tempfile
+        from datetime import timedelta
+        from unittest import mock
+        from django.core.management import call_command
+        from django.utils import timezone
+        from .models import PostImage, TagStat
+
+        user = User.objects.create_user('writer', 'writer@test.com', 'password')
+        created_at = timezone.now() - timedelta(days=30)
+        with mock.patch('builtins.print'):
+            post = Post.objects.create(author=user, title='Imported', content=f'<p>Hello <b>world</b></p>'
+                                       f'<img src="{settings.AWS_CLOUDFRONT_DOMAIN}/resized/a.jpg">')
+        post.tags.add('django', 'bulk')
+        Post.objects.filter(pk=post.pk).update(created_at=created_at)
+        Comment.objects.create(post=post, author=user, content='by user')
+        Comment.objects.create(post=post, content='anon', password='secret')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'blog.jsonl')
+            call_command('export_blog', path, stdout=io.StringIO())
+            Post.objects.all().delete()
+
+            with mock.patch('builtins.print'):
+                call_command('import_blog', path, batch_size=1, stdout=io.StringIO())
+
+        imported = Post.objects.get()
+        self.assertEqual(imported.excerpt, 'Hello world')
+        self.assertEqual(imported.created_at, created_at)
+        self.assertEqual(imported.comment_count, 2)
+        self.assertEqual(set(imported.tags.names()), {'django', 'bulk'})
+        self.assertEqual(TagStat.objects.get(tag__name='django').post_count, 1)
+        self.assertEqual(list(PostImage.objects.values_list('s3_key', flat=True)), ['resized/a.jpg'])
+        self.assertTrue(imported.comments.get(author=None).check_password('secret'))
+
+    def test_import_error_names_failing_line(self):
+        import json
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from django.utils.dateparse import parse_datetime
+
+        records = [
+            {'type': 'post', 'id': 1, 'title': 'Kept', 'author': 'writer',
+             'created_at': '2024-01-01T00:00:00+00:00', 'updated_at': '2024-01-02T00:00:00+00:00'},
+            {'type': 'post', 'id': 2, 'author': 'writer'},
+            {'type': 'post', 'id': 3, 'title': 'Next', 'author': 'writer'},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'blog.jsonl')
+            with open(path, 'w') as f:
+                f.write('\n'.join(json.dumps(record) for record in records))
+
+            # 배치(2개)를 저장하는 3번째 줄이 아니라 title이 없는 2번째 줄을 보고
+            with self.assertRaisesMessage(CommandError, '2번째 줄'):
+                call_command('import_blog', path, batch_size=2, stdout=io.StringIO())
+
+        # 오류가 난 줄 이전 레코드는 아직 배치에 남아 있어 저장되지 않음
+        self.assertFalse(Post.objects.exists())
+
+        from .bulk import BlogImporter
+        importer = BlogImporter()
+        importer.feed(records[0])
+        importer.finish()
+        post = Post.objects.get()
+        self.assertEqual(post.created_at, parse_datetime(records[0]['created_at']))
+        self.assertEqual(post.updated_at, parse_datetime(records[0]['updated_at']))
+
+
+@override_settings(SERVER_TIMING_ENABLED=True)
+class PerformanceMiddlewareTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user', 'user@test.com', 'password')
+        for i in range(3):
+            Post.objects.create(author=self.user, title=f'Post {i}', content=f'<p>본문 {i}</p>')
+
+    def server_timing(self, response):
+        return dict(
+            (name, params) for name, _, params in
+            (entry.strip().partition(';') for entry in response['Server-Timing'].split(','))
+        )
+
+    def test_server_timing_counts_queries_without_debug(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.assertFalse(settings.DEBUG)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post-list'), {'page_size': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = self.server_timing(response)
+        self.assertIn(f'desc="{len(queries)} queries"', timing['db'])
+        self.assertIn('desc="0 calls"', timing['storage'])
+        self.assertIn('serialize', timing)
+        self.assertIn('render', timing)
+
+    def test_serializer_data_is_timed_as_serialize(self):
+        from . import metrics
+        from .serializers import CommentSerializer, PostSerializer
+
+        Comment.objects.create(post=Post.objects.first(), content='comment', author_name='anon')
+        request_metrics, token = metrics.start_request()
+        try:
+            # 목록(many=True)은 ListSerializer.data 한 번으로 기록
+            CommentSerializer(Comment.objects.all(), many=True).data
+            PostSerializer(Post.objects.first()).data
+        finally:
+            metrics.end_request(token)
+
+        count, seconds = request_metrics.get('serialize')
+        self.assertEqual(count, 2)
+        self.assertGreater(seconds, 0)
+
+    @use_memory_storage()
+    def test_storage_calls_and_metrics_endpoint(self):
+        response = self.client.post(reverse('s3-presigned-url'), {
+            'file_name': 'photo.jpg', 'file_type': 'image/jpeg', 'file_size': 100,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('desc="1 calls"', self.server_timing(response)['storage'])
+
+        # 토큰이 설정되지 않았으면 공개하지 않음
+        with self.settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+        with self.settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_401_UNAUTHORIZED)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_storage_calls_bucket{view="s3-presigned-url",method="POST",le="1"}', body)
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_server_timing_header_can_be_disabled(self):
+        response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Server-Timing', response)
+
+
+class BenchmarkCommandTest(APITestCase):
+    def test_benchmark_reports_and_flags_regressions(self):
+        import json
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        options = {'posts': 6, 'comments_per_post': 2, 'tags': 3, 'users': 2, 'requests': 3, 'warmup': 1,
+                   'memory_samples': 1, 'image_size': 200, 'current_db': True, 'stdout': io.StringIO()}
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'result.json')
+            call_command('benchmark', output=output, **options)
+
+            with open(output) as f:
+                results = json.load(f)
+            self.assertEqual(set(results['scenarios']), {
+                'post_list', 'post_search', 'tag_filter', 'post_detail', 'comments',
+                'comment_create', 'comment_update', 'presign', 'resize',
+            })
+            for name, result in results['scenarios'].items():
+                self.assertEqual(result['errors'], 0, msg=f"{name}: {result['first_error']}")
+            self.assertGreater(results['scenarios']['post_detail']['queries'], 0)
+            self.assertGreater(results['scenarios']['resize']['storage_calls'], 0)
+
+            # 기준 결과보다 쿼리 수가 늘어나면 실패
+            results['scenarios']['post_detail']['queries'] = 0
+            baseline = os.path.join(directory, 'baseline.json')
+            with open(baseline, 'w') as f:
+                json.dump(results, f)
+
+            with self.assertRaisesMessage(CommandError, '성능 회귀'):
+                call_command('benchmark', baseline=baseline, scenarios='post_detail', min_delta_ms=10 ** 6, **options)
+
+    def test_compare_with_baseline_ignores_noise(self):
+        from blog.management.commands.benchmark import compare_with_baseline
+
+        def results(p95_runs):
+            return {'scenarios': {'post_list': {
+                'p95_ms': sorted(p95_runs)[len(p95_runs) // 2], 'p95_runs_ms': p95_runs, 'queries': 3,
+            }}}
+
+        baseline = results([10.0, 10.5, 11.0])
+        self.assertEqual(compare_with_baseline(baseline, baseline, 0.2, 1.0), [])
+        # 반복 중 한 번만 느린 측정은 회귀가 아님
+        self.assertEqual(compare_with_baseline(results([10.2, 30.0, 31.0]), baseline, 0.2, 1.0), [])
+        # 모든 반복이 느려진 경우만 회귀
+        regressions = compare_with_baseline(results([20.0, 21.0, 22.0]), baseline, 0.2, 1.0)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('post_list: p95', regressions[0])
@@ -1,17 +1,21 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested import routers
-from .views import PostViewSet, S3PresignedURLView, ImageUploadView, CommentViewSet
+from .views import PostViewSet, S3PresignedURLView, ImageUploadView, CommentViewSet, TagViewSet, \
+    ImageJobStatusView, storage_upload_view
 
 router = DefaultRouter()
 router.register(r'posts', PostViewSet)
 
 # comments_router = routers.NestedSimpleRouter(router, r'posts', lookup='post')
 router.register(r'comments', CommentViewSet, basename='post-comments')
+router.register(r'tags', TagViewSet, basename='tag')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('s3-presigned-url/', S3PresignedURLView.as_view(), name='s3-presigned-url'),
     path('image-upload/', ImageUploadView.as_view(), name='image-upload'),
+    path('image-jobs/<uuid:job_id>/', ImageJobStatusView.as_view(), name='image-job-status'),
+    path('storage/<path:key>', storage_upload_view, name='storage-upload'),
 ]
 urlpatterns += router.urls
@@ -1,20 +1,19 @@
+import contextvars
+import hashlib
 import io
 import re
 import os.path
+import threading
 import uuid
-from PIL import Image
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 
-import boto3
-from botocore.exceptions import ClientError
-from bs4 import BeautifulSoup
 from django.conf import settings
 
-S3_CLIENT = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION_NAME
-        )
+from .storage import StorageError, get_storage
+
+IMAGE_FORMAT_EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp', 'GIF': '.gif'}
 
 
 def generate_s3_presigned_url(file_name, file_type):
@@ -23,146 +22,358 @@ def generate_s3_presigned_url(file_name, file_type):
     s3_file_path = f'temp/{temp_file_name}'
 
     try:
-        presigned_url = S3_CLIENT.generate_presigned_url(
-            ClientMethod='put_object',
-            Params={
-                'Bucket': settings.AWS_S3_BUCKET_NAME,
-                'Key': s3_file_path,
-                'ContentType': file_type,
-            },
-            ExpiresIn=600
-        )
+        presigned_url = get_storage().generate_presigned_url(s3_file_path, file_type, expires_in=600)
 
         return {'presigned_url': presigned_url, 's3_key': s3_file_path}
 
-    except ClientError as e:
+    except StorageError as e:
         print('S3 Presigned URL 생성 중 에러 발생: ', e)
 
 
-def resize_image_and_upload_to_s3(s3_key):
-    width = 800
-    height = 600
+def _get_encode_options(image_format):
+    return dict(settings.IMAGE_ENCODE_OPTIONS.get(image_format, {}))
+
+
+def _prepare_for_format(image, image_format):
+    # JPEG는 알파 채널/팔레트를 지원하지 않고, WEBP는 팔레트 모드를 직접 인코딩하지 않음
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L', 'CMYK'):
+        return image.convert('RGB')
+    if image_format == 'WEBP' and image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    return image
+
+
+def _encode_image(image, image_format):
+    buffer = io.BytesIO()
+    _prepare_for_format(image, image_format).save(buffer, format=image_format, **_get_encode_options(image_format))
+    buffer.seek(0)
+    return buffer
+
+
+def build_derivative_key(resized_key, width, image_format):
+    '''
+    resized/<name>.<ext> 기준 파생 이미지 키: resized/<name>_<width>w.<ext 또는 webp>
+    '''
+    stem, extension = os.path.splitext(resized_key)
+    if image_format is not None:
+        extension = IMAGE_FORMAT_EXTENSIONS.get(image_format, f'.{image_format.lower()}')
+    return f'{stem}_{width}w{extension}'
+
+
+DERIVATIVE_SUFFIX_RE = re.compile(r'_\d+w$')
+
+
+def get_image_stem(key):
+    '''
+    temp/ · content/ · resized/ 키와 파생 이미지 키에 공통인 파일명 (확장자, _<width>w 제외)
+    예) resized/abc_400w.webp, content/abc.jpg -> abc
+    '''
+    stem = os.path.splitext(os.path.basename(key))[0]
+    if key.startswith('resized/'):
+        stem = DERIVATIVE_SUFFIX_RE.sub('', stem)
+    return stem
+
+
+def get_derivative_keys(resized_key):
+    '''
+    저장소에 실제로 있는 resized_key의 파생 이미지 키 (이미지 삭제 시 함께 삭제)
+    원본이 설정된 너비보다 작으면 원본 너비로 생성되므로 설정값으로 계산하지 않고 <name>_ prefix를 조회
+    '''
+    stem = os.path.splitext(resized_key)[0]
+    pattern = re.compile(rf'{re.escape(stem)}_\d+w\.[^./]+$')
 
     try:
-        # s3에서 원본 이미지 다운로드 (메모리 버퍼로)
-        obj = S3_CLIENT.get_object(Bucket=settings.AWS_S3_BUCKET_NAME, Key=s3_key)
-        image_data = io.BytesIO(obj['Body'].read())
-        image = Image.open(image_data)
-
-        # 이미지 리사이징
-        resized_image = image.copy()
-        resized_image.thumbnail((width, height), Image.LANCZOS)
-
-        # 리사이즈한 이미지를 메모리 버퍼에 저장
-        buffer = io.BytesIO()
-        file_extension = image.format
-        resized_image.save(buffer, format=file_extension)
-        buffer.seek(0)
-
-        # 기존 파일명과 같은 이름으로 s3 resized/ 경로에 저장
-        original_filename = os.path.basename(s3_key)
-        new_s3_file_path = f'resized/{original_filename}'
+        return [item.key for item in get_storage().list(f'{stem}_') if pattern.match(item.key)]
+    except StorageError as e:
+        print(f'파생 이미지 목록 조회 중 에러 발생: {e} - {resized_key}')
+        return []
+
+
+def get_derivative_keys_many(resized_keys, known=None):
+    '''
+    resized 키별 파생 이미지 키 목록 {resized_key: [키, ...]}
+    known(ImageAsset manifest로 계산한 값, blog.assets.get_manifest_derivative_keys)에 없는 키만 저장소를 조회하며,
+    조회는 제한된 스레드 풀에서 동시에 실행
+    '''
+    known = known or {}
+    derivative_keys = {key: known[key] for key in resized_keys if key in known}
+    missing = [key for key in resized_keys if key not in known]
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(settings.S3_MAX_CONCURRENCY, len(missing))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, get_derivative_keys, key) for key in missing]
+            derivative_keys.update(zip(missing, (future.result() for future in futures)))
+
+    return derivative_keys
+
+
+def _upload_image(buffer, key, content_type):
+    get_storage().put(buffer, key, content_type)
 
-        # 리사이징된 이미지를 s3에 업로드
-        S3_CLIENT.upload_fileobj(
-            buffer,
-            settings.AWS_S3_BUCKET_NAME,
-            new_s3_file_path,
-            ExtraArgs={'ContentType': obj['ContentType']})
+    return f'{settings.AWS_CLOUDFRONT_DOMAIN}/{key}'
 
-        image_url = f'{settings.AWS_CLOUDFRONT_DOMAIN}/{new_s3_file_path}'
 
-        return image_url
+def generate_image_derivatives(s3_key, find_existing=None):
+    '''
+    원본 이미지를 한 번만 디코딩하여
+    - 기존과 같은 resized/<파일명> (800x600 이내, 원본 포맷)
+    - 설정된 너비(IMAGE_DERIVATIVE_WIDTHS) x 포맷(IMAGE_DERIVATIVE_FORMATS) 파생 이미지
+    를 만들어 업로드하고 srcset에 바로 쓸 수 있는 manifest를 반환 (실패 시 None)
+    manifest['sha256']은 원본 해시, find_existing(sha256)이 기존 manifest를 반환하면
+    디코딩 / 업로드 없이 그 manifest를 사용하고 방금 올린 temp/ 원본은 삭제 (deduplicated=True)
+    '''
+    # Pillow는 이미지 처리 시점에만 로드 (웹 워커 기동 시간 단축)
+    from PIL import Image
+    from .images import fit_within, open_image_bounded, resize_to, spool_stream
+
+    width = 800
+    height = 600
+
+    try:
+        # s3에서 원본 이미지를 청크 단위로 받아 임시 파일에 저장 (일정 크기 이상은 디스크로)
+        body, source_content_type = get_storage().get(s3_key)
+        hasher = hashlib.sha256()
+
+        with body, spool_stream(body, settings.IMAGE_SPOOL_MAX_MEMORY_SIZE, hasher) as image_file:
+            digest = hasher.hexdigest()
+            existing = find_existing(digest) if find_existing else None
+            if existing:
+                # 업로드 직후의 임시 원본만 삭제 (다른 경로의 키는 다른 곳에서 사용 중일 수 있음)
+                if s3_key.startswith('temp/'):
+                    get_storage().delete_many([s3_key])
+                return {**existing, 'sha256': digest, 'deduplicated': True}
+
+            # 필요한 가장 큰 출력 너비에 맞춰 디코딩 (JPEG는 draft 축소 디코딩, 픽셀 수 한도 초과 시 에러)
+            image, source_format, source_size = open_image_bounded(
+                image_file, max(width, *settings.IMAGE_DERIVATIVE_WIDTHS), settings.IMAGE_MAX_PIXELS)
+
+        # 기존 파일명과 같은 이름으로 s3 resized/ 경로에 저장 (800x600 이내 기본 이미지)
+        original_filename = os.path.basename(s3_key)
+        resized_key = f'resized/{original_filename}'
+
+        resized_image = resize_to(image, fit_within(source_size, (width, height)))
+        image_url = _upload_image(_encode_image(resized_image, source_format), resized_key, source_content_type)
+
+        manifest = {
+            'sha256': digest,
+            'key': resized_key,
+            'url': image_url,
+            'width': resized_image.width,
+            'height': resized_image.height,
+            'variants': [],
+            'srcset': {},
+        }
+
+        # 원본보다 큰 너비로는 확대하지 않음 (원본이 더 작으면 원본 너비 한 번만 생성)
+        target_widths = sorted({min(target, source_size[0]) for target in settings.IMAGE_DERIVATIVE_WIDTHS}, reverse=True)
+
+        for target_width in target_widths:
+            target_height = max(1, round(source_size[1] * target_width / source_size[0]))
+            derivative = resize_to(image, (target_width, target_height))
+
+            for derivative_format in settings.IMAGE_DERIVATIVE_FORMATS:
+                image_format = derivative_format or source_format
+                content_type = source_content_type if derivative_format is None else Image.MIME.get(image_format)
+                key = build_derivative_key(resized_key, target_width, derivative_format)
+                url = _upload_image(_encode_image(derivative, image_format), key, content_type)
+
+                manifest['variants'].append({
+                    'url': url,
+                    'width': target_width,
+                    'height': target_height,
+                    'format': image_format.lower(),
+                    'content_type': content_type,
+                })
+
+        for variant in sorted(manifest['variants'], key=lambda v: v['width']):
+            candidates = manifest['srcset'].setdefault(variant['format'], [])
+            candidates.append(f"{variant['url']} {variant['width']}w")
+        manifest['srcset'] = {fmt: ', '.join(candidates) for fmt, candidates in manifest['srcset'].items()}
+
+        return manifest
 
     except Exception as e:
         print('이미지 리사이징 및 S3 업로드 중 에러 발생:', e)
         return None
 
 
+def resize_image_and_upload_to_s3(s3_key):
+    manifest = generate_image_derivatives(s3_key)
+
+    return manifest['url'] if manifest else None
+
+
+class ImageSrcParser(HTMLParser):
+    '''
+    트리를 만들지 않고 토큰을 한 번 훑으면서 <img src> 값만 수집
+    '''
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sources = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'img':
+            return
+
+        # 같은 속성이 여러 번 나오면 마지막 값 사용 (BeautifulSoup과 동일)
+        src = None
+        for name, value in attrs:
+            if name == 'src':
+                src = value
+        if src:
+            self.sources.append(src)
+
+
+IMG_TAG_RE = re.compile(r'<img\b', re.IGNORECASE)
+IMAGE_KEY_CACHE_SIZE = 64
+_image_key_cache = OrderedDict()
+_image_key_cache_lock = threading.Lock()
+
+
+def _parse_image_keys(content, cloudfront_domain_prefix):
+    # <img가 없으면 파싱하지 않음
+    if not IMG_TAG_RE.search(content):
+        return frozenset()
+
+    parser = ImageSrcParser()
+    parser.feed(content)
+    parser.close()
+
+    return frozenset(
+        src.replace(cloudfront_domain_prefix, '')
+        for src in parser.sources
+        if src.startswith(cloudfront_domain_prefix)
+    )
+
+
+def parse_image_keys(content):
+    '''
+    캐시 / 로그 없이 본문 이미지 키만 추출 (대량 처리용)
+    '''
+    return _parse_image_keys(content or '', f'{settings.AWS_CLOUDFRONT_DOMAIN}/')
+
+
 def extract_image_keys_from_content(content):
-    parser = BeautifulSoup(content, 'html.parser')
-    image_tags = parser.findAll('img')
-    image_keys = set()
+    '''
+    본문 HTML에서 CloudFront 이미지 키 집합을 추출
+    게시글 수정 시 같은 본문을 여러 번 추출하므로 본문 해시 기준으로 최근 결과를 재사용
+    '''
     cloudfront_domain_prefix = f'{settings.AWS_CLOUDFRONT_DOMAIN}/'
+    content = content or ''
+    cache_key = (hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest(), cloudfront_domain_prefix)
+
+    with _image_key_cache_lock:
+        image_keys = _image_key_cache.get(cache_key)
+        if image_keys is not None:
+            _image_key_cache.move_to_end(cache_key)
 
-    for img_tag in image_tags:
-        src = img_tag.get('src')
+    if image_keys is None:
+        image_keys = _parse_image_keys(content, cloudfront_domain_prefix)
 
-        if src and src.startswith(cloudfront_domain_prefix):
-            key = src.replace(cloudfront_domain_prefix, '')
-            image_keys.add(key)
-    print(f'BeautifulSoup으로 추출된 이미지 키: {image_keys}')
+        with _image_key_cache_lock:
+            _image_key_cache[cache_key] = image_keys
+            if len(_image_key_cache) > IMAGE_KEY_CACHE_SIZE:
+                _image_key_cache.popitem(last=False)
+
+    print(f'추출된 이미지 키: {set(image_keys)}')
 
     return image_keys
 
 
+def delete_s3_keys(keys):
+    '''
+    저장소의 delete_many로 한꺼번에 삭제하고 (S3는 최대 1,000개씩 delete_objects 배치)
+    키별 결과를 기존과 같은 형식으로 출력, 삭제에 실패한 키 목록을 반환
+    '''
+    deleted_keys, errors = get_storage().delete_many(keys)
 
-def delete_unused_images(old_content, new_content):
-    try:
-        old_image_keys = extract_image_keys_from_content(old_content)
-        new_image_keys = extract_image_keys_from_content(new_content)
+    for s3_key in deleted_keys:
+        print(f's3에서 이미지 삭제 성공: {s3_key}')
 
-        # 기존 이미지 키 집합에서 새로운 이미지 키 집합을 뺌으로써 삭제 대상 찾기
-        images_to_delete = old_image_keys - new_image_keys
+    for error in errors:
+        if error.code == 'NoSuchKey':
+            print(f's3에서 해당 이미지 키를 찾을 수 없습니다: {error.key}')
+        else:
+            print(f's3에서 이미지 삭제 중 ClientError 발생: {error} - {error.key}')
 
+    return [error.key for error in errors]
+
+
+def delete_images(images_to_delete, derivative_keys=None):
+    '''
+    더 이상 사용하지 않는 이미지 키(resized/...)의 리사이즈 / 파생 / 원본(content/) 이미지를 S3에서 삭제
+    삭제 대상은 PostImage 색인에서 계산 (blog.post_images.sync_post_images)
+    derivative_keys에 파생 이미지 키가 있는 이미지는 저장소 목록 조회를 생략
+    '''
+    try:
         if not images_to_delete:
             print('삭제할 이미지가 없습니다.')
             return
 
         print(f'삭제할 이미지 키: {images_to_delete}')
 
+        images_to_delete = list(images_to_delete)
+        derivative_keys = get_derivative_keys_many(images_to_delete, derivative_keys)
+        keys_to_delete_on_s3 = []
+
         for key in images_to_delete:
             # s3에서 원본 이미지와 리사이즈된 이미지 모두 삭제
             resized_key = key
             original_key = key.replace('resized/', 'content/', 1)
 
-            # 삭제 대상 키들을 리스트에 추가
-            keys_to_delete_on_s3 = [resized_key]
+            # 삭제 대상 키들을 리스트에 추가 (크기/포맷별 파생 이미지 포함)
+            keys_to_delete_on_s3.extend([resized_key, *derivative_keys[resized_key]])
 
             # 원본 키가 'resized/' 키와 다르다면 삭제 리스트에 추가
             if resized_key != original_key:
                 keys_to_delete_on_s3.append(original_key)
 
-            for s3_key in keys_to_delete_on_s3:
-                try:
-                    S3_CLIENT.delete_object(Bucket=settings.AWS_S3_BUCKET_NAME, Key=s3_key)
-                    print(f's3에서 이미지 삭제 성공: {s3_key}')
-                except ClientError as e:
-                    if e.response['Error']['Code'] == 'NoSuchKey':
-                        print(f's3에서 해당 이미지 키를 찾을 수 없습니다: {s3_key}')
-                    else:
-                        print(f's3에서 이미지 삭제 중 ClientError 발생: {e} - {s3_key}')
+        # 이미지마다 키별로 요청하지 않고 delete_objects 배치로 한 번에 삭제
+        delete_s3_keys(keys_to_delete_on_s3)
 
     except Exception as e:
-        print('이미지 키 추출 또는 S3 이미지 삭제 중 에러 발생:', str(e))
+        print('S3 이미지 삭제 중 에러 발생:', str(e))
+
+
+def _copy_temp_image(temp_key, final_key):
+    '''
+    temp/ 이미지를 content/ 폴더로 복사 (성공하면 True)
+    '''
+    try:
+        get_storage().copy(temp_key, final_key)
+        return True
+    except StorageError as e:
+        if e.code == 'NoSuchKey':
+            print(f"이미 파일이 없거나 옮겨졌습니다: {temp_key}")
+        else:
+            print(f"이미지 폴더 이동 중 ClientError 발생: {e} - {temp_key}")
+    except Exception as e:
+        print(f'이미지 폴더 이동 중 에러 발생: {e}')
+    return False
 
 
 def move_temp_images_to_final_location(content):
     image_keys = extract_image_keys_from_content(content)
     final_content = content
 
+    moves = []
     for key in image_keys:
         if key.startswith('resized/'):
             filename = os.path.basename(key)
-            temp_key = f'temp/{filename}'
-            final_key = f'content/{filename}'
-
-            try:
-                # temp/ 이미지를 content/ 폴더로 복사
-                S3_CLIENT.copy_object(
-                    Bucket=settings.AWS_S3_BUCKET_NAME,
-                    CopySource={'Bucket': settings.AWS_S3_BUCKET_NAME, 'Key': temp_key},
-                    Key=final_key,
-                )
-
-                # temp/ 폴더에 있는 임시 파일 삭제
-                S3_CLIENT.delete_object(Bucket=settings.AWS_S3_BUCKET_NAME, Key=temp_key)
-            except ClientError as e:
-                if e.response['Error']['Code'] == 'NoSuchKey':
-                    print(f"이미 파일이 없거나 옮겨졌습니다: {temp_key}")
-                else:
-                    print(f"이미지 폴더 이동 중 ClientError 발생: {e} - {temp_key}")
-            except Exception as e:
-                print(f'이미지 폴더 이동 중 에러 발생: {e}')
+            moves.append((f'temp/{filename}', f'content/{filename}'))
+
+    if not moves:
+        return final_content
+
+    # 복사는 제한된 스레드 풀에서 동시에 실행 (저장소 백엔드는 스레드 안전)
+    # 작업마다 현재 context를 복사하여 작업 스레드의 저장소 호출도 요청 성능 지표에 기록
+    with ThreadPoolExecutor(max_workers=min(settings.S3_MAX_CONCURRENCY, len(moves))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _copy_temp_image, *move) for move in moves]
+        copied = [future.result() for future in futures]
+
+    # 복사에 성공한 temp/ 임시 파일만 배치로 삭제
+    temp_keys = [temp_key for (temp_key, _), ok in zip(moves, copied) if ok]
+    if temp_keys:
+        delete_s3_keys(temp_keys)
 
     return final_content
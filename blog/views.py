@@ -1,86 +1,178 @@
+import math
 import os
 import uuid
 
-from botocore.exceptions import ClientError
 from django.contrib.admin.templatetags.admin_list import pagination
-from django.contrib.auth.hashers import make_password, check_password
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed
 from django.shortcuts import render
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
 
-from rest_framework import viewsets, permissions, status, exceptions
+from rest_framework import viewsets, mixins, permissions, status, exceptions
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from rest_framework.views import APIView
 
-from .models import Post, Comment
-from .serializers import PostSerializer, CommentSerializer
-from .utils import generate_s3_presigned_url, resize_image_and_upload_to_s3, \
-    delete_unused_images, move_temp_images_to_final_location
-
-
-class PostViewSet(viewsets.ModelViewSet):
-    queryset = Post.objects.all().select_related('author').prefetch_related('tags')
+from .assets import find_asset_manifest, forget_image_assets, get_manifest_derivative_keys, \
+    get_or_generate_derivatives, normalize_digest
+from .cache import VersionedResponseCacheMixin, get_cache_stats
+from .conditional import ConditionalGetMixin, compute_validators, get_not_modified_response, set_validators
+from .credentials import make_comment_password
+from .jobs import enqueue_image_job, wait_for_job
+from .metrics import render_metrics
+from .models import Post, Comment, TagStat, ImageJob
+from .pagination import PostCursorPagination, CommentCursorPagination
+from .search import PostSearchFilter, update_search_vector
+from .serializers import PostSerializer, PostListSerializer, CommentSerializer, TagStatSerializer, \
+    ImageJobSerializer
+from .storage import StorageError, get_storage
+from .utils import generate_s3_presigned_url, delete_images, move_temp_images_to_final_location
+
+
+class PostViewSet(ConditionalGetMixin, VersionedResponseCacheMixin, viewsets.ModelViewSet):
+    queryset = Post.objects.all().select_related('author').prefetch_related('tags').defer('search_vector')
     serializer_class = PostSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # PostgreSQL에서는 tsvector 전문 검색, 그 외에는 기존 icontains 검색
+    filter_backends = [DjangoFilterBackend, PostSearchFilter, filters.OrderingFilter]
     filterset_fields = ['tags__name']
     search_fields = ['title', 'tags__name', 'author__nickname']
     ordering_fields = ['created_at', 'title']
+    # ?cursor= 또는 ?page_size= 요청 시에만 (created_at, id) 커서 페이지네이션, 그 외에는 전체 반환
+    pagination_class = PostCursorPagination
+    # list/retrieve 응답 캐시 및 ETag (게시글 저장/삭제, 태그 변경 시 signals에서 'posts' 버전 증가)
+    # 목록은 comment_count를 포함하므로 댓글 생성/삭제 시 올라가는 'comments' 버전에도 의존하고,
+    # 상세는 해당 게시글의 'comments:<post_id>' 버전에만 의존
+    cache_namespace = 'posts'
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'cache_stats']:
             self.permission_classes = [permissions.IsAdminUser]
         else:
             self.permission_classes = [permissions.AllowAny]
         return [permission() for permission in self.permission_classes]
 
-    def list(self, request, *args, **kwargs):
-        self.pagination_class = None
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # 목록에서는 본문을 읽지 않음 (retrieve에서만 전체 content 로드)
+        if self.action == 'list':
+            queryset = queryset.defer('content', 'toc')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PostListSerializer
+        return super().get_serializer_class()
 
-        return super().list(request, *args, **kwargs)
+    def get_cache_dependencies(self):
+        if self.action == 'list':
+            return ('comments',)
+        if self.action == 'retrieve':
+            return (f'comments:{self.kwargs[self.lookup_url_kwarg or self.lookup_field]}',)
+        return ()
 
     def perform_create(self, serializer):
         content = serializer.validated_data.get('content', '')
         final_content = move_temp_images_to_final_location(content)
 
         serializer.save(author=self.request.user, content=final_content)
+        update_search_vector(serializer.instance)
 
     def perform_update(self, serializer):
         if self.request.user != serializer.instance.author:
             self.permission_denied(self.request, message='게시글 수정 권한이 없습니다.')
 
-        old_content = self.get_object().content
         new_content = self.request.data.get('content', '')
 
         final_content = move_temp_images_to_final_location(new_content)
 
+        # 저장 시 PostImage 색인이 갱신되며 빠진 이미지 키가 계산됨 (signals.post_saved, HTML 재파싱 없음)
         serializer.save(content=final_content)
+        update_search_vector(serializer.instance)
 
-        if old_content and final_content:
-            delete_unused_images(old_content, final_content)
+        if final_content:
+            removed_keys = getattr(serializer.instance, '_removed_image_keys', set())
+            delete_images(removed_keys, get_manifest_derivative_keys(removed_keys))
+            forget_image_assets(removed_keys)
 
     def perform_destroy(self, instance):
         if self.request.user != instance.author:
             self.permission_denied(self.request, message='게시글 삭제 권한이 없습니다.')
 
-        post_content = instance.content
         instance.delete()
 
-        if post_content:
-            delete_unused_images(post_content, '')
+        # 다른 게시글이 참조하지 않는 이미지만 삭제 (signals.post_deleted에서 PostImage 색인으로 계산)
+        removed_keys = getattr(instance, '_removed_image_keys', set())
+        delete_images(removed_keys, get_manifest_derivative_keys(removed_keys))
+        forget_image_assets(removed_keys)
+
+    @action(detail=False, methods=['GET'], url_path='cache-stats')
+    def cache_stats(self, request):
+        return Response(get_cache_stats(self.cache_namespace), status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['GET'], url_path='comments')
     def get_comments_list(self, request, pk=None):
-        comments_list = Comment.objects.filter(post=pk)
-        # pagination = PageNumberPagination()
-        # page = pagination.paginate_queryset(comments_list, request)
-        # page = self.paginate_queryset(comments_list)
-        # serializer = CommentSerializer(page, many=True)
-        serializer = CommentSerializer(comments_list, many=True)
-        # return self.get_paginated_response(serializer.data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # 작성자를 같은 쿼리에서 JOIN하여 댓글 수와 관계없이 N+1 없이 조회
+        try:
+            comments_list = Comment.objects.filter(post=pk).select_related('author')
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+        # 댓글 생성/수정/삭제 시 signals에서 'comments:<post_id>' 버전 증가
+        etag, last_modified = compute_validators(comments_list, f'comments:{pk}', request)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        # (created_at, id) 커서 페이지네이션
+        pagination = CommentCursorPagination()
+        page = pagination.paginate_queryset(comments_list, request, view=self)
+        serializer = CommentSerializer(page, many=True)
+
+        return set_validators(pagination.get_paginated_response(serializer.data), etag, last_modified)
+
+
+class TagViewSet(VersionedResponseCacheMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    '''
+    태그 이름/slug/게시글 수 목록 (게시글 수 내림차순, ?top=N 으로 상위 N개만 조회)
+    '''
+    queryset = TagStat.objects.filter(post_count__gt=0).select_related('tag').order_by('-post_count', 'tag__name')
+    serializer_class = TagStatSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    filter_backends = []
+    # 태그 통계 갱신 시 blog.tags.refresh_tag_stats에서 'tags' 버전 증가
+    cache_namespace = 'tags'
+    cache_max_age = 60
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        top = self.request.query_params.get('top')
+
+        if top is not None:
+            try:
+                top = int(top)
+            except ValueError:
+                raise exceptions.ValidationError({'top': 'top은 양의 정수여야 합니다.'})
+            if top <= 0:
+                raise exceptions.ValidationError({'top': 'top은 양의 정수여야 합니다.'})
+            queryset = queryset[:top]
+        return queryset
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        return response
 
 
 class S3PresignedURLView(APIView):
@@ -102,6 +194,18 @@ class S3PresignedURLView(APIView):
         if not file_type.startswith('image/'):
             return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': '이미지 파일만 업로드할 수 있습니다.'})
 
+        # 클라이언트가 원본 sha256을 보내면 같은 이미지의 기존 파생 이미지를 바로 반환 (업로드 / 리사이즈 생략)
+        sha256 = request.data.get('sha256')
+        if sha256:
+            digest = normalize_digest(sha256)
+            if digest is None:
+                return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': 'sha256 형식이 올바르지 않습니다.'})
+
+            manifest = find_asset_manifest(digest)
+            if manifest:
+                return Response({'presigned_url': None, 's3_key': None, 'duplicate': True,
+                                 'url': manifest['url'], 'manifest': manifest}, status=status.HTTP_200_OK)
+
         try:
             urls = generate_s3_presigned_url(file_name, file_type)
 
@@ -119,23 +223,67 @@ class ImageUploadView(APIView):
         if s3_key is None:
             return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': 's3_key가 누락되었습니다.'})
 
+        # 비동기 모드: 작업만 등록하고 바로 job_id 반환 (run_image_worker가 리사이즈 처리)
+        if str(request.data.get('async', '')).lower() in ('true', '1'):
+            job = enqueue_image_job(s3_key)
+            data = ImageJobSerializer(job).data
+            data['status_url'] = request.build_absolute_uri(reverse('image-job-status', kwargs={'job_id': job.id}))
+
+            return Response(data, status=status.HTTP_202_ACCEPTED)
+
         try:
-            image_url = resize_image_and_upload_to_s3(s3_key)
+            # 같은 내용의 이미지가 이미 처리되었으면 리사이즈 / 업로드 없이 기존 파생 이미지 사용
+            manifest = get_or_generate_derivatives(s3_key)
 
-            if not image_url:
+            if not manifest:
                 return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                 data={'error': '리사이즈된 이미지 업로드에 실패했습니다.'})
 
-            return Response(image_url, status=status.HTTP_200_OK)
+            # ?manifest=true 이면 크기/포맷별 파생 이미지와 srcset 포함, 아니면 기존처럼 URL만 반환
+            if str(request.data.get('manifest', '')).lower() in ('true', '1'):
+                return Response(manifest, status=status.HTTP_200_OK)
+
+            return Response(manifest['url'], status=status.HTTP_200_OK)
         except Exception as e:
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             data={'error': str(e)})
 
 
+class ImageJobStatusView(APIView):
+    '''
+    이미지 작업 상태 조회 (?wait=N 이면 작업이 끝날 때까지 최대 N초 롱 폴링)
+    '''
+    permission_classes = [AllowAny]
+
+    def get(self, request, job_id):
+        try:
+            wait = float(request.query_params.get('wait', 0))
+        except ValueError:
+            wait = None
+        # nan / inf는 min/max를 그대로 통과하여 롱 폴링이 끝나지 않으므로 거부
+        if wait is None or not math.isfinite(wait):
+            return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': 'wait는 숫자여야 합니다.'})
+        wait = min(max(wait, 0), settings.IMAGE_JOB_MAX_WAIT)
+
+        try:
+            job = wait_for_job(job_id, timeout=wait)
+        except ImageJob.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND, data={'error': '이미지 작업을 찾을 수 없습니다.'})
+
+        return Response(ImageJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
 class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [AllowAny]
+    # 익명 댓글 비밀번호 확인(수정/삭제) 요청 제한 (DEFAULT_THROTTLE_RATES['comment_password'])
+    throttle_scope = 'comment_password'
+
+    def get_throttles(self):
+        if self.action in ['update', 'partial_update', 'destroy'] and not self.request.user.is_authenticated:
+            return [ScopedRateThrottle()]
+        return super().get_throttles()
 
     def perform_create(self, serializer):
         post_id = self.request.data.get('post_id')
@@ -152,7 +300,7 @@ class CommentViewSet(viewsets.ModelViewSet):
             serializer.save(
                 author=None,
                 author_name=nickname,
-                password=make_password(password),
+                password=make_comment_password(password),
                 post=post
             )
 
@@ -163,7 +311,7 @@ class CommentViewSet(viewsets.ModelViewSet):
             if not password:
                 raise exceptions.PermissionDenied(detail='익명 댓글 수정 시 비밀번호를 입력해야 합니다.')
 
-            if not check_password(password, serializer.instance.password):
+            if not serializer.instance.check_password(password):
                 raise exceptions.PermissionDenied(detail='비밀번호가 일치하지 않습니다.')
 
             serializer.save()
@@ -180,7 +328,7 @@ class CommentViewSet(viewsets.ModelViewSet):
             if not password:
                 raise exceptions.PermissionDenied(detail='익명 댓글 삭제 시 비밀번호를 입력해야 합니다.')
 
-            if not check_password(password, instance.password):
+            if not instance.check_password(password):
                 raise exceptions.PermissionDenied(detail='비밀번호가 일치하지 않습니다.')
 
             instance.delete()
@@ -190,4 +338,45 @@ class CommentViewSet(viewsets.ModelViewSet):
                 raise exceptions.PermissionDenied(detail='댓글 삭제 권한이 없습니다.')
             instance.delete()
         else:
-            instance.delete()
\ No newline at end of file
+            instance.delete()
+
+
+def metrics_view(request):
+    '''
+    PerformanceMiddleware가 집계한 요청 히스토그램 (Prometheus 텍스트 형식)
+    Authorization: Bearer <settings.METRICS_TOKEN> 필요 (토큰이 설정되지 않았으면 항상 403)
+    '''
+    if not settings.METRICS_TOKEN:
+        return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+
+    expected = f'Bearer {settings.METRICS_TOKEN}'
+    if not constant_time_compare(request.headers.get('Authorization', ''), expected):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@csrf_exempt
+def storage_upload_view(request, key):
+    '''
+    LocalStorage / InMemoryStorage presigned URL 업로드 (S3 presigned PUT과 같이 요청 본문을 그대로 저장)
+    서명(키 / Content-Type / 만료 시간)을 확인한 뒤 저장소에 put, S3 등 서명 URL을 쓰지 않는 저장소에서는 404
+    '''
+    if request.method != 'PUT':
+        return HttpResponseNotAllowed(['PUT'])
+
+    storage = get_storage()
+    verify_upload = getattr(storage, 'verify_upload', None)
+    if verify_upload is None:
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        verify_upload(key, request.GET.get('signature', ''), request.content_type)
+    except StorageError as e:
+        return HttpResponse(str(e), status=status.HTTP_403_FORBIDDEN)
+
+    if int(request.META.get('CONTENT_LENGTH') or 0) > settings.STORAGE_UPLOAD_MAX_SIZE:
+        return HttpResponse(status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    storage.put(request, key, request.content_type)
+    return HttpResponse(status=status.HTTP_200_OK)
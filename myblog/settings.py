@@ -55,6 +55,8 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 
 
 MIDDLEWARE = [
+    # 요청별 SQL / 저장소 / 직렬화 / 렌더링 시간 기록 (Server-Timing 헤더, /metrics), 전체 시간 측정을 위해 맨 앞에 둠
+    'blog.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -65,6 +67,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# blog.middleware.PerformanceMiddleware
+# Server-Timing 응답 헤더 사용 여부 (내부 처리 시간이 노출되므로 기본은 DEBUG일 때만)
+# /metrics 접근용 Bearer 토큰 (비어 있으면 /metrics는 403)
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', str(DEBUG)).lower() in ('true', '1', 't')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
 CORS_ALLOWED_ORIGINS = [os.getenv('CORS_ALLOWED_ORIGINS')]
 CORS_ALLOW_CREDENTIALS = True
 
@@ -74,7 +82,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt JWTAuthentication + 토큰 / 사용자 캐시
+        'accounts.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
@@ -85,8 +94,19 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        # 익명 댓글 수정/삭제 시 비밀번호 확인 요청 (IP 기준)
+        'comment_password': os.getenv('COMMENT_PASSWORD_THROTTLE_RATE', '20/min'),
+    },
 }
 
+# 익명 댓글 비밀번호 전용 해셔(blog.credentials)의 PBKDF2 반복 횟수
+# 로그인 비밀번호용 기본값(수십만 회) 대신 요청당 1ms 미만이 되도록 낮추고, 대입 공격은 요청 제한으로 방어
+COMMENT_PASSWORD_ITERATIONS = int(os.getenv('COMMENT_PASSWORD_ITERATIONS', '2000'))
+
+# 게시글 읽는 시간(분) 계산 기준 (분당 단어 수)
+READING_WORDS_PER_MINUTE = int(os.getenv('READING_WORDS_PER_MINUTE', '200'))
+
 #JWT Settings
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -99,9 +119,22 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# accounts.authentication.CachedJWTAuthentication
+# 검증된 토큰 LRU 크기(프로세스별) / 사용자 행 캐시 유지 시간(초, 사용자 저장 시 즉시 무효화)
+# 사용자 행 캐시는 CACHES['default']가 공유 캐시(Redis 등)일 때만 사용 (LocMemCache에서는 매 요청 DB 조회)
+JWT_TOKEN_CACHE_SIZE = int(os.getenv('JWT_TOKEN_CACHE_SIZE', '1024'))
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', '60'))
+
 GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID')
 GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET')
 GITHUB_CALLBACK_URL = os.getenv('GITHUB_CALLBACK_URL')
+# OAuth / API 주소 (테스트에서는 로컬 스텁 서버로 변경)
+GITHUB_OAUTH_BASE_URL = os.getenv('GITHUB_OAUTH_BASE_URL', 'https://github.com')
+GITHUB_API_BASE_URL = os.getenv('GITHUB_API_BASE_URL', 'https://api.github.com')
+# accounts.github 공유 httpx 클라이언트 타임아웃(초) / 커넥션 풀 크기
+GITHUB_CONNECT_TIMEOUT = float(os.getenv('GITHUB_CONNECT_TIMEOUT', '3'))
+GITHUB_READ_TIMEOUT = float(os.getenv('GITHUB_READ_TIMEOUT', '5'))
+GITHUB_MAX_CONNECTIONS = int(os.getenv('GITHUB_MAX_CONNECTIONS', '20'))
 
 
 # AWS Settings
@@ -110,6 +143,48 @@ AWS_S3_BUCKET_NAME = os.getenv('AWS_S3_BUCKET_NAME')
 AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
 AWS_CLOUDFRONT_DOMAIN = os.getenv('AWS_CLOUDFRONT_DOMAIN')
+# 게시글 저장 시 이미지 복사 등 S3 요청을 동시에 보낼 최대 스레드 수
+S3_MAX_CONCURRENCY = int(os.getenv('S3_MAX_CONCURRENCY', '8'))
+# boto3 커넥션 풀 / 재시도 / 타임아웃 (풀 크기는 동시 요청 수보다 커야 함)
+S3_MAX_POOL_CONNECTIONS = int(os.getenv('S3_MAX_POOL_CONNECTIONS', '32'))
+S3_MAX_ATTEMPTS = int(os.getenv('S3_MAX_ATTEMPTS', '5'))
+S3_RETRY_MODE = os.getenv('S3_RETRY_MODE', 'adaptive')
+S3_CONNECT_TIMEOUT = float(os.getenv('S3_CONNECT_TIMEOUT', '3'))
+S3_READ_TIMEOUT = float(os.getenv('S3_READ_TIMEOUT', '30'))
+
+# Object storage (blog.storage)
+# blog.storage.S3Storage / LocalStorage(로컬 디렉터리) / InMemoryStorage(테스트, 벤치마크)
+STORAGE = {
+    'BACKEND': os.getenv('STORAGE_BACKEND', 'blog.storage.S3Storage'),
+    'OPTIONS': {'location': os.getenv('STORAGE_LOCAL_ROOT')} if os.getenv('STORAGE_LOCAL_ROOT') else {},
+}
+# LocalStorage / InMemoryStorage의 presigned URL 주소 (blog.views.storage_upload_view, /api/storage/<key>)
+STORAGE_UPLOAD_BASE_URL = os.getenv('STORAGE_UPLOAD_BASE_URL', 'http://localhost:8000/api/storage')
+STORAGE_UPLOAD_MAX_SIZE = int(os.getenv('STORAGE_UPLOAD_MAX_SIZE', str(20 * 1024 * 1024)))
+
+
+# Image derivatives
+# 원본 한 번 디코딩으로 너비별 x 포맷별(None은 원본 포맷) 파생 이미지 생성 (srcset용)
+IMAGE_DERIVATIVE_WIDTHS = [400, 800, 1600]
+IMAGE_DERIVATIVE_FORMATS = ['WEBP', None]
+# 포맷별 Pillow 인코딩 옵션
+IMAGE_ENCODE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'WEBP': {'quality': 80, 'method': 4},
+    'PNG': {'optimize': True},
+}
+# 디컴프레션 폭탄 방지용 최대 픽셀 수 / 원본 다운로드 시 메모리에 유지할 최대 바이트 (초과분은 임시 파일)
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(40_000_000)))
+IMAGE_SPOOL_MAX_MEMORY_SIZE = 2 * 1024 * 1024
+# 이 시간 안에 생성 / 중복 업로드로 재사용된 이미지는 게시글 참조가 없어도 삭제하지 않음
+# (아직 저장되지 않은 게시글 보호, 게시글 수정/삭제 시 삭제와 gc_orphan_images 기본값에 공통 적용)
+IMAGE_GC_GRACE_HOURS = float(os.getenv('IMAGE_GC_GRACE_HOURS', '24'))
+
+
+# Image job queue (python manage.py run_image_worker)
+IMAGE_JOB_TIMEOUT = int(os.getenv('IMAGE_JOB_TIMEOUT', '300'))  # 처리 중 상태가 이보다 오래되면 다시 처리
+IMAGE_JOB_MAX_ATTEMPTS = int(os.getenv('IMAGE_JOB_MAX_ATTEMPTS', '3'))
+IMAGE_JOB_MAX_WAIT = int(os.getenv('IMAGE_JOB_MAX_WAIT', '25'))  # 상태 조회 롱 폴링 최대 대기(초)
 
 
 ROOT_URLCONF = 'myblog.urls'
@@ -148,6 +223,19 @@ DATABASES = {
 }
 
 
+# Cache
+# 게시글 응답 캐시의 버전 카운터를 워커 간에 공유하려면 운영 환경에서는 Redis 등 공유 캐시 백엔드를 지정해야 함
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', 'myblog'),
+    }
+}
+
+# 게시글 목록/상세 응답 캐시 유지 시간 (초)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
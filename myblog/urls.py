@@ -18,9 +18,11 @@ from django.contrib import admin
 from django.urls import path, include
 
 import accounts
+from blog.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('blog.urls')),
     path('api/auth/', include('accounts.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]